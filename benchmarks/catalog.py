@@ -0,0 +1,80 @@
+"""Generate catalogs that look like real IPTV provider catalogs.
+
+Live channels carry country prefixes (``UK:``, ``|FR|``, ``DE ▎``) and
+quality tags (``HD``, ``|FHD|``, ``4K``, ``+1``) around brand names in
+several scripts; movies are titles with a year; series are show names
+with a season. Generation is deterministic for a given seed and size.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+BASE_URL = "http://provider.example:8080"
+
+# Share of each type in a catalog; providers list far more movies than channels.
+TYPE_SHARES: List[Tuple[ChannelType, float]] = [
+    (ChannelType.LIVE, 0.25),
+    (ChannelType.VOD, 0.65),
+    (ChannelType.SERIES, 0.10),
+]
+
+BRANDS: Dict[str, List[str]] = {
+    "UK": ["BBC One", "BBC Two", "ITV", "Sky Sports Main Event", "Sky Cinema", "E4"],
+    "US": ["ESPN", "CNN", "HBO", "Fox News", "NBC", "Discovery Channel"],
+    "FR": ["TF1", "France 2", "Canal+ Sport", "M6", "BFM TV", "Arte"],
+    "DE": ["Das Erste", "ZDF", "RTL", "ProSieben", "Sky Bundesliga", "Sport1"],
+    "ES": ["La 1", "Antena 3", "Movistar LaLiga", "Telecinco", "DAZN 1"],
+    "IT": ["Rai 1", "Canale 5", "Sky Sport Calcio", "Italia 1"],
+    "TR": ["TRT 1", "Show TV", "beIN Sports Türkiye", "Kanal D"],
+    "AR": ["الجزيرة", "العربية", "MBC 1", "beIN Sports عربي"],
+    "RU": ["Первый канал", "Россия 1", "НТВ", "Матч ТВ"],
+    "GR": ["ΕΡΤ 1", "ANT1", "Nova Sports", "Σκάι"],
+    "JP": ["NHK 総合", "日テレ", "テレビ朝日"],
+    "PL": ["TVP 1", "Polsat Sport", "TVN 24", "Canal+ Premium"],
+}
+PREFIX_STYLES = ["{c}: ", "|{c}| ", "{c} ▎ ", "{c} - ", "[{c}] "]
+QUALITY_TAGS = ["", "", " HD", " FHD", " |HD|", " 4K", " UHD", " SD", " HEVC", " +1"]
+SUFFIX_TAGS = ["", "", "", " (Backup)", " ᴿᴬᵂ", " [Multi-Audio]"]
+
+TITLE_WORDS = (
+    "the night last man city dark star return love war secret house road "
+    "king lost world blood fire shadow river game heart ghost summer winter "
+    "nuit amour ciudad noche Liebe Stadt notte città гора ночь καρδιά 夜"
+).split()
+
+
+def _live_name(rng: random.Random) -> str:
+    country: str = rng.choice(list(BRANDS))
+    return (
+        rng.choice(PREFIX_STYLES).format(c=country)
+        + rng.choice(BRANDS[country])
+        + rng.choice(QUALITY_TAGS)
+        + rng.choice(SUFFIX_TAGS)
+    )
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 4))).title()
+
+
+def build_catalog(channels: int, seed: int = 0) -> List[ChannelEntity]:
+    rng = random.Random(seed)
+    catalog: List[ChannelEntity] = []
+    for channel_type, share in TYPE_SHARES:
+        for _ in range(round(channels * share)):
+            i: int = len(catalog)
+            if channel_type == ChannelType.LIVE:
+                name, url = _live_name(rng), f"{BASE_URL}/live/user/pass/{i}.ts"
+            elif channel_type == ChannelType.VOD:
+                language: str = rng.choice(["EN", "FR", "DE", "ES", "MULTI"])
+                name = f"{language} - {_title(rng)} ({rng.randint(1950, 2025)})"
+                url = f"{BASE_URL}/movie/user/pass/{i}.mkv"
+            else:
+                name, url = f"{_title(rng)} S{rng.randint(1, 12):02d}", ""
+            catalog.append(
+                ChannelEntity(id=str(i), name=name, playable_url=url, type=channel_type)
+            )
+    return catalog[:channels]
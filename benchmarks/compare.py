@@ -0,0 +1,63 @@
+"""Compare two benchmarks.suite results, flagging changes beyond a threshold.
+
+Every numeric metric present in both runs (startup and each catalog size) is
+listed with its ratio new/old. Lower is better for all of them except rates
+(``*_per_s``); changes for the worse by more than ``--threshold`` are marked
+as regressions, and the exit status is 1 if there are any.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Tuple
+
+
+def flatten(tree: Dict, path: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in tree.items():
+        name = f"{path}.{key}" if path else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, float(value)
+
+
+def measured(results: Dict) -> Dict[str, float]:
+    # Runs from before startup was measured have only sizes.
+    return {
+        **dict(flatten(results.get("startup", {}), "startup")),
+        **dict(flatten(results["sizes"])),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = measured(json.load(f))
+    with open(args.new, encoding="utf-8") as f:
+        new = measured(json.load(f))
+
+    regressions = 0
+    for name in sorted(old.keys() & new.keys()):
+        if not old[name]:
+            continue
+        ratio = new[name] / old[name]
+        worse = (
+            ratio < 1 / (1 + args.threshold)
+            if name.endswith("_per_s")
+            else (ratio > 1 + args.threshold)
+        )
+        regressions += worse
+        marker = "REGRESSION" if worse else ""
+        print(f"{name:<70} {old[name]:>12g} {new[name]:>12g} {ratio:>7.2f}x {marker}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
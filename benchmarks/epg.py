@@ -0,0 +1,109 @@
+"""Measure XMLTV guide ingest and now/next lookup latency.
+
+Writes a generated guide (a week of half-hour slots per channel), ingests
+it through XMLTVGuideSource into ProgrammeStorageSQLite, then times the
+batched now/next lookup for screens of 30 live channels.
+
+    python -m benchmarks.epg --channels 3000 --days 7
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Dict
+
+from pyiptv.dao.channel_retreival.xmltv import XMLTVGuideSource, iter_xmltv
+from pyiptv.dao.programme_storage.sqlite import ProgrammeStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+SLOT = 1800
+
+
+def write_guide(path: str, channels: int, days: int, start: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<tv>\n')
+        for c in range(channels):
+            f.write(
+                f'<channel id="ch{c}.uk"><display-name>Channel {c} HD</display-name>'
+                f'<icon src="http://img.example/{c}.png"/></channel>\n'
+            )
+        for c in range(channels):
+            for slot in range(days * 86400 // SLOT):
+                begin = time.strftime("%Y%m%d%H%M%S", time.gmtime(start + slot * SLOT))
+                end = time.strftime(
+                    "%Y%m%d%H%M%S", time.gmtime(start + (slot + 1) * SLOT)
+                )
+                f.write(
+                    f'<programme start="{begin} +0000" stop="{end} +0000" '
+                    f'channel="ch{c}.uk"><title lang="en">Show {c}-{slot}</title>'
+                    f"<desc>Episode {slot} of a show on channel {c}.</desc></programme>\n"
+                )
+        f.write("</tv>\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    start = int(time.time()) // SLOT * SLOT - SLOT
+    results: Dict = {}
+    with tempfile.TemporaryDirectory() as directory:
+        guide_path = os.path.join(directory, "guide.xml")
+        write_guide(guide_path, args.channels, args.days, start)
+        results["guide_mib"] = round(os.path.getsize(guide_path) / (1024 * 1024), 2)
+
+        tracemalloc.start()
+        with open(guide_path, "rb") as f:
+            parsed = sum(1 for _ in iter_xmltv(f))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["parse_peak_mib"] = round(peak / (1024 * 1024), 2)
+
+        storage = ProgrammeStorageSQLite(os.path.join(directory, "epg.db"))
+        begin = time.perf_counter()
+        stored = storage.replace_guide(XMLTVGuideSource(guide_path).retreive_guide())
+        elapsed = time.perf_counter() - begin
+        results["ingest"] = {
+            "items": parsed,
+            "programmes": stored,
+            "ingest_s": round(elapsed, 2),
+            "programmes_per_s": round(stored / elapsed),
+            "database_mib": round(
+                os.path.getsize(os.path.join(directory, "epg.db")) / (1024 * 1024), 2
+            ),
+        }
+
+        rng = random.Random(0)
+        timings = []
+        for _ in range(args.lookups):
+            screen = [
+                ChannelEntity(
+                    id=str(c),
+                    name=f"Channel {c} HD",
+                    playable_url=f"http://provider.example/live/u/p/{c}.ts",
+                    type=ChannelType.LIVE,
+                )
+                for c in rng.sample(range(args.channels), 30)
+            ]
+            begin = time.perf_counter()
+            storage.now_next(screen)
+            timings.append((time.perf_counter() - begin) * 1000)
+        timings.sort()
+        results["now_next_30_channels"] = {
+            "median_ms": round(statistics.median(timings), 3),
+            "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 3),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
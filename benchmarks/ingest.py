@@ -0,0 +1,68 @@
+"""Measure catalog ingest throughput of each engine, incremental vs bulk load.
+
+The catalog is written in pages, as a sync does: either page by page with
+the index kept current, or inside ``bulk_load`` with the index built once.
+
+    python -m benchmarks.ingest --channels 200000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.search_engines import ENGINES, build_catalog
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+
+def ingest(
+    engine: Callable[[str], BaseChannelStorage],
+    catalog: List[ChannelEntity],
+    page_size: int,
+    bulk: bool,
+) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        storage = engine(os.path.join(directory, "catalog.db"))
+        pages = [catalog[i : i + page_size] for i in range(0, len(catalog), page_size)]
+        start = time.perf_counter()
+        if bulk:
+            with storage.bulk_load():
+                for page in pages:
+                    storage.save_channel_bulk(page)
+        else:
+            for page in pages:
+                storage.save_channel_bulk(page)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        storage.search("sports hd", [ChannelType.LIVE], limit=60)
+        return {
+            "ingest_s": round(elapsed, 3),
+            "rows_per_s": round(len(catalog) / elapsed),
+            "first_search_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.channels, args.seed)
+    results = {
+        name: {
+            mode: ingest(engine, catalog, args.page_size, bulk=mode == "bulk")
+            for mode in ("incremental", "bulk")
+        }
+        for name, engine in ENGINES.items()
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
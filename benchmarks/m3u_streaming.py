@@ -0,0 +1,118 @@
+"""Measure M3U playlist parsing throughput and peak memory.
+
+Writes a generated ``m3u_plus`` style playlist to a file and serves it from
+a local HTTP server, then reads every entry through M3UChannelSource from
+both, reporting rows per second and time-to-first-batch, then peak Python
+memory from a second, traced read (tracing slows parsing several times).
+
+    python -m benchmarks.m3u_streaming --entries 500000
+"""
+
+import argparse
+import http.server
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Dict
+
+from pyiptv.dao.channel_retreival.m3u import M3UChannelSource
+from pyiptv.enum.channel_type import ChannelType
+
+BASE = "http://provider.example:8080"
+
+
+def write_playlist(path: str, entries: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("#EXTM3U\n")
+        for i in range(entries):
+            if i % 5 == 0:
+                kind, group, url = "VOD", "Movies", f"{BASE}/movie/u/p/{i}.mkv"
+            elif i % 5 == 1:
+                kind, group, url = "Series", "Shows", f"{BASE}/series/u/p/{i}.mp4"
+            else:
+                kind, group, url = "Live", "UK | Sports", f"{BASE}/u/p/{i}"
+            f.write(
+                f'#EXTINF:-1 tvg-id="ch{i}.uk" tvg-name="{kind} Channel {i} HD" '
+                f'tvg-logo="http://img.example/{i}.png" group-title="{group}",'
+                f"{kind} Channel {i} HD\n{url}\n"
+            )
+
+
+def serve(path: str) -> http.server.ThreadingHTTPServer:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/x-mpegurl")
+            self.send_header("Content-Length", str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, "rb") as f:
+                while chunk := f.read(64 * 1024):
+                    self.wfile.write(chunk)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def read_all(location: str, page_size: int) -> Dict[str, float]:
+    source = M3UChannelSource(location)
+    start = time.perf_counter()
+    first_batch = None
+    rows = 0
+    for _, batch in source.retreive_all(
+        [ChannelType.LIVE, ChannelType.VOD, ChannelType.SERIES], page_size
+    ):
+        if first_batch is None:
+            first_batch = time.perf_counter() - start
+        rows += len(batch)
+    total = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "rows_per_s": round(rows / total),
+        "time_to_first_batch_s": round(first_batch or 0.0, 4),
+        "total_s": round(total, 3),
+    }
+
+
+def measure(location: str, page_size: int) -> Dict[str, float]:
+    results = read_all(location, page_size)
+    tracemalloc.start()
+    read_all(location, page_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["peak_mib"] = round(peak / (1024 * 1024), 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500000)
+    parser.add_argument("--page-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "playlist.m3u")
+        write_playlist(path, args.entries)
+        server = serve(path)
+        try:
+            results = {
+                "playlist_mib": round(os.path.getsize(path) / (1024 * 1024), 2),
+                "file": measure(path, args.page_size),
+                "http": measure(
+                    f"http://127.0.0.1:{server.server_address[1]}/get.php",
+                    args.page_size,
+                ),
+            }
+        finally:
+            server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
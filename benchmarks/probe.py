@@ -0,0 +1,92 @@
+"""Measure stream probing throughput against a local server with slow streams.
+
+Serves streams that answer after a fixed delay (and a share of dead ones),
+then probes them all through StreamProber at several concurrency limits,
+reporting URLs checked per minute and the most requests in flight at once.
+
+    python -m benchmarks.probe --streams 2000 --delay 0.1
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+from typing import Dict
+
+from pyiptv.dao.channel_retreival.probe import StreamProber
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+
+def serve(delay: float) -> http.server.ThreadingHTTPServer:
+    lock = threading.Lock()
+    state = {"active": 0, "most_active": 0}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            with lock:
+                state["active"] += 1
+                state["most_active"] = max(state["most_active"], state["active"])
+            try:
+                time.sleep(delay)
+                dead = int(self.path.rsplit("/", 1)[1].split(".")[0]) % 10 == 0
+                body = b"" if dead else b"\x47" * 1024
+                self.send_response(404 if dead else 206)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with lock:
+                    state["active"] -= 1
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=2000)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = serve(args.delay)
+    base = f"http://127.0.0.1:{server.server_address[1]}/live/u/p/"
+    channels = [
+        ChannelEntity(
+            id=str(i),
+            name=f"Channel {i}",
+            playable_url=f"{base}{i}.ts",
+            type=ChannelType.LIVE,
+        )
+        for i in range(args.streams)
+    ]
+    results: Dict = {"streams": args.streams, "server_delay_s": args.delay}
+    try:
+        for workers in (1, 8, 32, 64):
+            server.state["most_active"] = 0
+            prober = StreamProber(max_workers=workers)
+            count = min(args.streams, workers * 50)
+            start = time.perf_counter()
+            alive = sum(r.alive for r in prober.probe_all(channels[:count]))
+            elapsed = time.perf_counter() - start
+            results[f"workers_{workers}"] = {
+                "probed": count,
+                "alive": alive,
+                "urls_per_min": round(count / elapsed * 60),
+                "most_in_flight": server.state["most_active"],
+            }
+    finally:
+        server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
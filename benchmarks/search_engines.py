@@ -0,0 +1,133 @@
+"""Compare index size, ingest time and query latency of the search engines.
+
+Every engine ingests the same generated catalog into a fresh database (or
+snapshot, for the in-memory engine), which is then reopened; each query is
+timed over several runs with the result cache cleared. Queries marked
+``~`` go through fuzzy search.
+
+    python -m benchmarks.search_engines --channels 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dao.channel_storage.memory import ChannelStorageMemory
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dao.channel_storage.sqlite_trigram import ChannelStorageSQLiteTrigram
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+ENGINES: Dict[str, Callable[[str], BaseChannelStorage]] = {
+    "ngram": ChannelStorageSQLite,
+    "trigram": ChannelStorageSQLiteTrigram,
+    "memory": ChannelStorageMemory,
+}
+
+QUERIES = ["sports hd", "spo", "news", "hd", "extreme sports channel", "zzzz"]
+# Typos of the target channel, timed through search_fuzzy.
+FUZZY_QUERIES = ["spotrs", "chanel hd", "extrem sprots chanel"]
+# Stream URLs as an Xtream source builds them.
+STREAM_URL_PREFIX = "http://provider.example:8080/live/username/password/"
+
+
+def build_catalog(channels: int, seed: int) -> List[ChannelEntity]:
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+
+    catalog = [
+        ChannelEntity(
+            id=str(i),
+            name=" ".join(word() for _ in range(rng.randint(1, 8))),
+            playable_url=f"{STREAM_URL_PREFIX}{i}.ts",
+            type=ChannelType.LIVE,
+        )
+        for i in range(channels)
+    ]
+    catalog.append(
+        ChannelEntity(
+            id="target",
+            name="Extreme Sports Channel HD",
+            playable_url=f"{STREAM_URL_PREFIX}target.ts",
+            type=ChannelType.LIVE,
+        )
+    )
+    return catalog
+
+
+def database_size(path: str) -> int:
+    return sum(
+        os.path.getsize(path + suffix)
+        for suffix in ("", "-wal")
+        if os.path.exists(path + suffix)
+    )
+
+
+def measure(
+    engine: Callable[[str], BaseChannelStorage],
+    catalog: List[ChannelEntity],
+    runs: int,
+) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        storage = engine(path)
+        start = time.perf_counter()
+        storage.save_channel_bulk(catalog)
+        ingest = time.perf_counter() - start
+        if isinstance(storage, ChannelStorageMemory):
+            storage.save_snapshot()
+        else:
+            storage.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        start = time.perf_counter()
+        storage = engine(path)
+        reopen = time.perf_counter() - start
+
+        latencies: Dict[str, Dict[str, float]] = {}
+        searches = [(query, storage.search) for query in QUERIES] + [
+            (f"~{query}", storage.search_fuzzy) for query in FUZZY_QUERIES
+        ]
+        for label, search in searches:
+            samples = []
+            for _ in range(runs):
+                if isinstance(storage, ChannelStorageSQLite):
+                    storage.query_cache.invalidate()
+                start = time.perf_counter()
+                search(label.lstrip("~"), [ChannelType.LIVE], limit=60)
+                samples.append((time.perf_counter() - start) * 1000)
+            latencies[label] = {
+                "median_ms": round(statistics.median(samples), 3),
+                "max_ms": round(max(samples), 3),
+            }
+        return {
+            "ingest_s": round(ingest, 3),
+            "reopen_s": round(reopen, 3),
+            "database_mib": round(database_size(path) / (1024 * 1024), 2),
+            "queries": latencies,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.channels, args.seed)
+    results = {
+        name: measure(engine, catalog, args.runs) for name, engine in ENGINES.items()
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
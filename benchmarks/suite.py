@@ -0,0 +1,267 @@
+"""Benchmark every storage engine on realistic catalogs, as JSON.
+
+For each catalog size and engine, two fresh processes run in turn, so that
+neither timings nor memory carry over between engines:
+
+* ingest: a first sync of the generated catalog in pages, as
+  ``pyiptv sync`` runs it (in one bulk load), reporting rows per second
+  and peak RSS;
+* search: reopens the stored catalog, then times the first (cold) search
+  of each query, repeated (warm) searches with the result cache cleared,
+  fuzzy searches, and every keystroke of typing each query as the CLI
+  issues it (a count plus the first page of results), reporting p50, p95
+  and p99 latencies and the RSS the open catalog adds.
+
+Once per run, the import time of the CLI entry point is measured in fresh
+interpreters and checked against its budget.
+
+Results carry the commit and environment they were measured on; compare
+two runs with ``python -m benchmarks.compare``.
+
+    python -m benchmarks.suite --sizes 10000 100000 1000000 --output run.json
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.catalog import build_catalog
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dao.channel_storage.memory import ChannelStorageMemory
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dao.channel_storage.sqlite_trigram import ChannelStorageSQLiteTrigram
+from pyiptv.enum.channel_type import ChannelType
+
+ENGINES: Dict[str, Callable[[str], BaseChannelStorage]] = {
+    "ngram": ChannelStorageSQLite,
+    "trigram": ChannelStorageSQLiteTrigram,
+    "memory": ChannelStorageMemory,
+}
+TYPES = [ChannelType.LIVE, ChannelType.VOD, ChannelType.SERIES]
+QUERIES = [
+    "bbc one",
+    "sky sports",
+    "tf1",
+    "canal+ sport",
+    "hd",
+    "первый",
+    "الجزيرة",
+    "the lost city",
+    "zzzz",
+]
+FUZZY_QUERIES = ["sky sprots", "bcc one", "telecinko"]
+PAGE_SIZE = 30
+SYNC_PAGE_SIZE = 10000
+# Import time `import pyiptv.main` should stay within; it takes ~30 ms once
+# heavy modules are deferred, against ~285 ms when they were not.
+IMPORT_BUDGET_MS = 120
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 3)
+
+    return {"p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99)}
+
+
+def rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux.
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def current_rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+def database_mib(path: str) -> float:
+    size = sum(
+        os.path.getsize(path + suffix)
+        for suffix in ("", "-wal")
+        if os.path.exists(path + suffix)
+    )
+    return round(size / (1024 * 1024), 2)
+
+
+def import_ms(module: str) -> float:
+    """Cumulative import time of module in a fresh interpreter."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise ValueError(f"No import time reported for {module}")
+
+
+def run_startup(runs: int) -> Dict:
+    samples = [import_ms("pyiptv.main") for _ in range(runs)]
+    import_main = percentiles(samples)
+    return {
+        "import_main": import_main,
+        "within_budget": import_main["p50_ms"] <= IMPORT_BUDGET_MS,
+    }
+
+
+def clear_result_cache(storage: BaseChannelStorage) -> None:
+    if isinstance(storage, ChannelStorageSQLite):
+        storage.query_cache.invalidate()
+
+
+def run_ingest(engine: str, path: str, size: int, seed: int) -> Dict:
+    catalog = build_catalog(size, seed)
+    storage = ENGINES[engine](path)
+    start = time.perf_counter()
+    with storage.bulk_load():
+        for channel_type in TYPES:
+            storage.begin_sync(channel_type)
+            of_type = [ch for ch in catalog if ch.type == channel_type]
+            for i in range(0, len(of_type), SYNC_PAGE_SIZE):
+                storage.sync_channel_bulk(of_type[i : i + SYNC_PAGE_SIZE])
+            storage.finish_sync(channel_type)
+        storage.end_sync()
+    elapsed = time.perf_counter() - start
+    if isinstance(storage, ChannelStorageSQLite):
+        storage.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return {
+        "rows": len(catalog),
+        "ingest_s": round(elapsed, 3),
+        "rows_per_s": round(len(catalog) / elapsed),
+        "peak_rss_mib": rss_mib(),
+        "database_mib": database_mib(path),
+    }
+
+
+def run_search(engine: str, path: str, runs: int) -> Dict:
+    baseline = current_rss_mib()
+    start = time.perf_counter()
+    storage = ENGINES[engine](path)
+    open_s = time.perf_counter() - start
+
+    cold: Dict[str, float] = {}
+    for query in QUERIES:
+        start = time.perf_counter()
+        storage.search(query, TYPES, limit=PAGE_SIZE)
+        cold[query] = round((time.perf_counter() - start) * 1000, 3)
+
+    warm: List[float] = []
+    for _ in range(runs):
+        for query in QUERIES:
+            clear_result_cache(storage)
+            start = time.perf_counter()
+            storage.search(query, TYPES, limit=PAGE_SIZE)
+            warm.append((time.perf_counter() - start) * 1000)
+
+    fuzzy: List[float] = []
+    for _ in range(runs):
+        for query in FUZZY_QUERIES:
+            start = time.perf_counter()
+            storage.search_fuzzy(query, TYPES)
+            fuzzy.append((time.perf_counter() - start) * 1000)
+
+    keystrokes: List[float] = []
+    for _ in range(runs):
+        clear_result_cache(storage)
+        for query in QUERIES:
+            for typed in range(1, len(query) + 1):
+                start = time.perf_counter()
+                if storage.count(query[:typed], TYPES):
+                    storage.search(query[:typed], TYPES, limit=PAGE_SIZE)
+                keystrokes.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "open_s": round(open_s, 3),
+        "open_rss_mib": round(current_rss_mib() - baseline, 1),
+        "cold_first_search_ms": cold,
+        "warm_search": percentiles(warm),
+        "fuzzy_search": percentiles(fuzzy),
+        "keystroke": {"samples": len(keystrokes), **percentiles(keystrokes)},
+    }
+
+
+def in_fresh_process(function: Callable, *args) -> Dict:
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return executor.submit(function, *args).result()
+
+
+def environment() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=None)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results: Dict = {
+        "environment": environment(),
+        "seed": args.seed,
+        "startup": run_startup(args.runs),
+        "sizes": {},
+    }
+    if not results["startup"]["within_budget"]:
+        print(
+            f"Importing pyiptv.main exceeds its {IMPORT_BUDGET_MS} ms budget",
+            file=sys.stderr,
+        )
+    for size in args.sizes:
+        by_engine: Dict[str, Dict] = {}
+        for engine in args.engines or list(ENGINES):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "catalog.db")
+                by_engine[engine] = {
+                    "ingest": in_fresh_process(
+                        run_ingest, engine, path, size, args.seed
+                    ),
+                    "search": in_fresh_process(run_search, engine, path, args.runs),
+                }
+            print(f"{size} {engine} done", file=sys.stderr)
+        results["sizes"][str(size)] = by_engine
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
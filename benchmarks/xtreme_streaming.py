@@ -0,0 +1,99 @@
+"""Compare buffered and streaming parsing of Xtreme stream listings.
+
+Serves a generated ``get_vod_streams`` payload from a local HTTP server and
+reports peak Python memory and time-to-first-batch for both modes.
+
+    python -m benchmarks.xtreme_streaming --entries 200000
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+import tracemalloc
+from typing import Dict
+
+from pyiptv.dao.channel_retreival.xtreme import XtremeChannelSource
+from pyiptv.enum.channel_type import ChannelType
+
+
+def build_payload(entries: int) -> bytes:
+    streams = [
+        {
+            "num": i,
+            "name": f"VOD Title {i} (2024) [HD]",
+            "stream_type": "movie",
+            "stream_id": i,
+            "stream_icon": f"http://img.example/{i}.jpg",
+            "rating": "7.1",
+            "added": "1700000000",
+            "category_id": str(i % 300),
+            "container_extension": "mkv",
+            "direct_source": "",
+        }
+        for i in range(entries)
+    ]
+    return json.dumps(streams).encode("utf-8")
+
+
+def serve(payload: bytes) -> http.server.ThreadingHTTPServer:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(base_url: str, stream: bool, page_size: int) -> Dict[str, float]:
+    source = XtremeChannelSource(base_url, "user", "pass", stream=stream)
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_batch = None
+    rows = 0
+    for batch in source.retreive_channels_by_type(ChannelType.VOD, page_size):
+        if first_batch is None:
+            first_batch = time.perf_counter() - start
+        rows += len(batch)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": rows,
+        "time_to_first_batch_s": round(first_batch or 0.0, 4),
+        "total_s": round(total, 4),
+        "peak_mib": round(peak / (1024 * 1024), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    payload = build_payload(args.entries)
+    server = serve(payload)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results = {
+            "payload_mib": round(len(payload) / (1024 * 1024), 2),
+            "buffered": measure(base_url, stream=False, page_size=args.page_size),
+            "streaming": measure(base_url, stream=True, page_size=args.page_size),
+        }
+    finally:
+        server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import dataclasses
+import hashlib
+import os
+import urllib.parse
+from typing import List, Optional
+
+DEFAULT_CACHE_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_PROBE_WORKERS = 8
+DEFAULT_METRICS_INTERVAL_SECONDS = 15
+SEARCH_ENGINES = ("ngram", "trigram", "memory")
+PLAYER_MODES = ("spawn", "warm")
+
+
+def cache_dir() -> str:
+    """Directory for persistent catalog databases, following the XDG spec."""
+    override = os.getenv("PYIPTV_CACHE_DIR")
+    if override:
+        return override
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(xdg_cache_home, "pyiptv")
+
+
+def cache_ttl() -> float:
+    """Seconds a synced catalog stays fresh before it is fetched again."""
+    return float(os.getenv("PYIPTV_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS))
+
+
+def search_engine() -> str:
+    """Search engine for the catalog, one of SEARCH_ENGINES."""
+    engine = os.getenv("PYIPTV_SEARCH_ENGINE", SEARCH_ENGINES[0])
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(
+            f"PYIPTV_SEARCH_ENGINE must be one of {', '.join(SEARCH_ENGINES)}"
+        )
+    return engine
+
+
+def player_mode() -> str:
+    """How VLC is driven, one of PLAYER_MODES (PYIPTV_PLAYER_MODE).
+
+    "spawn" starts a new VLC for every channel; "warm" keeps one VLC running
+    and switches channels over its remote control interface, and is opt-in
+    until it has been checked against real VLC builds on each platform.
+    """
+    mode = os.getenv("PYIPTV_PLAYER_MODE", PLAYER_MODES[0])
+    if mode not in PLAYER_MODES:
+        raise ValueError(f"PYIPTV_PLAYER_MODE must be one of {', '.join(PLAYER_MODES)}")
+    return mode
+
+
+def catalog_db_path(*source_identity: str, suffix: str = ".db") -> str:
+    """Per-source database path so switching providers never mixes catalogs."""
+    digest = hashlib.sha1("\x1f".join(source_identity).encode("utf-8")).hexdigest()
+    directory = cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"catalog-{digest[:16]}{suffix}")
+
+
+@dataclasses.dataclass(frozen=True)
+class XtremeProvider:
+    id: str
+    url: str
+    username: str
+    password: str
+
+
+def xtreme_providers() -> List[XtremeProvider]:
+    """Configured Xtreme providers, in order.
+
+    The first is read from XTREME_URL, XTREME_USERNAME and XTREME_PASSWORD,
+    further ones from the same variables suffixed with _2, _3 and so on,
+    up to the first number that is not set. XTREME_ID (suffixed likewise)
+    names a provider in channel ids; it defaults to p1, p2, ...
+    """
+    providers: List[XtremeProvider] = []
+    while True:
+        n: int = len(providers) + 1
+        suffix: str = "" if n == 1 else f"_{n}"
+        url = os.getenv(f"XTREME_URL{suffix}", "")
+        if not url:
+            return providers
+        provider = XtremeProvider(
+            id=os.getenv(f"XTREME_ID{suffix}", f"p{n}"),
+            url=url,
+            username=os.getenv(f"XTREME_USERNAME{suffix}", ""),
+            password=os.getenv(f"XTREME_PASSWORD{suffix}", ""),
+        )
+        if not all([provider.url, provider.username, provider.password]):
+            raise ValueError(
+                f"XTREME_URL{suffix}, XTREME_USERNAME{suffix}, and "
+                f"XTREME_PASSWORD{suffix} must be set in environment variables."
+            )
+        if any(other.id == provider.id for other in providers):
+            raise ValueError(f"XTREME_ID{suffix} repeats provider id {provider.id}")
+        providers.append(provider)
+
+
+@dataclasses.dataclass(frozen=True)
+class M3UProvider:
+    id: str
+    location: str
+
+
+def m3u_providers() -> List[M3UProvider]:
+    """Configured M3U playlists, in order.
+
+    Read from M3U_URL (an HTTP(S) URL or a file path), then M3U_URL_2,
+    M3U_URL_3 and so on. M3U_ID (suffixed likewise) names a playlist in
+    channel ids; it defaults to m1, m2, ...
+    """
+    providers: List[M3UProvider] = []
+    while True:
+        n: int = len(providers) + 1
+        suffix: str = "" if n == 1 else f"_{n}"
+        location = os.getenv(f"M3U_URL{suffix}", "")
+        if not location:
+            return providers
+        providers.append(
+            M3UProvider(id=os.getenv(f"M3U_ID{suffix}", f"m{n}"), location=location)
+        )
+
+
+def epg_location(providers: List[XtremeProvider]) -> Optional[str]:
+    """XMLTV guide to load: EPG_URL (a URL or file path), else the first
+    Xtreme provider's xmltv.php, else None."""
+    location = os.getenv("EPG_URL", "")
+    if location:
+        return location
+    if providers:
+        provider = providers[0]
+        query = urllib.parse.urlencode(
+            {"username": provider.username, "password": provider.password}
+        )
+        return f"{provider.url.rstrip('/')}/xmltv.php?{query}"
+    return None
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def probe_streams() -> bool:
+    """Whether the CLI checks that the streams it lists answer (PYIPTV_PROBE_STREAMS).
+
+    Off by default: providers often cap connections per account, and a
+    probe takes one while it runs.
+    """
+    return _flag("PYIPTV_PROBE_STREAMS")
+
+
+def probe_workers() -> int:
+    """Most streams probed at once (PYIPTV_PROBE_WORKERS)."""
+    return int(os.getenv("PYIPTV_PROBE_WORKERS", DEFAULT_PROBE_WORKERS))
+
+
+def hide_dead_streams() -> bool:
+    """Whether channels whose stream was found dead are left out of results."""
+    return _flag("PYIPTV_HIDE_DEAD")
+
+
+def log_level(default: str = "INFO") -> str:
+    """Log level (PYIPTV_LOG_LEVEL); DEBUG logs every search."""
+    return os.getenv("PYIPTV_LOG_LEVEL", default).upper()
+
+
+def metrics_file() -> Optional[str]:
+    """Where to export metrics (PYIPTV_METRICS_FILE), if anywhere.
+
+    A path ending in .prom gets the Prometheus text format, others JSON.
+    """
+    return os.getenv("PYIPTV_METRICS_FILE") or None
+
+
+def metrics_interval() -> float:
+    """Seconds between metrics exports (PYIPTV_METRICS_INTERVAL)."""
+    return float(os.getenv("PYIPTV_METRICS_INTERVAL", DEFAULT_METRICS_INTERVAL_SECONDS))
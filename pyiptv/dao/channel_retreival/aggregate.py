@@ -0,0 +1,78 @@
+import functools
+import logging
+from typing import Dict, Generator, Iterable, List
+
+from pyiptv.dao.channel_retreival.base import (
+    BaseChannelRetrieval,
+    ChannelRetrievalError,
+    TaggedBatch,
+)
+from pyiptv.dao.channel_retreival.concurrent import merge_concurrently
+from pyiptv.dto.channel import PROVIDER_SEPARATOR, ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+logger = logging.getLogger(__name__)
+
+
+class AggregateChannelSource(BaseChannelRetrieval):
+    """The catalogs of several providers, retrieved as one.
+
+    Every channel id is namespaced as ``<provider><PROVIDER_SEPARATOR><id>``
+    so ids from different providers never collide in storage. Providers are
+    fetched on threads of their own, so retrieval takes about as long as
+    the slowest of them rather than their sum. A failing provider does not
+    stop the others; its types are reported failed once they are done.
+    """
+
+    def __init__(self, sources: Dict[str, BaseChannelRetrieval]) -> None:
+        for provider in sources:
+            if not provider or PROVIDER_SEPARATOR in provider:
+                raise ValueError(
+                    f"Provider id {provider!r} must be non-empty and not contain "
+                    f"{PROVIDER_SEPARATOR!r}"
+                )
+        self.sources: Dict[str, BaseChannelRetrieval] = dict(sources)
+
+    def retreive_channels_by_type(
+        self, channel_type: ChannelType, page_size: int = 10000
+    ) -> Generator[List[ChannelEntity], None, None]:
+        for _, batch in self.retreive_all([channel_type], page_size):
+            yield batch
+
+    def retreive_all(
+        self, channel_types: Iterable[ChannelType], page_size: int = 10000
+    ) -> Generator[TaggedBatch, None, None]:
+        channel_types = list(channel_types)
+        return merge_concurrently(
+            [
+                functools.partial(
+                    self._retreive_provider, provider, channel_types, page_size
+                )
+                for provider in self.sources
+            ],
+            max_pending=4 * len(self.sources),
+        )
+
+    def _retreive_provider(
+        self, provider: str, channel_types: List[ChannelType], page_size: int
+    ) -> Generator[TaggedBatch, None, None]:
+        try:
+            for channel_type, batch in self.sources[provider].retreive_all(
+                channel_types, page_size=page_size
+            ):
+                yield channel_type, [ch.namespaced(provider) for ch in batch]
+        except ChannelRetrievalError as e:
+            logger.error(f"Provider {provider} failed: {e}")
+            raise ChannelRetrievalError(
+                f"{provider}: {e}", channel_types=e.channel_types
+            ) from e
+
+    def retreive_series_episodes(self, series_id: str) -> List[ChannelEntity]:
+        provider, _, provider_series_id = series_id.partition(PROVIDER_SEPARATOR)
+        source = self.sources.get(provider)
+        if source is None or not provider_series_id:
+            raise ChannelRetrievalError(f"No provider for series {series_id}")
+        return [
+            episode.namespaced(provider)
+            for episode in source.retreive_series_episodes(provider_series_id)
+        ]
@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Generator, List
+from typing import Generator, Iterable, List, Tuple
 
 from pyiptv.dto.channel import ChannelEntity
 from pyiptv.enum.channel_type import ChannelType
 
+TaggedBatch = Tuple[ChannelType, List[ChannelEntity]]
+
+
+class ChannelRetrievalError(Exception):
+    """Raised when a channel listing could not be retrieved completely."""
+
+    def __init__(self, message: str, channel_types: Iterable[ChannelType] = ()):
+        super().__init__(message)
+        self.channel_types: List[ChannelType] = list(channel_types)
+
 
 class BaseChannelRetrieval(ABC):
     @abstractmethod
@@ -11,3 +21,38 @@ class BaseChannelRetrieval(ABC):
         self, channel_type: ChannelType, page_size: int
     ) -> Generator[List[ChannelEntity], None, None]:
         pass
+
+    def retreive_series_episodes(self, series_id: str) -> List[ChannelEntity]:
+        """Playable episodes of a series, in season and episode order."""
+        raise NotImplementedError(f"{type(self).__name__} does not support series.")
+
+    def retreive_all(
+        self, channel_types: Iterable[ChannelType], page_size: int
+    ) -> Generator[TaggedBatch, None, None]:
+        """Yield batches of every requested type, tagged with their type.
+
+        Types are fetched one after another here; sources that can fetch
+        them in parallel override this. A failing type does not stop the
+        others: failures are collected and raised as one
+        ChannelRetrievalError once every other type has been yielded.
+        """
+        failed: List[ChannelType] = []
+        for channel_type in channel_types:
+            try:
+                yield from self._retreive_tagged(channel_type, page_size)
+            except ChannelRetrievalError as e:
+                failed.extend(e.channel_types)
+        if failed:
+            raise ChannelRetrievalError(
+                f"Failed to retrieve {', '.join(t.value for t in failed)}",
+                channel_types=failed,
+            )
+
+    def _retreive_tagged(
+        self, channel_type: ChannelType, page_size: int
+    ) -> Generator[TaggedBatch, None, None]:
+        try:
+            for batch in self.retreive_channels_by_type(channel_type, page_size):
+                yield channel_type, batch
+        except ChannelRetrievalError as e:
+            raise ChannelRetrievalError(str(e), channel_types=[channel_type]) from e
@@ -0,0 +1,73 @@
+import queue
+import threading
+from typing import Any, Callable, Generator, Iterable, List, Optional, TypeVar
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def merge_concurrently(
+    producers: List[Callable[[], Iterable[T]]], max_pending: int = 4
+) -> Generator[T, None, None]:
+    """Run each producer on its own thread and yield items as they arrive.
+
+    At most ``max_pending`` items are buffered, so fast producers wait for
+    the consumer instead of piling batches up in memory. Once all producers
+    are done, ChannelRetrievalErrors are merged into one; any other
+    exception is re-raised as is.
+    """
+    items: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(producer: Callable[[], Iterable[T]]) -> None:
+        try:
+            for item in producer():
+                if not put(item):
+                    return
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            put(_DONE)
+
+    threads = [
+        threading.Thread(target=run, args=(producer,), daemon=True)
+        for producer in producers
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = items.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        # Unblocks producers if the consumer stops early.
+        stop.set()
+
+    first_other: Optional[BaseException] = next(
+        (e for e in errors if not isinstance(e, ChannelRetrievalError)), None
+    )
+    if first_other is not None:
+        raise first_other
+    if errors:
+        channel_types = [t for e in errors for t in e.channel_types]
+        raise ChannelRetrievalError(
+            "; ".join(str(e) for e in errors), channel_types=channel_types
+        )
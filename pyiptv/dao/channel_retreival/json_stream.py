@@ -0,0 +1,89 @@
+import codecs
+import json
+from typing import Any, Generator, Iterable
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(
+    chunks: Iterable[bytes], encoding: str = "utf-8"
+) -> Generator[Any, None, None]:
+    """Incrementally decode the elements of a top-level JSON array.
+
+    Elements are yielded as soon as they are fully received, so only the
+    element currently being decoded (plus one chunk) is held in memory.
+    Raises ValueError if the payload is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    chunk_iter = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        for chunk in chunk_iter:
+            text = text_decoder.decode(chunk)
+            if text:
+                buffer = buffer[pos:] + text
+                pos = 0
+                return True
+        buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        pos = 0
+        eof = True
+        return True
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not fill():
+                return False
+
+    if not skip_whitespace():
+        raise ValueError("Empty JSON payload")
+    if buffer[pos] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unterminated JSON array")
+        char = buffer[pos]
+        if char == "]":
+            pos += 1
+            break
+        if started:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {pos}")
+            pos += 1
+            if not skip_whitespace():
+                raise ValueError("Unterminated JSON array")
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A value running up to the end of the buffer may be truncated
+            # (e.g. a number split across chunks), so wait for its delimiter.
+            if end == len(buffer) and not eof:
+                fill()
+                continue
+            break
+
+        pos = end
+        started = True
+        yield value
+
+    if skip_whitespace():
+        raise ValueError(f"Unexpected data after JSON array at offset {pos}")
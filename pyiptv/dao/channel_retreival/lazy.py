@@ -0,0 +1,39 @@
+import threading
+from typing import Callable, Generator, Iterable, List, Optional
+
+from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval, TaggedBatch
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+
+class LazyChannelSource(BaseChannelRetrieval):
+    """A source built by factory on first use.
+
+    Sources pull in an HTTP client and parsers; behind this, a start with a
+    fresh cached catalog never imports or builds them.
+    """
+
+    def __init__(self, factory: Callable[[], BaseChannelRetrieval]) -> None:
+        self.factory: Callable[[], BaseChannelRetrieval] = factory
+        self._source: Optional[BaseChannelRetrieval] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def source(self) -> BaseChannelRetrieval:
+        with self._lock:
+            if self._source is None:
+                self._source = self.factory()
+            return self._source
+
+    def retreive_channels_by_type(
+        self, channel_type: ChannelType, page_size: int
+    ) -> Generator[List[ChannelEntity], None, None]:
+        return self.source.retreive_channels_by_type(channel_type, page_size)
+
+    def retreive_series_episodes(self, series_id: str) -> List[ChannelEntity]:
+        return self.source.retreive_series_episodes(series_id)
+
+    def retreive_all(
+        self, channel_types: Iterable[ChannelType], page_size: int
+    ) -> Generator[TaggedBatch, None, None]:
+        return self.source.retreive_all(channel_types, page_size)
@@ -0,0 +1,103 @@
+import concurrent.futures
+import logging
+import time
+from typing import Generator, Iterable, Iterator, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+
+logger = logging.getLogger(__name__)
+
+# Bytes requested from a stream; any of them arriving shows it is playing.
+PROBE_BYTES = 1024
+
+
+class StreamProber:
+    """Checks whether channels' streams answer, a bounded number at a time.
+
+    A probe is a ranged GET for the first bytes of the stream, read up to
+    the first chunk: IPTV servers often reject HEAD or answer it without
+    checking the stream. At most ``max_workers`` probes run at once, each
+    on one pooled connection, so the number of open sockets stays bounded
+    however many channels are probed.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 5.0,
+    ) -> None:
+        self.max_workers: int = max_workers
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_workers, pool_maxsize=max_workers, pool_block=True
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Range": f"bytes=0-{PROBE_BYTES - 1}"})
+
+    def probe(self, channel: ChannelEntity) -> StreamHealth:
+        start: float = time.perf_counter()
+        try:
+            with self.session.get(
+                channel.playable_url, stream=True, timeout=self.timeout
+            ) as response:
+                if response.status_code >= 400:
+                    return self._result(
+                        channel, False, None, f"HTTP {response.status_code}"
+                    )
+                chunk: bytes = next(response.iter_content(PROBE_BYTES), b"")
+                latency_ms: float = (time.perf_counter() - start) * 1000
+                if not chunk:
+                    return self._result(channel, False, latency_ms, "empty response")
+                return self._result(channel, True, latency_ms)
+        except requests.RequestException as e:
+            return self._result(channel, False, None, type(e).__name__)
+
+    def probe_all(
+        self, channels: Iterable[ChannelEntity]
+    ) -> Generator[StreamHealth, None, None]:
+        """Probe every channel with a URL, yielding results as they complete.
+
+        Only a bounded number of probes is queued ahead of the running ones,
+        so channels can be a lazily produced, very long iterable.
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="stream-probe"
+        ) as executor:
+            pending: Set[concurrent.futures.Future] = set()
+            queued: Iterator[ChannelEntity] = (ch for ch in channels if ch.playable_url)
+            for channel in queued:
+                pending.add(executor.submit(self.probe, channel))
+                if len(pending) < 2 * self.max_workers:
+                    continue
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+            for future in concurrent.futures.as_completed(pending):
+                yield future.result()
+
+    def _result(
+        self,
+        channel: ChannelEntity,
+        alive: bool,
+        latency_ms: Optional[float],
+        detail: str = "",
+    ) -> StreamHealth:
+        if not alive:
+            logger.debug(f"Stream of {channel.id} is dead: {detail}")
+        return StreamHealth(
+            channel_id=channel.id,
+            channel_type=channel.type,
+            alive=alive,
+            latency_ms=latency_ms,
+            checked_at=time.time(),
+            detail=detail,
+        )
@@ -0,0 +1,137 @@
+import calendar
+import contextlib
+import gzip
+import io
+import logging
+import os
+import time
+from typing import IO, TYPE_CHECKING, Generator, Iterator, List, Optional, Union
+from xml.etree import ElementTree
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+from pyiptv.dto.programme import GuideChannel, Programme
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+GuideItem = Union[GuideChannel, Programme]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def parse_xmltv_time(value: str) -> Optional[int]:
+    """Unix timestamp of an XMLTV time such as ``20240101120000 +0100``."""
+    digits, _, offset = value.strip().partition(" ")
+    try:
+        timestamp: int = calendar.timegm(
+            (
+                int(digits[0:4]),
+                int(digits[4:6] or 1),
+                int(digits[6:8] or 1),
+                int(digits[8:10] or 0),
+                int(digits[10:12] or 0),
+                int(digits[12:14] or 0),
+            )
+        )
+        if offset:
+            sign: int = -1 if offset[0] == "-" else 1
+            offset = offset.lstrip("+-")
+            timestamp -= sign * (int(offset[0:2]) * 3600 + int(offset[2:4]) * 60)
+    except (ValueError, IndexError):
+        return None
+    return timestamp
+
+
+def iter_xmltv(
+    file: IO[bytes], since: Optional[int] = None
+) -> Generator[GuideItem, None, None]:
+    """Channels and programmes of an XMLTV guide, as they are parsed.
+
+    Each element is discarded once read, so memory stays flat however large
+    the guide. Programmes that ended before ``since`` or lack valid times or
+    a channel are skipped.
+    """
+    events = ElementTree.iterparse(file, events=("start", "end"))
+    _, root = next(events)
+    for event, element in events:
+        if event != "end":
+            continue
+        if element.tag == "programme":
+            start: Optional[int] = parse_xmltv_time(element.get("start", ""))
+            stop: Optional[int] = parse_xmltv_time(element.get("stop", ""))
+            channel: str = element.get("channel", "")
+            if (
+                start is not None
+                and stop is not None
+                and channel
+                and (since is None or stop > since)
+            ):
+                yield Programme(
+                    channel=channel,
+                    start=start,
+                    stop=stop,
+                    title=(element.findtext("title") or "").strip(),
+                )
+            root.clear()
+        elif element.tag == "channel":
+            names: List[str] = [
+                name.text.strip()
+                for name in element.findall("display-name")
+                if name.text and name.text.strip()
+            ]
+            if element.get("id") and names:
+                yield GuideChannel(id=element.get("id", ""), names=names)
+            root.clear()
+
+
+class XMLTVGuideSource:
+    """An XMLTV programme guide at a file path or HTTP(S) URL, gzipped or not."""
+
+    def __init__(self, location: str) -> None:
+        self.location: str = location
+        self._session: Optional["requests.Session"] = None
+
+    def retreive_guide(self) -> Generator[GuideItem, None, None]:
+        """Stream the guide's channels and programmes still to come."""
+        try:
+            with self._open() as file:
+                yield from iter_xmltv(file, since=int(time.time()))
+        # requests' exceptions are OSErrors.
+        except (OSError, ElementTree.ParseError) as e:
+            logger.error(f"Failed to read guide {self._display_location}: {e}")
+            raise ChannelRetrievalError(
+                f"Failed to read guide {self._display_location}"
+            ) from e
+
+    @property
+    def _display_location(self) -> str:
+        # Guide URLs carry credentials in their query string.
+        return self.location.split("?", 1)[0]
+
+    @contextlib.contextmanager
+    def _open(self) -> Iterator[IO[bytes]]:
+        if self.location.startswith(("http://", "https://")):
+            # Imported here: it is slow to import and file guides never need it.
+            import requests
+
+            if self._session is None:
+                self._session = requests.Session()
+            with self._session.get(self.location, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                yield _maybe_gunzip(response.raw)
+            return
+        with open(os.path.expanduser(self.location), "rb") as f:
+            yield _maybe_gunzip(f)
+
+
+def _maybe_gunzip(file: IO[bytes]) -> IO[bytes]:
+    # Guides are often served as .xml.gz without a Content-Encoding header.
+    buffered: io.BufferedReader = (
+        file if isinstance(file, io.BufferedReader) else io.BufferedReader(file)
+    )
+    if buffered.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=buffered)
+    return buffered
@@ -1,35 +1,180 @@
+import functools
 import logging
-from typing import Generator, List
+import sys
+from typing import Any, Callable, Dict, Generator, Iterable, List
 
 import requests
-
-from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval
+from requests.adapters import HTTPAdapter
+
+from pyiptv.dao.channel_retreival.base import (
+    BaseChannelRetrieval,
+    ChannelRetrievalError,
+    TaggedBatch,
+)
+from pyiptv.dao.channel_retreival.concurrent import merge_concurrently
+from pyiptv.dao.channel_retreival.json_stream import iter_json_array
 from pyiptv.dto.channel import ChannelEntity
 from pyiptv.enum.channel_type import ChannelType
+from pyiptv.metrics import counted_bytes, metrics
 
 logger = logging.getLogger(__name__)
 
+StreamMapper = Callable[[Dict[str, Any]], ChannelEntity]
+
 
 class XtremeChannelSource(BaseChannelRetrieval):
-    def __init__(self, base_url: str, username: str, password: str):
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        stream: bool = True,
+        chunk_size: int = 64 * 1024,
+    ):
         self.base_url = base_url.rstrip("/")
         self.username = username
         self.password = password
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.session = self._create_session()
+
+    def _create_session(self, pool_size: int = 8) -> requests.Session:
+        """Keep-alive session shared by all requests, including concurrent ones."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(
+            {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+        return session
+
+    def retreive_all(
+        self, channel_types: Iterable[ChannelType], page_size: int = 10000
+    ) -> Generator[TaggedBatch, None, None]:
+        """Fetch every requested type in parallel, yielding batches as they arrive."""
+        return merge_concurrently(
+            [
+                functools.partial(self._retreive_tagged, channel_type, page_size)
+                for channel_type in channel_types
+            ]
+        )
 
     def retreive_channels_by_type(
         self, channel_type: ChannelType, page_size: int = 10000
     ) -> Generator[List[ChannelEntity], None, None]:
         if channel_type == ChannelType.LIVE:
             return self._retreive_streams(
-                action="get_live_streams", page_size=page_size
+                action="get_live_streams",
+                page_size=page_size,
+                to_entity=self._live_to_entity,
+            )
+        if channel_type in (ChannelType.VOD, ChannelType.MOVIE):
+            # Xtreme has a single movie listing; MOVIE is served from it too,
+            # typed as requested so it lands in the matching table.
+            return self._retreive_streams(
+                action="get_vod_streams",
+                page_size=page_size,
+                to_entity=functools.partial(
+                    self._vod_to_entity, channel_type=channel_type
+                ),
+            )
+        if channel_type == ChannelType.SERIES:
+            return self._retreive_streams(
+                action="get_series",
+                page_size=page_size,
+                to_entity=self._series_to_entity,
             )
-        if channel_type == ChannelType.VOD:
-            return self._retreive_streams(action="get_vod_streams", page_size=page_size)
         else:
             raise NotImplementedError(f"Channel type {channel_type} not supported.")
 
+    def retreive_series_episodes(self, series_id: str) -> List[ChannelEntity]:
+        url = f"{self.base_url}/player_api.php"
+        params = {
+            "username": self.username,
+            "password": self.password,
+            "action": "get_series_info",
+            "series_id": series_id,
+        }
+        try:
+            logger.debug(f"Requesting episodes of series {series_id}")
+            response = self.session.get(url, params=params, timeout=60)
+            response.raise_for_status()
+            info = response.json()
+        except requests.RequestException as e:
+            logger.error(f"HTTP error while retrieving series {series_id}: {e}")
+            raise ChannelRetrievalError(f"Failed to retrieve series {series_id}") from e
+        except ValueError as e:
+            logger.error(f"Failed to parse JSON for series {series_id}: {e}")
+            raise ChannelRetrievalError(f"Invalid series {series_id} response") from e
+
+        seasons = info.get("episodes") if isinstance(info, dict) else None
+        if isinstance(seasons, dict):
+            seasons = [seasons[key] for key in sorted(seasons, key=_season_sort_key)]
+        episodes: List[ChannelEntity] = []
+        for season in seasons or []:
+            for episode in season:
+                episodes.append(self._episode_to_entity(episode))
+        logger.info(f"Retrieved {len(episodes)} episodes for series {series_id}")
+        return episodes
+
+    @functools.cached_property
+    def _url_prefixes(self) -> Dict[str, str]:
+        """Stream URL up to the id, per kind; shared by every entity of a kind."""
+        return {
+            kind: sys.intern(f"{self.base_url}/{kind}/{self.username}/{self.password}/")
+            for kind in ("live", "movie", "series")
+        }
+
+    def _live_to_entity(self, stream: Dict[str, Any]) -> ChannelEntity:
+        stream_id = stream.get("stream_id")
+        return ChannelEntity.from_parts(
+            id=str(stream_id),
+            name=stream.get("name", "").strip(),
+            url_prefix=self._url_prefixes["live"],
+            url_suffix=f"{stream_id}.ts",
+            type=ChannelType.LIVE,
+            epg_id=(stream.get("epg_channel_id") or "").strip(),
+        )
+
+    def _vod_to_entity(
+        self, stream: Dict[str, Any], channel_type: ChannelType
+    ) -> ChannelEntity:
+        stream_id = stream.get("stream_id")
+        extension = stream.get("container_extension") or "mp4"
+        return ChannelEntity.from_parts(
+            id=str(stream_id),
+            name=stream.get("name", "").strip(),
+            url_prefix=self._url_prefixes["movie"],
+            url_suffix=f"{stream_id}.{extension}",
+            type=channel_type,
+        )
+
+    def _series_to_entity(self, series: Dict[str, Any]) -> ChannelEntity:
+        # A series is not playable itself, its episodes are fetched on demand.
+        return ChannelEntity.from_parts(
+            id=str(series.get("series_id")),
+            name=series.get("name", "").strip(),
+            url_prefix="",
+            url_suffix="",
+            type=ChannelType.SERIES,
+        )
+
+    def _episode_to_entity(self, episode: Dict[str, Any]) -> ChannelEntity:
+        episode_id = episode.get("id")
+        extension = episode.get("container_extension") or "mp4"
+        return ChannelEntity.from_parts(
+            id=str(episode_id),
+            name=(
+                episode.get("title") or f"Episode {episode.get('episode_num', '')}"
+            ).strip(),
+            url_prefix=self._url_prefixes["series"],
+            url_suffix=f"{episode_id}.{extension}",
+            type=ChannelType.SERIES,
+        )
+
     def _retreive_streams(
-        self, action: str, page_size: int
+        self, action: str, page_size: int, to_entity: StreamMapper
     ) -> Generator[List[ChannelEntity], None, None]:
         url = f"{self.base_url}/player_api.php"
         params = {
@@ -39,40 +184,51 @@ class XtremeChannelSource(BaseChannelRetrieval):
         }
 
         try:
-            logger.debug(f"Requesting live streams from {url}")
-            response = requests.get(url, params=params, timeout=60)
-            response.raise_for_status()
-            streams = response.json()
-
-            logger.info(f"Retrieved {len(streams)} live streams")
-
-            batch: List[ChannelEntity] = []
+            logger.debug(f"Requesting {action} from {url} (stream={self.stream})")
+            with self.session.get(
+                url, params=params, timeout=60, stream=self.stream
+            ) as response:
+                response.raise_for_status()
+                streams: Iterable[Dict[str, Any]]
+                if self.stream:
+                    streams = iter_json_array(
+                        counted_bytes(
+                            response.iter_content(chunk_size=self.chunk_size),
+                            source="xtreme",
+                        )
+                    )
+                else:
+                    metrics.increment(
+                        "retrieval_bytes_total", len(response.content), source="xtreme"
+                    )
+                    streams = response.json()
 
-            for stream in streams:
-                stream_id = stream.get("stream_id")
-                name = stream.get("name", "").strip()
+                batch: List[ChannelEntity] = []
+                total = 0
 
-                playable_url = f"{self.base_url}/live/{self.username}/{self.password}/{stream_id}.ts"
+                for stream in streams:
+                    batch.append(to_entity(stream))
 
-                batch.append(
-                    ChannelEntity(
-                        id=str(stream_id),
-                        name=name,
-                        playable_url=playable_url,
-                        type=ChannelType.LIVE,
-                    )
-                )
+                    if len(batch) >= page_size:
+                        total += len(batch)
+                        logger.debug(f"Yielding batch of {len(batch)} channels")
+                        yield batch
+                        batch = []
 
-                if len(batch) >= page_size:
+                if batch:
+                    total += len(batch)
                     logger.debug(f"Yielding batch of {len(batch)} channels")
                     yield batch
-                    batch = []
 
-            if batch:
-                logger.debug(f"Yielding batch of {len(batch)} channels")
-                yield batch
+                logger.info(f"Retrieved {total} streams for {action}")
 
         except requests.RequestException as e:
-            logger.error(f"HTTP error while retrieving live streams: {e}")
+            logger.error(f"HTTP error while retrieving {action}: {e}")
+            raise ChannelRetrievalError(f"Failed to retrieve {action}") from e
         except ValueError as e:
-            logger.error(f"Failed to parse JSON from live streams response: {e}")
+            logger.error(f"Failed to parse JSON from {action} response: {e}")
+            raise ChannelRetrievalError(f"Invalid {action} response") from e
+
+
+def _season_sort_key(season: str) -> Any:
+    return (0, int(season)) if season.isdigit() else (1, season)
@@ -1,7 +1,9 @@
+import contextlib
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
 from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
 from pyiptv.enum.channel_type import ChannelType
 
 
@@ -18,8 +20,123 @@ class BaseChannelStorage(ABC):
     def get_channel(self, channel_id: str) -> Optional[ChannelEntity]:
         pass
 
+    @abstractmethod
+    def iter_channels(
+        self, channel_type: ChannelType, batch_size: int = 1000
+    ) -> Iterator[List[ChannelEntity]]:
+        """Every stored channel of a type, in batches of at most batch_size."""
+        pass
+
     @abstractmethod
     def search_by_name_and_type(
         self, name: str, channel_type: ChannelType
     ) -> List[ChannelEntity]:
         pass
+
+    @abstractmethod
+    def search(
+        self,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[ChannelEntity]:
+        """Channels of any of the given types, ranked together by relevance."""
+        pass
+
+    @abstractmethod
+    def count(self, name: str, channel_types: Iterable[ChannelType]) -> int:
+        """Number of channels search would return, without materializing them."""
+        pass
+
+    @abstractmethod
+    def search_fuzzy(
+        self,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+    ) -> List[ChannelEntity]:
+        """Channels whose names are close to name, tolerating typos.
+
+        Candidates sharing enough of the query's trigrams are read from the
+        index, at most FUZZY_CANDIDATE_LIMIT of them, and ranked by
+        similarity; see pyiptv.dao.channel_storage.fuzzy.
+        """
+        pass
+
+    @contextlib.contextmanager
+    def cancellable(self, is_cancelled: Callable[[], bool]) -> Iterator[None]:
+        """Let queries in this block stop early once is_cancelled() is true.
+
+        Storages that cannot abort a running query simply ignore it.
+        """
+        yield
+
+    @contextlib.contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Group a large load of writes so indexing can be done once, at the end.
+
+        Searches may not see rows written in this block until it exits.
+        Storages without deferred indexing simply ignore it.
+        """
+        yield
+
+    @contextlib.contextmanager
+    def sync_lock(self) -> Iterator[bool]:
+        """Claim the right to sync the catalog, yielding whether it was granted.
+
+        Never waits: False means another process is syncing the same catalog
+        and this one should keep using what is stored. Storages that are not
+        shared between processes always grant it.
+        """
+        yield True
+
+    @abstractmethod
+    def begin_sync(self, channel_type: ChannelType) -> None:
+        """Start tracking which channels of a type are still in the catalog."""
+        pass
+
+    @abstractmethod
+    def sync_channel_bulk(self, channels: List[ChannelEntity]) -> int:
+        """Write only new or changed channels, returning how many were written."""
+        pass
+
+    @abstractmethod
+    def finish_sync(self, channel_type: ChannelType) -> int:
+        """Drop channels not seen since begin_sync, returning how many were dropped."""
+        pass
+
+    def end_sync(self) -> None:
+        """Called once a sync has finished every type it covered.
+
+        Storages that persist a snapshot write it here, once per sync.
+        """
+
+    @abstractmethod
+    def get_last_sync(self, channel_type: ChannelType) -> Optional[float]:
+        pass
+
+    @abstractmethod
+    def save_series_episodes(
+        self, series_id: str, episodes: List[ChannelEntity]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def get_series_episodes(
+        self, series_id: str, max_age: Optional[float] = None
+    ) -> Optional[List[ChannelEntity]]:
+        """Cached episodes, or None if never fetched or older than max_age."""
+        pass
+
+    @abstractmethod
+    def save_stream_health(self, results: List[StreamHealth]) -> None:
+        """Store probe results, replacing earlier ones of the same channels."""
+        pass
+
+    @abstractmethod
+    def get_stream_health(
+        self, channels: Iterable[ChannelEntity], max_age: Optional[float] = None
+    ) -> Dict[ChannelEntity, StreamHealth]:
+        """Stored probe results of the channels that have one within max_age."""
+        pass
@@ -0,0 +1,209 @@
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union, overload
+
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dao.channel_storage.ngrams import normalized_name
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+from pyiptv.enum.channel_type import ChannelType
+
+
+class SearchResultCursor(Sequence):
+    """Lazily paged, read-only view over the ranked results of one search.
+
+    Rows are fetched from storage a page at a time as positions are accessed,
+    plus ``prefetch`` rows beyond the requested one so that scrolling rarely
+    waits for a query. The total match count is only computed when ``len``
+    is called, through the storage's cheap ``count``.
+    """
+
+    def __init__(
+        self,
+        channel_storage: BaseChannelStorage,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        page_size: int = 30,
+        prefetch: int = 30,
+    ) -> None:
+        self.channel_storage: BaseChannelStorage = channel_storage
+        self.name: str = name
+        self.channel_types: List[ChannelType] = list(channel_types)
+        self.page_size: int = page_size
+        self.prefetch: int = prefetch
+        self._rows: List[ChannelEntity] = []
+        self._exhausted: bool = False
+        self._total: Optional[int] = None
+
+    def __len__(self) -> int:
+        if self._total is None:
+            if self._exhausted:
+                self._total = len(self._rows)
+            else:
+                self._total = self.channel_storage.count(self.name, self.channel_types)
+        return self._total
+
+    @overload
+    def __getitem__(self, index: int) -> ChannelEntity: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ChannelEntity]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ChannelEntity, List[ChannelEntity]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            self._load(stop)
+            return self._rows[start:stop:step]
+        if index < 0:
+            index += len(self)
+        self._load(index + 1)
+        if not 0 <= index < len(self._rows):
+            raise IndexError("search result index out of range")
+        return self._rows[index]
+
+    @property
+    def loaded(self) -> int:
+        """Number of rows fetched from storage so far."""
+        return len(self._rows)
+
+    def _load(self, stop: int) -> None:
+        if self._exhausted or stop <= len(self._rows):
+            return
+        want: int = max(self.page_size, stop - len(self._rows)) + self.prefetch
+        page: List[ChannelEntity] = self.channel_storage.search(
+            self.name, self.channel_types, limit=want, offset=len(self._rows)
+        )
+        self._rows.extend(page)
+        if len(page) < want:
+            self._exhausted = True
+
+
+class GroupedResults(Sequence):
+    """Ranked results with channels of the same name and type merged into one.
+
+    Channels whose names only differ in case, punctuation or spacing, such
+    as the same channel from several providers, form a group. The best
+    ranked one stands for the group and the others are its alternates.
+    Rows of ``results`` are read a chunk at a time as positions are
+    accessed; until all are read, the length is an upper bound, as later
+    rows may still join an earlier group.
+
+    Once stream health is known (see ``apply_health``), live channels come
+    first in their group, fastest first, and known dead ones last, or are
+    left out entirely with ``hide_dead``.
+    """
+
+    def __init__(
+        self, results: Sequence, chunk_size: int = 30, hide_dead: bool = False
+    ) -> None:
+        self.results: Sequence = results
+        self.chunk_size: int = chunk_size
+        self.hide_dead: bool = hide_dead
+        self._groups: List[List[ChannelEntity]] = []
+        self._by_key: Dict[Tuple[str, ChannelType], List[ChannelEntity]] = {}
+        self._health: Dict[ChannelEntity, StreamHealth] = {}
+        self._scanned: int = 0
+
+    def __len__(self) -> int:
+        return len(self.results) - (self._scanned - len(self._groups))
+
+    @overload
+    def __getitem__(self, index: int) -> ChannelEntity: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ChannelEntity]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ChannelEntity, List[ChannelEntity]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            self._load(stop)
+            return [group[0] for group in self._groups[start:stop:step]]
+        if index < 0:
+            self._load(len(self.results))
+            index += len(self._groups)
+        self._load(index + 1)
+        if not 0 <= index < len(self._groups):
+            raise IndexError("search result index out of range")
+        return self._groups[index][0]
+
+    def alternates(self, index: int) -> List[ChannelEntity]:
+        """The other channels of the group at index."""
+        self._load(index + 1)
+        return self._groups[index][1:]
+
+    def next_alternate(self, index: int) -> ChannelEntity:
+        """Make the group's first alternate stand for it, and return it."""
+        self._load(index + 1)
+        group: List[ChannelEntity] = self._groups[index]
+        group.append(group.pop(0))
+        return group[0]
+
+    @property
+    def loaded(self) -> List[ChannelEntity]:
+        """Every channel of the groups read so far, alternates included."""
+        return [channel for group in self._groups for channel in group]
+
+    def health(self, channel: ChannelEntity) -> Optional[StreamHealth]:
+        return self._health.get(channel)
+
+    def apply_health(self, health: Dict[ChannelEntity, StreamHealth]) -> None:
+        """Reorder the groups holding newly probed channels by their health."""
+        changed: Set[ChannelEntity] = {
+            channel
+            for channel, result in health.items()
+            if self._health.get(channel) != result
+        }
+        if not changed:
+            return
+        self._health.update(health)
+        for group in self._groups:
+            if not changed.isdisjoint(group):
+                self._order(group)
+        if self.hide_dead:
+            # Channels found later under the name of an emptied group start anew.
+            self._groups = [group for group in self._groups if group]
+            self._by_key = {key: group for key, group in self._by_key.items() if group}
+
+    def _order(self, group: List[ChannelEntity]) -> None:
+        if self.hide_dead:
+            group[:] = [ch for ch in group if not self._is_dead(ch)]
+        group.sort(key=self._health_rank)
+
+    def _is_dead(self, channel: ChannelEntity) -> bool:
+        result: Optional[StreamHealth] = self._health.get(channel)
+        return result is not None and not result.alive
+
+    def _health_rank(self, channel: ChannelEntity) -> Tuple[int, float]:
+        result: Optional[StreamHealth] = self._health.get(channel)
+        if result is None:
+            return 1, 0.0
+        if not result.alive:
+            return 2, 0.0
+        return 0, result.latency_ms or 0.0
+
+    def _load(self, stop: int) -> None:
+        total: int = len(self.results)
+        while len(self._groups) < stop and self._scanned < total:
+            chunk: List[ChannelEntity] = self.results[
+                self._scanned : self._scanned + self.chunk_size
+            ]
+            if not chunk:
+                break
+            self._scanned += len(chunk)
+            for channel in chunk:
+                if self.hide_dead and self._is_dead(channel):
+                    continue
+                key: Tuple[str, ChannelType] = (
+                    normalized_name(channel.name),
+                    channel.type,
+                )
+                group: Optional[List[ChannelEntity]] = self._by_key.get(key)
+                if group is None:
+                    group = self._by_key[key] = []
+                    self._groups.append(group)
+                group.append(channel)
+                if self._health and len(group) > 1:
+                    self._order(group)
@@ -0,0 +1,153 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pyiptv.dao.channel_storage.ngrams import name_words
+from pyiptv.dto.channel import ChannelEntity
+
+# Most candidates a fuzzy search reads from the index before ranking them.
+FUZZY_CANDIDATE_LIMIT = 100
+# Share of the query's trigrams a candidate name must contain.
+MIN_TRIGRAM_OVERLAP = 0.3
+# Queries with fewer trigrams also look up those of their transpositions.
+TRANSPOSED_BELOW_TRIGRAMS = 8
+# Lowest similarity, averaged over query tokens, of a returned channel.
+MIN_SIMILARITY = 0.6
+
+
+def trigrams(word: str) -> Set[str]:
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+def transpositions(token: str) -> Set[str]:
+    """token with each pair of adjacent (different) characters swapped."""
+    return {
+        token[:i] + token[i + 1] + token[i] + token[i + 2 :]
+        for i in range(len(token) - 1)
+        if token[i] != token[i + 1]
+    }
+
+
+def query_trigrams(tokens: List[str]) -> Set[str]:
+    """Trigrams to gather fuzzy candidates with; shorter tokens have none.
+
+    Swapped letters are the commonest typo and the one trigrams cope with
+    worst: "spotrs" shares just one of its four trigrams with "sports". So
+    a query with few trigrams also uses those of its tokens' transpositions,
+    which puts "sports" (one of them) on par with "spotrs" itself. Longer
+    queries keep enough intact trigrams for candidates to stand out anyway.
+    """
+    own: Set[str] = {gram for tok in tokens for gram in trigrams(tok)}
+    if len(own) >= TRANSPOSED_BELOW_TRIGRAMS:
+        return own
+    return own | {
+        gram
+        for tok in tokens
+        for variant in transpositions(tok)
+        for gram in trigrams(variant)
+    }
+
+
+def min_overlap(tokens: List[str]) -> int:
+    """Query trigrams a candidate must share: a share of the tokens' own."""
+    own: int = len({gram for tok in tokens for gram in trigrams(tok)})
+    return max(1, int(own * MIN_TRIGRAM_OVERLAP))
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """Levenshtein distance counting an adjacent transposition as one edit.
+
+    Gives up once the distance must exceed bound, returning bound + 1.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    before: List[int] = []
+    previous: List[int] = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        row: List[int] = [i]
+        lowest: int = i
+        for j, char_b in enumerate(b, 1):
+            cost: int = previous[j - 1] + (char_a != char_b)
+            if row[j - 1] + 1 < cost:
+                cost = row[j - 1] + 1
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if (
+                i > 1
+                and j > 1
+                and char_a == b[j - 2]
+                and a[i - 2] == char_b
+                and before[j - 2] + 1 < cost
+            ):
+                cost = before[j - 2] + 1
+            row.append(cost)
+            if cost < lowest:
+                lowest = cost
+        if lowest > bound:
+            return bound + 1
+        before, previous = previous, row
+    return min(previous[-1], bound + 1)
+
+
+def token_similarity(
+    token: str, word: str, token_grams: Optional[Set[str]] = None
+) -> float:
+    """1 for equal strings, down to 0, by edit distance or shared trigrams."""
+    if token == word:
+        return 1.0
+    longest: int = max(len(token), len(word))
+    bound: int = int(longest * (1 - MIN_SIMILARITY))
+    edits: float = 0.0
+    # Each edit adds at most one character to either side of the symmetric
+    # difference of the two character sets, which rules out most words
+    # without running the quadratic distance computation.
+    if (
+        abs(len(token) - len(word)) <= bound
+        and len(set(token).symmetric_difference(word)) <= 2 * bound
+    ):
+        edits = 1 - edit_distance(token, word, bound) / longest
+    if token_grams is None:
+        token_grams = trigrams(token)
+    shared: int = sum(gram in word for gram in token_grams)
+    if not shared:
+        return edits
+    jaccard: float = shared / len(token_grams | trigrams(word))
+    return max(edits, jaccard)
+
+
+def rank_fuzzy(
+    tokens: List[str],
+    candidates: Iterable[ChannelEntity],
+    limit: Optional[int] = None,
+) -> List[ChannelEntity]:
+    """Candidates close enough to tokens, most similar (then shortest) first.
+
+    A channel's similarity is the mean over tokens of their similarity to
+    its closest word; channels sharing fewer than min_overlap of the query's
+    trigrams are dropped first.
+    """
+    token_grams: Dict[str, Set[str]] = {tok: trigrams(tok) for tok in tokens}
+    query_grams: Set[str] = query_trigrams(tokens)
+    needed: int = min_overlap(tokens)
+    # Catalog names repeat words a lot ("HD", "Sports", ...).
+    closest: Dict[Tuple[str, str], float] = {}
+    scored: List[Tuple[float, int, ChannelEntity]] = []
+    for channel in candidates:
+        words: List[str] = name_words(channel.name)
+        # Trigrams never span words, so they can be looked up in the joined name.
+        joined: str = " ".join(words)
+        if sum(gram in joined for gram in query_grams) < needed:
+            continue
+        total: float = 0.0
+        for tok in tokens:
+            best: float = 0.0
+            for word in words:
+                score: Optional[float] = closest.get((tok, word))
+                if score is None:
+                    score = closest[tok, word] = token_similarity(
+                        tok, word, token_grams[tok]
+                    )
+                best = max(best, score)
+            total += best
+        if total / len(tokens) >= MIN_SIMILARITY:
+            scored.append((-total / len(tokens), len(channel.name), channel))
+    scored.sort(key=lambda entry: entry[:2])
+    return [channel for _, _, channel in scored[:limit]]
@@ -0,0 +1,598 @@
+import array
+import bisect
+import contextlib
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dao.channel_storage.fuzzy import (
+    FUZZY_CANDIDATE_LIMIT,
+    min_overlap,
+    query_trigrams,
+    rank_fuzzy,
+)
+from pyiptv.dao.channel_storage.ngrams import name_words, ngram_set, query_tokens
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_TYPES: List[ChannelType] = list(ChannelType)
+TYPE_CODES: Dict[ChannelType, int] = {t: code for code, t in enumerate(CHANNEL_TYPES)}
+
+# Grams up to this length are index keys. Longer query tokens are narrowed
+# down through their trigrams and then matched against the name.
+MAX_KEY_LENGTH = 3
+
+SNAPSHOT_MAGIC = b"PYIPTVM1"
+SNAPSHOT_VERSION = 3
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def _pack_strings(values: List[str]) -> Tuple[bytes, bytes]:
+    """UTF-8 blob of the joined values and the character offset of each end."""
+    ends = array.array("I")
+    position = 0
+    for value in values:
+        position += len(value)
+        ends.append(position)
+    return "".join(values).encode("utf-8"), ends.tobytes()
+
+
+def _unpack_strings(blob: memoryview, ends: array.array) -> List[str]:
+    text = str(blob, "utf-8")
+    values: List[str] = []
+    start = 0
+    for end in ends:
+        values.append(text[start:end])
+        start = end
+    return values
+
+
+class ChannelStorageMemory(BaseChannelStorage):
+    """Channel storage held entirely in memory, with an inverted n-gram index.
+
+    Channels are stored column-wise, one list or array per field indexed by
+    document number, instead of as entity objects. Every gram of up to
+    three characters (from the same normalization as generate_ngrams) maps
+    to the documents containing it, so a query token matches exactly the
+    names it would match in the SQLite n-gram engine, minus Porter
+    stemming. Every token is required and grams occur once per name, which
+    makes BM25 order results by name length alone; ranking here uses that
+    same gram count directly.
+
+    Replaced or dropped documents are only flagged dead until the index is
+    compacted, which happens when a snapshot is written. With
+    ``snapshot_path`` the index is loaded from that file when it exists and
+    written back after every finished sync, so cold starts skip the rebuild.
+    """
+
+    engine: str = "memory"
+
+    def __init__(self, snapshot_path: Optional[str] = None) -> None:
+        self.snapshot_path: Optional[str] = snapshot_path
+        self._lock: threading.RLock = threading.RLock()
+        self._clear()
+        if snapshot_path and os.path.exists(snapshot_path):
+            try:
+                self._load_snapshot(snapshot_path)
+            except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+                logger.warning(f"Ignoring unreadable snapshot {snapshot_path}: {e}")
+                self._clear()
+
+    def _clear(self) -> None:
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        # URLs as an index into the distinct prefixes plus the rest.
+        self._prefixes: List[str] = []
+        self._prefix_ids: Dict[str, int] = {}
+        self._url_prefixes: array.array = array.array("I")
+        self._url_suffixes: List[str] = []
+        self._epg_ids: List[str] = []
+        self._types: bytearray = bytearray()
+        self._alive: bytearray = bytearray()
+        self._lengths: array.array = array.array("H")
+        self._postings: Dict[str, array.array] = {}
+        self._by_id: List[Dict[str, int]] = [{} for _ in CHANNEL_TYPES]
+        self._sync_state: Dict[ChannelType, float] = {}
+        self._seen: Dict[ChannelType, Set[str]] = {}
+        self._episodes: Dict[str, Tuple[float, List[ChannelEntity]]] = {}
+        self._health: Dict[Tuple[ChannelType, str], StreamHealth] = {}
+        # Whether a sync changed the catalog since the snapshot was written.
+        self._unsaved: bool = False
+
+    def _put(self, channel: ChannelEntity) -> None:
+        by_id: Dict[str, int] = self._by_id[TYPE_CODES[channel.type]]
+        old: Optional[int] = by_id.get(channel.id)
+        if old is not None:
+            self._alive[old] = 0
+        doc: int = len(self._ids)
+        grams: Set[str] = ngram_set(channel.name)
+        self._ids.append(channel.id)
+        self._names.append(channel.name)
+        self._url_prefixes.append(self._prefix_id(channel.url_prefix))
+        self._url_suffixes.append(channel.url_suffix)
+        self._epg_ids.append(channel.epg_id)
+        self._types.append(TYPE_CODES[channel.type])
+        self._alive.append(1)
+        self._lengths.append(min(len(grams), 0xFFFF))
+        for gram in grams:
+            if len(gram) <= MAX_KEY_LENGTH:
+                posting: Optional[array.array] = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array.array("I")
+                posting.append(doc)
+        by_id[channel.id] = doc
+
+    def _prefix_id(self, prefix: str) -> int:
+        prefix_id: Optional[int] = self._prefix_ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = self._prefix_ids[prefix] = len(self._prefixes)
+            self._prefixes.append(prefix)
+        return prefix_id
+
+    def _entity(self, doc: int) -> ChannelEntity:
+        return ChannelEntity.from_parts(
+            self._ids[doc],
+            self._names[doc],
+            self._prefixes[self._url_prefixes[doc]],
+            self._url_suffixes[doc],
+            CHANNEL_TYPES[self._types[doc]],
+            self._epg_ids[doc],
+        )
+
+    def save_channel(self, channel: ChannelEntity) -> None:
+        with self._lock:
+            self._put(channel)
+
+    def save_channel_bulk(self, channels: List[ChannelEntity]) -> None:
+        with metrics.timer("ingest_seconds", engine=self.engine):
+            with self._lock:
+                for channel in channels:
+                    self._put(channel)
+            metrics.increment("ingest_rows_total", len(channels), engine=self.engine)
+
+    def get_channel(self, channel_id: str) -> Optional[ChannelEntity]:
+        with self._lock:
+            for by_id in self._by_id:
+                doc: Optional[int] = by_id.get(channel_id)
+                if doc is not None:
+                    return self._entity(doc)
+        return None
+
+    def iter_channels(
+        self, channel_type: ChannelType, batch_size: int = 1000
+    ) -> Iterator[List[ChannelEntity]]:
+        # By id, as compaction renumbers documents between batches.
+        with self._lock:
+            by_id: Dict[str, int] = self._by_id[TYPE_CODES[channel_type]]
+            ids: List[str] = sorted(by_id, key=by_id.__getitem__)
+        for start in range(0, len(ids), batch_size):
+            # Yielded outside the lock, which a slow consumer would hold.
+            with self._lock:
+                by_id = self._by_id[TYPE_CODES[channel_type]]
+                docs: List[Optional[int]] = [
+                    by_id.get(id_) for id_ in ids[start : start + batch_size]
+                ]
+                batch: List[ChannelEntity] = [
+                    self._entity(doc) for doc in docs if doc is not None
+                ]
+            yield batch
+
+    def search_by_name_and_type(
+        self, name: str, channel_type: ChannelType
+    ) -> List[ChannelEntity]:
+        return self.search(name, [channel_type])
+
+    def search(
+        self,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[ChannelEntity]:
+        with metrics.timer("search_seconds", engine=self.engine, kind="search"):
+            with self._lock:
+                matches: List[int] = self._matches(name, channel_types)
+                if limit is None:
+                    ranked: List[int] = sorted(matches, key=self._rank)[offset:]
+                else:
+                    ranked = heapq.nsmallest(offset + limit, matches, key=self._rank)
+                    ranked = ranked[offset:]
+                metrics.increment("search_rows_total", len(ranked), engine=self.engine)
+                return [self._entity(doc) for doc in ranked]
+
+    def _rank(self, doc: int) -> Tuple[int, int]:
+        """Fewer grams (a shorter name) first, then insertion order."""
+        return self._lengths[doc], doc
+
+    def search_fuzzy(
+        self,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+    ) -> List[ChannelEntity]:
+        with metrics.timer("search_seconds", engine=self.engine, kind="fuzzy"):
+            tokens: List[str] = query_tokens(name)
+            codes: Set[int] = {TYPE_CODES[t] for t in channel_types}
+            grams: Set[str] = query_trigrams(tokens)
+            if not grams or not codes:
+                return []
+            with self._lock:
+                candidates: List[ChannelEntity] = [
+                    self._entity(doc)
+                    for doc in self._fuzzy_candidates(grams, min_overlap(tokens), codes)
+                ]
+            results: List[ChannelEntity] = rank_fuzzy(tokens, candidates, limit)
+            logger.debug(
+                f"Found {len(results)} channels close to '{name}' "
+                f"among {len(candidates)} candidates"
+            )
+            return results
+
+    def _fuzzy_candidates(
+        self, grams: Set[str], needed: int, codes: Set[int]
+    ) -> List[int]:
+        """Documents sharing the most of grams (at least needed of them), at
+        most FUZZY_CANDIDATE_LIMIT."""
+        postings: List[array.array] = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings),
+            key=len,
+        )
+        if len(postings) < needed:
+            return []
+        # A document sharing `needed` grams is in at least one of the
+        # shortest len(postings) - needed + 1 postings; the longer ones are
+        # only probed (they are sorted) for documents found there.
+        scanned: int = len(postings) - needed + 1
+        shared: Dict[int, int] = {}
+        for posting in postings[:scanned]:
+            for doc in posting:
+                shared[doc] = shared.get(doc, 0) + 1
+        for posting in postings[scanned:]:
+            for doc in shared:
+                at: int = bisect.bisect_left(posting, doc)
+                if at < len(posting) and posting[at] == doc:
+                    shared[doc] += 1
+        alive, types = self._alive, self._types
+        return heapq.nsmallest(
+            FUZZY_CANDIDATE_LIMIT,
+            (
+                doc
+                for doc, count in shared.items()
+                if count >= needed and alive[doc] and types[doc] in codes
+            ),
+            key=lambda doc: (-shared[doc], self._lengths[doc], doc),
+        )
+
+    def count(self, name: str, channel_types: Iterable[ChannelType]) -> int:
+        with metrics.timer("search_seconds", engine=self.engine, kind="count"):
+            with self._lock:
+                return len(self._matches(name, channel_types))
+
+    def _matches(self, name: str, channel_types: Iterable[ChannelType]) -> List[int]:
+        tokens: List[str] = query_tokens(name)
+        codes: Set[int] = {TYPE_CODES[t] for t in channel_types}
+        if not tokens or not codes:
+            return []
+        long_tokens: List[str] = [tok for tok in tokens if len(tok) > MAX_KEY_LENGTH]
+        keys: Set[str] = {tok for tok in tokens if len(tok) <= MAX_KEY_LENGTH}
+        for tok in long_tokens:
+            keys.update(tok[i : i + MAX_KEY_LENGTH] for i in range(len(tok) - 2))
+        postings: List[array.array] = []
+        for key in keys:
+            posting: Optional[array.array] = self._postings.get(key)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates: Set[int] = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                return []
+            candidates.intersection_update(posting)
+        alive, types = self._alive, self._types
+        matches: List[int] = [
+            doc for doc in candidates if alive[doc] and types[doc] in codes
+        ]
+        if long_tokens:
+            # Sharing trigrams is necessary but not sufficient: a longer
+            # token must be one of the name's words.
+            matches = [
+                doc for doc in matches if self._has_words(self._names[doc], long_tokens)
+            ]
+        return matches
+
+    def _has_words(self, name: str, tokens: List[str]) -> bool:
+        words: List[str] = name_words(name)
+        return all(tok in words for tok in tokens)
+
+    def begin_sync(self, channel_type: ChannelType) -> None:
+        with self._lock:
+            self._seen[channel_type] = set()
+
+    def sync_channel_bulk(self, channels: List[ChannelEntity]) -> int:
+        with metrics.timer("ingest_seconds", engine=self.engine):
+            written: int = 0
+            with self._lock:
+                for channel in channels:
+                    self._seen.setdefault(channel.type, set()).add(channel.id)
+                    doc: Optional[int] = self._by_id[TYPE_CODES[channel.type]].get(
+                        channel.id
+                    )
+                    if (
+                        doc is None
+                        or self._names[doc] != channel.name
+                        or self._url_suffixes[doc] != channel.url_suffix
+                        or self._epg_ids[doc] != channel.epg_id
+                        or self._prefixes[self._url_prefixes[doc]] != channel.url_prefix
+                    ):
+                        self._put(channel)
+                        written += 1
+            metrics.increment("ingest_rows_total", len(channels), engine=self.engine)
+            metrics.increment("ingest_written_rows_total", written, engine=self.engine)
+            return written
+
+    def finish_sync(self, channel_type: ChannelType) -> int:
+        with self._lock:
+            seen: Set[str] = self._seen.pop(channel_type, set())
+            by_id: Dict[str, int] = self._by_id[TYPE_CODES[channel_type]]
+            missing: List[str] = [id_ for id_ in by_id if id_ not in seen]
+            for id_ in missing:
+                self._alive[by_id.pop(id_)] = 0
+                self._health.pop((channel_type, id_), None)
+            if channel_type == ChannelType.SERIES:
+                for series_id in list(self._episodes):
+                    if series_id not in by_id:
+                        del self._episodes[series_id]
+            self._sync_state[channel_type] = time.time()
+            self._unsaved = True
+        return len(missing)
+
+    def end_sync(self) -> None:
+        with self._lock:
+            if self.snapshot_path and self._unsaved:
+                self.save_snapshot()
+
+    def get_last_sync(self, channel_type: ChannelType) -> Optional[float]:
+        return self._sync_state.get(channel_type)
+
+    def save_series_episodes(
+        self, series_id: str, episodes: List[ChannelEntity]
+    ) -> None:
+        with self._lock:
+            self._episodes[series_id] = (time.time(), list(episodes))
+
+    def get_series_episodes(
+        self, series_id: str, max_age: Optional[float] = None
+    ) -> Optional[List[ChannelEntity]]:
+        with self._lock:
+            cached = self._episodes.get(series_id)
+        if cached is None:
+            return None
+        fetched_at, episodes = cached
+        if max_age is not None and time.time() - fetched_at >= max_age:
+            return None
+        return list(episodes)
+
+    def save_stream_health(self, results: List[StreamHealth]) -> None:
+        with self._lock:
+            for result in results:
+                self._health[result.channel_type, result.channel_id] = result
+
+    def get_stream_health(
+        self, channels: Iterable[ChannelEntity], max_age: Optional[float] = None
+    ) -> Dict[ChannelEntity, StreamHealth]:
+        oldest: float = -1.0 if max_age is None else time.time() - max_age
+        found: Dict[ChannelEntity, StreamHealth] = {}
+        with self._lock:
+            for channel in channels:
+                health: Optional[StreamHealth] = self._health.get(
+                    (channel.type, channel.id)
+                )
+                if health is not None and health.checked_at >= oldest:
+                    found[channel] = health
+        return found
+
+    def _compact(self) -> None:
+        """Drop dead documents, renumbering the survivors in order."""
+        if all(self._alive):
+            return
+        remap = array.array("i", [-1]) * len(self._ids)
+        survivors: List[int] = [doc for doc, alive in enumerate(self._alive) if alive]
+        for new, old in enumerate(survivors):
+            remap[old] = new
+        self._ids = [self._ids[doc] for doc in survivors]
+        self._names = [self._names[doc] for doc in survivors]
+        self._url_prefixes = array.array(
+            "I", (self._url_prefixes[doc] for doc in survivors)
+        )
+        self._url_suffixes = [self._url_suffixes[doc] for doc in survivors]
+        self._epg_ids = [self._epg_ids[doc] for doc in survivors]
+        self._types = bytearray(self._types[doc] for doc in survivors)
+        self._lengths = array.array("H", (self._lengths[doc] for doc in survivors))
+        self._alive = bytearray(b"\x01") * len(survivors)
+        postings: Dict[str, array.array] = {}
+        for key, posting in self._postings.items():
+            kept = array.array("I", (remap[doc] for doc in posting if remap[doc] >= 0))
+            if kept:
+                postings[key] = kept
+        self._postings = postings
+        self._by_id = [{} for _ in CHANNEL_TYPES]
+        for doc, (id_, code) in enumerate(zip(self._ids, self._types)):
+            self._by_id[code][id_] = doc
+
+    def save_snapshot(self, path: Optional[str] = None) -> None:
+        """Write the compacted index to path (default ``snapshot_path``)."""
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path configured")
+        start: float = time.perf_counter()
+        with self._lock:
+            self._compact()
+            keys: List[str] = list(self._postings)
+            counts = array.array("I", (len(self._postings[k]) for k in keys))
+            data = array.array("I")
+            for key in keys:
+                data.extend(self._postings[key])
+            sections: List[bytes] = [
+                *_pack_strings(self._ids),
+                *_pack_strings(self._names),
+                *_pack_strings(self._url_suffixes),
+                self._url_prefixes.tobytes(),
+                bytes(self._types),
+                self._lengths.tobytes(),
+                *_pack_strings(keys),
+                counts.tobytes(),
+                data.tobytes(),
+                *_pack_strings(self._epg_ids),
+            ]
+            header: Dict = {
+                "version": SNAPSHOT_VERSION,
+                "byteorder": sys.byteorder,
+                "sections": [len(section) for section in sections],
+                "url_prefixes": self._prefixes,
+                "sync_state": {t.value: ts for t, ts in self._sync_state.items()},
+                "stream_health": [
+                    [
+                        h.channel_type.value,
+                        h.channel_id,
+                        h.alive,
+                        h.latency_ms,
+                        h.checked_at,
+                        h.detail,
+                    ]
+                    for h in self._health.values()
+                ],
+                "episodes": {
+                    series_id: [
+                        fetched_at,
+                        [[ep.id, ep.name, ep.playable_url] for ep in episodes],
+                    ]
+                    for series_id, (fetched_at, episodes) in self._episodes.items()
+                },
+            }
+        encoded: bytes = json.dumps(header).encode("utf-8")
+        tmp_path: str = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(SNAPSHOT_MAGIC)
+                f.write(_HEADER_LENGTH.pack(len(encoded)))
+                f.write(encoded)
+                for section in sections:
+                    f.write(section)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        # Only now: after a failed write the next sync tries again.
+        with self._lock:
+            self._unsaved = False
+        logger.debug(
+            f"Wrote snapshot of {len(self._ids)} channels to {path} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    def _load_snapshot(self, path: str) -> None:
+        start: float = time.perf_counter()
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped, memoryview(mapped) as view:
+            if view[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError("not a channel index snapshot")
+            position: int = len(SNAPSHOT_MAGIC)
+            (header_length,) = _HEADER_LENGTH.unpack_from(view, position)
+            position += _HEADER_LENGTH.size
+            header: Dict = json.loads(
+                str(view[position : position + header_length], "utf-8")
+            )
+            position += header_length
+            if (
+                header["version"] != SNAPSHOT_VERSION
+                or header["byteorder"] != sys.byteorder
+            ):
+                raise ValueError("snapshot was written by an incompatible version")
+            sections: List[memoryview] = []
+            for length in header["sections"]:
+                sections.append(view[position : position + length])
+                position += length
+
+            def ends(section: memoryview) -> array.array:
+                values = array.array("I")
+                values.frombytes(section)
+                return values
+
+            self._ids = _unpack_strings(sections[0], ends(sections[1]))
+            self._names = _unpack_strings(sections[2], ends(sections[3]))
+            self._url_suffixes = _unpack_strings(sections[4], ends(sections[5]))
+            self._url_prefixes = ends(sections[6])
+            self._types = bytearray(sections[7])
+            self._lengths = array.array("H")
+            self._lengths.frombytes(sections[8])
+            keys: List[str] = _unpack_strings(sections[9], ends(sections[10]))
+            counts: array.array = ends(sections[11])
+            data: memoryview = sections[12]
+            self._epg_ids = _unpack_strings(sections[13], ends(sections[14]))
+            self._postings = {}
+            offset: int = 0
+            for key, count in zip(keys, counts):
+                posting = array.array("I")
+                posting.frombytes(data[offset : offset + count * posting.itemsize])
+                self._postings[key] = posting
+                offset += count * posting.itemsize
+            for section in sections:
+                section.release()
+        self._alive = bytearray(b"\x01") * len(self._ids)
+        self._prefixes = [sys.intern(prefix) for prefix in header["url_prefixes"]]
+        self._prefix_ids = {prefix: i for i, prefix in enumerate(self._prefixes)}
+        self._by_id = [{} for _ in CHANNEL_TYPES]
+        for doc, (id_, code) in enumerate(zip(self._ids, self._types)):
+            self._by_id[code][id_] = doc
+        health: Dict[Tuple[ChannelType, str], StreamHealth] = {}
+        for type_value, id_, alive, latency_ms, checked_at, detail in header.get(
+            "stream_health", []
+        ):
+            health[ChannelType(type_value), id_] = StreamHealth(
+                channel_id=id_,
+                channel_type=ChannelType(type_value),
+                alive=alive,
+                latency_ms=latency_ms,
+                checked_at=checked_at,
+                detail=detail,
+            )
+        episodes: Dict[str, Tuple[float, List[ChannelEntity]]] = {
+            series_id: (
+                fetched_at,
+                [
+                    ChannelEntity(
+                        id=id_, name=name, playable_url=url, type=ChannelType.SERIES
+                    )
+                    for id_, name, url in series_episodes
+                ],
+            )
+            for series_id, (fetched_at, series_episodes) in header.get(
+                "episodes", {}
+            ).items()
+        }
+        sync_state: Dict[ChannelType, float] = {
+            ChannelType(value): ts for value, ts in header["sync_state"].items()
+        }
+        self._health = health
+        self._episodes = episodes
+        # Last: a snapshot that fails to load must not leave types marked fresh.
+        self._sync_state = sync_state
+        logger.debug(
+            f"Loaded snapshot of {len(self._ids)} channels from {path} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
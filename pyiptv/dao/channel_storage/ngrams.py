@@ -0,0 +1,61 @@
+import re
+from typing import Dict, List, Optional, Set
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def clean_token(token: str) -> str:
+    """Lowercase, strip, and remove punctuation from a token."""
+    return _PUNCTUATION.sub("", token.lower()).strip()
+
+
+def query_tokens(query: str) -> List[str]:
+    """Search tokens of a query; every one of them has to match."""
+    tokens: List[str] = [clean_token(tok) for tok in query.lower().split()]
+    return [tok for tok in tokens if tok]
+
+
+def name_words(text: str) -> List[str]:
+    """The words of text as they are indexed: lowercased, without punctuation."""
+    return _PUNCTUATION.sub("", text.lower()).split()
+
+
+def normalized_name(text: str) -> str:
+    """text without case, punctuation or spacing differences."""
+    return " ".join(name_words(text))
+
+
+def ngram_set(text: str, n: int = 3) -> Set[str]:
+    """The n-grams of text: the whole text, its words, and their 2..n-grams."""
+    cleaned: str = _PUNCTUATION.sub("", text.lower())
+    words: List[str] = cleaned.split()
+    grams: Set[str] = {
+        word[i : i + size]
+        for word in words
+        for size in range(2, n + 1)
+        for i in range(len(word) - size + 1)
+    }
+    if words:
+        grams.add(cleaned)
+        grams.update(words)
+    return grams
+
+
+def generate_ngrams(text: str, n: int = 3) -> str:
+    """Generate space-separated n-grams from text for full-text search."""
+    return generate_ngrams_batch([text], n)[0]
+
+
+def generate_ngrams_batch(texts: List[str], n: int = 3) -> List[str]:
+    """Generate n-grams (as generate_ngrams does) for every text in a batch.
+
+    Repeated names, common in provider catalogs, are only expanded once.
+    """
+    by_text: Dict[str, str] = {}
+    out: List[str] = []
+    for text in texts:
+        grams_text: Optional[str] = by_text.get(text)
+        if grams_text is None:
+            grams_text = by_text[text] = " ".join(ngram_set(text, n))
+        out.append(grams_text)
+    return out
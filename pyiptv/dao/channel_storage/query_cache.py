@@ -0,0 +1,150 @@
+import dataclasses
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional, Tuple
+
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+# Normalized search tokens (sorted, since they are ANDed) and the searched types.
+QueryKey = Tuple[Tuple[str, ...], FrozenSet[ChannelType]]
+
+
+@dataclasses.dataclass
+class CachedQuery:
+    rows: List[ChannelEntity]
+    complete: bool
+    total: Optional[int] = None
+
+
+class QueryResultCache:
+    """Bounded LRU cache of ranked search results, keyed by normalized query.
+
+    Entries hold the leading rows of a result in rank order, so any page
+    inside them is served without touching the database, and ``complete``
+    entries answer every page and the count. Memory is bounded by the total
+    number of cached rows across entries.
+
+    Results computed before a write must not be cached after it: callers
+    read ``generation`` before querying and pass it back to ``store``,
+    which drops the result if ``invalidate`` ran in between.
+    """
+
+    def __init__(self, max_rows: int = 20000, max_entries: int = 256) -> None:
+        self.max_rows: int = max_rows
+        self.max_entries: int = max_entries
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[QueryKey, CachedQuery]" = OrderedDict()
+        self._rows: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def key(tokens: List[str], channel_types: List[ChannelType]) -> QueryKey:
+        return tuple(sorted(tokens)), frozenset(channel_types)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._rows = 0
+
+    def page(
+        self, key: QueryKey, limit: Optional[int], offset: int
+    ) -> Optional[List[ChannelEntity]]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                end = None if limit is None else offset + limit
+                if entry.complete or (end is not None and end <= len(entry.rows)):
+                    self.hits += 1
+                    return entry.rows[offset:end]
+            self.misses += 1
+            return None
+
+    def count(self, key: QueryKey) -> Optional[int]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return None
+            if entry.complete:
+                return len(entry.rows)
+            return entry.total
+
+    def store_page(
+        self,
+        key: QueryKey,
+        rows: List[ChannelEntity],
+        limit: Optional[int],
+        offset: int,
+        generation: int,
+    ) -> None:
+        """Record a page fetched from storage, extending the entry if contiguous."""
+        complete = limit is None or len(rows) < limit
+        with self._lock:
+            if generation != self.generation:
+                return
+            entry = self._entries.get(key)
+            if entry is None:
+                if offset != 0:
+                    return
+                entry = CachedQuery(rows=[], complete=False)
+                self._entries[key] = entry
+            elif offset != len(entry.rows) or entry.complete:
+                return
+            entry.rows.extend(rows)
+            entry.complete = complete
+            self._rows += len(rows)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def store_count(self, key: QueryKey, total: int, generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = CachedQuery(rows=[], complete=total == 0, total=total)
+                self._entries[key] = entry
+            entry.total = total
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _lookup(self, key: QueryKey) -> Optional[CachedQuery]:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._refine(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _refine(self, key: QueryKey) -> Optional[CachedQuery]:
+        """Derive an entry from a cached query that this one narrows down.
+
+        Tokens are ANDed, so adding tokens can only shrink a result. Only an
+        empty result can be narrowed without the database, though: which
+        rows an extra token keeps depends on stemming done inside FTS5, and
+        their order on BM25 statistics that are not cached here.
+        """
+        tokens, channel_types = key
+        narrows_empty_result = any(
+            entry.complete
+            and not entry.rows
+            and parent_types == channel_types
+            and set(parent_tokens) <= set(tokens)
+            for (parent_tokens, parent_types), entry in self._entries.items()
+        )
+        if not narrows_empty_result:
+            return None
+        refined = CachedQuery(rows=[], complete=True, total=0)
+        self._entries[key] = refined
+        self._evict()
+        return refined
+
+    def _evict(self) -> None:
+        while self._entries and (
+            self._rows > self.max_rows or len(self._entries) > self.max_entries
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._rows -= len(entry.rows)
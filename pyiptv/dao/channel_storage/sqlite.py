@@ -1,174 +1,1174 @@
+import contextlib
+import hashlib
 import logging
-import re
+import os
 import sqlite3
-from typing import Dict, List, Optional, Set
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dao.channel_storage.fuzzy import (
+    FUZZY_CANDIDATE_LIMIT,
+    min_overlap,
+    query_trigrams,
+    rank_fuzzy,
+)
+from pyiptv.dao.channel_storage.ngrams import generate_ngrams_batch, query_tokens
+from pyiptv.dao.channel_storage.query_cache import QueryKey, QueryResultCache
 from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
 from pyiptv.enum.channel_type import ChannelType
+from pyiptv.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: sync_lock then excludes nothing.
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# One full-text index for every channel type, so BM25 statistics (and thus
+# scores) are shared and results of different types rank against each other.
+# Its rowids match the per-type main tables, which draw them from one range.
+FTS_TABLE = "channels_fts"
+# Porter stems query tokens and indexed n-grams alike, so they still match.
+FTS_TOKENIZER = "porter"
+
+# The low bits of every rowid hold the channel type, so type filters are
+# resolved from the FTS index alone, without reading stored columns.
+TYPE_BITS = 3
+TYPE_CODES: Dict[ChannelType, int] = {t: code for code, t in enumerate(ChannelType)}
+TYPES_BY_VALUE: Dict[str, ChannelType] = {t.value: t for t in ChannelType}
+
+# Applied to every connection. WAL makes NORMAL sync safe against corruption;
+# the larger page cache and memory-mapped reads mostly help big catalogs.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# How long a write waits for another connection's (or process's) write to
+# finish. Reads never wait: WAL gives them the last committed snapshot.
+# Writes take the lock up front (BEGIN IMMEDIATE): a transaction that read
+# first fails at once, without waiting, if another connection commits before
+# its first write.
+BUSY_TIMEOUT_SECONDS = 30.0
+
+# FTS5's default; incremental merging is paused while a bulk load is indexed.
+FTS_AUTOMERGE = 4
+
+# Bump whenever the table layout changes; the database is a cache, so an
+# outdated one is dropped and rebuilt rather than migrated.
+SCHEMA_VERSION = 7
+
+
+# Index entries a fuzzy search reads per query trigram. Frequent trigrams
+# ("spo" in a catalog full of sports channels) tell names apart least, so
+# only their first matches are counted.
+FUZZY_GRAM_LIMIT = 1000
+
+# Channels looked up per query when reading stream health.
+HEALTH_LOOKUP_BATCH = 500
+
+# Names are written in batches of this size, so n-grams for the next batch
+# can be generated while the current one is being written.
+INGEST_BATCH_SIZE = 20000
+
+
+def _content_hash(channel: ChannelEntity) -> str:
+    """Fingerprint of the stored fields, used to skip unchanged rows on sync."""
+    fields = (channel.name, channel.playable_url, channel.epg_id)
+    payload = "\x1f".join(fields).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def _ngrams_timed(names: List[str]) -> Tuple[List[str], float]:
+    start: float = time.perf_counter()
+    ngrams: List[str] = generate_ngrams_batch(names)
+    return ngrams, time.perf_counter() - start
 
-def _clean_token(token: str) -> str:
-    """Lowercase, strip, and remove punctuation from a token."""
-    return re.sub(r"[^\w\s]", "", token.lower()).strip()
 
+def _share_with_group(path: str) -> None:
+    """Let the group of a file just created write it too."""
+    try:
+        mode: int = stat.S_IMODE(os.stat(path).st_mode)
+        os.chmod(path, mode | stat.S_IRGRP | stat.S_IWGRP)
+    except OSError as e:
+        logger.warning(f"Could not make {path} group-writable: {e}")
 
-def generate_ngrams(text: str, n: int = 3) -> str:
-    """Generate space-separated n-grams from text for full-text search."""
-    text = re.sub(r"[^\w\s]", "", text.lower())
-    grams: Set[str] = set()
-    words: List[str] = text.split()
-    if not words:
-        return ""
-    grams.add(text)
-    grams.update(words)
-    for size in range(2, n + 1):
-        for word in words:
-            for i in range(len(word) - size + 1):
-                grams.add(word[i : i + size])
-    return " ".join(grams)
+
+def _dedupe_by_id(channels: List[ChannelEntity]) -> List[ChannelEntity]:
+    return list({ch.id: ch for ch in channels}.values())
 
 
 class ChannelStorageSQLite(BaseChannelStorage):
+    """SQLite/FTS5 channel storage.
+
+    Every thread gets its own connection to the database file, so a
+    background sync can write while other threads keep searching. WAL
+    journaling lets those readers proceed without waiting for the writer.
+
+    Search results are cached in ``query_cache`` and dropped on every write.
+
+    Large writes are split into batches whose n-grams are generated while the
+    previous batch is written. Inside ``bulk_load`` index rows
+    are staged and the index is written and optimized once, at the end.
+
+    The database and lock files are created group-writable (SQLite gives its
+    ``-wal`` and ``-shm`` files the mode of the database), so users sharing a
+    catalog only need a cache directory owned by their common group with the
+    setgid bit set (``chmod g+ws``).
+    """
+
+    schema_version: int = SCHEMA_VERSION
+    # Names the engine in metric labels, as PYIPTV_SEARCH_ENGINE does.
+    engine: str = "ngram"
+    # Reads stored columns (id, name, url_prefix, url_suffix, type, epg_id) and
+    # score
+    # of ``hits``.
+    # CROSS JOIN keeps ``hits`` as the outer loop; given a longer hits list,
+    # the planner would otherwise scan the whole index once per hit.
+    _hit_rows: str = f"""
+        SELECT f.id, f.name, f.url_prefix, f.url_suffix, f.type, f.epg_id,
+            hits.score
+        FROM hits CROSS JOIN {FTS_TABLE} AS f ON f.rowid = hits.rowid
+    """
+
     def __init__(self, filepath: str) -> None:
-        self.conn: sqlite3.Connection = sqlite3.connect(filepath)
-        self.conn.row_factory = sqlite3.Row
+        self.filepath: str = filepath
+        self._local: threading.local = threading.local()
+        self.query_cache: QueryResultCache = QueryResultCache()
+        # URL prefixes by id; rows only reference them. Prefixes are never
+        # changed or deleted, so this only grows.
+        self._url_prefixes: Dict[int, str] = {}
+        # Query trigrams by the term the index tokenizer stores them as.
+        self._stems: Dict[str, str] = {}
+        created: bool = not os.path.exists(filepath)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if created:
+            _share_with_group(filepath)
         self._create_schema()
         logger.debug(f"Initialized SQLite channel storage at {filepath}")
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            # Rows stay plain tuples; entities are built from them directly.
+            conn = sqlite3.connect(self.filepath, timeout=BUSY_TIMEOUT_SECONDS)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def _bulk_loading(self) -> bool:
+        """Whether this thread is inside ``bulk_load``; other threads write as usual."""
+        return getattr(self._local, "bulk_loading", False)
+
+    @contextlib.contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Cursor]:
+        """A transaction holding the write lock, committed unless it raises."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn.cursor()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        with metrics.timer("commit_seconds", engine=self.engine):
+            self.conn.commit()
+
+    @contextlib.contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        if self._bulk_loading:
+            yield
+            return
+        with self._write_transaction() as cursor:
+            self._begin_bulk_load(cursor)
+        self._local.bulk_loading = True
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Runs on errors too: rows already written must become searchable.
+            self._local.bulk_loading = False
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            with self._write_transaction() as cursor:
+                self._finish_bulk_load(cursor)
+            self.query_cache.invalidate()
+            logger.debug(f"Bulk load finished in {time.perf_counter() - start:.2f}s")
+
+    def _begin_bulk_load(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS bulk_index (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT,
+                type TEXT,
+                name TEXT,
+                url_prefix INTEGER,
+                url_suffix TEXT,
+                epg_id TEXT,
+                ngrams TEXT
+            )
+            """
+        )
+        cursor.execute("DELETE FROM temp.bulk_index")
+
+    def _finish_bulk_load(self, cursor: sqlite3.Cursor) -> None:
+        # Paused and restored in one transaction, so an interrupted load
+        # cannot leave merging off.
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('automerge', 0)"
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {FTS_TABLE}
+                (rowid, id, type, name, url_prefix, url_suffix, epg_id, ngrams)
+            SELECT rowid, id, type, name, url_prefix, url_suffix, epg_id, ngrams
+            FROM temp.bulk_index ORDER BY rowid
+            """
+        )
+        cursor.execute("DELETE FROM temp.bulk_index")
+        cursor.execute(
+            f"""
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank)
+            VALUES ('automerge', {FTS_AUTOMERGE})
+            """
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+    @contextlib.contextmanager
+    def sync_lock(self) -> Iterator[bool]:
+        """An exclusive lock on ``<filepath>.lock``, shared by every process.
+
+        The operating system releases it when the holder exits, so a crashed
+        sync never leaves the catalog locked.
+        """
+        if fcntl is None:
+            logger.warning("No file locks here; another process may sync too")
+            yield True
+            return
+        lock_path: str = f"{self.filepath}.lock"
+        created: bool = not os.path.exists(lock_path)
+        try:
+            lock_file = open(lock_path, "a")
+        except OSError as e:
+            logger.warning(f"Could not open sync lock {lock_path}: {e}")
+            yield False
+            return
+        if created:
+            _share_with_group(lock_path)
+        with lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _drop_stale_results(self) -> None:
+        """Invalidate query_cache if another connection wrote since last checked.
+
+        Writes through this storage invalidate it themselves; this catches
+        those of other processes sharing the database file.
+        """
+        version: int = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if getattr(self._local, "data_version", None) != version:
+            self.query_cache.invalidate()
+            self._local.data_version = version
+
+    @contextlib.contextmanager
+    def cancellable(self, is_cancelled: Callable[[], bool]) -> Iterator[None]:
+        """Abort queries on this thread's connection once is_cancelled() is true.
+
+        An aborted query raises sqlite3.OperationalError ("interrupted").
+        """
+        self.conn.set_progress_handler(lambda: int(is_cancelled()), 1000)
+        try:
+            yield
+        finally:
+            self.conn.set_progress_handler(None, 0)
+
     def _table_for_type(self, channel_type: ChannelType) -> str:
         return f"channels_{channel_type.value}"
 
-    def _fts_table_for_type(self, channel_type: ChannelType) -> str:
-        return f"channels_{channel_type.value}_fts"
+    def _seen_table_for_type(self, channel_type: ChannelType) -> str:
+        return f"sync_seen_{channel_type.value}"
 
     def _create_schema(self) -> None:
         cursor: sqlite3.Cursor = self.conn.cursor()
+        # Opening a current database writes nothing, so processes sharing it
+        # can open it while another one syncs. Otherwise the version is read
+        # again under the write lock, in case another process built it first.
+        if cursor.execute("PRAGMA user_version").fetchone()[0] == self.schema_version:
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            version: int = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.schema_version:
+                self._drop_schema()
+                self._build_schema(cursor)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+
+    def _build_schema(self, cursor: sqlite3.Cursor) -> None:
+        # Stream URLs are stored split: the prefix shared by many streams
+        # (holding the source's credentials) once here, and per row only its
+        # id and the rest of the URL.
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS url_prefixes (
+                id INTEGER PRIMARY KEY,
+                prefix TEXT NOT NULL UNIQUE
+            )
+            """
+        )
         for t in ChannelType:
             main: str = self._table_for_type(t)
-            fts: str = self._fts_table_for_type(t)
             cursor.execute(
                 f"""
                 CREATE TABLE IF NOT EXISTS {main} (
-                    id TEXT PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
                     name TEXT NOT NULL,
-                    playable_url TEXT NOT NULL
-                ) WITHOUT ROWID
-                """
-            )
-            cursor.execute(
-                f"""
-                CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
-                USING fts5(
-                    id UNINDEXED,
-                    name,
-                    playable_url,
-                    ngrams,
-                    tokenize='porter'
+                    url_prefix INTEGER NOT NULL,
+                    url_suffix TEXT NOT NULL,
+                    epg_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL
                 )
                 """
             )
-        self.conn.commit()
+        self._create_search_index(cursor)
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stream_health (
+                channel_type TEXT NOT NULL,
+                channel_id TEXT NOT NULL,
+                alive INTEGER NOT NULL,
+                latency_ms REAL,
+                checked_at REAL NOT NULL,
+                detail TEXT NOT NULL,
+                PRIMARY KEY (channel_type, channel_id)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                channel_type TEXT PRIMARY KEY,
+                synced_at REAL NOT NULL
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS series_episodes (
+                series_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                url_prefix INTEGER NOT NULL,
+                url_suffix TEXT NOT NULL,
+                PRIMARY KEY (series_id, position)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS series_episodes_state (
+                series_id TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        cursor.execute(f"PRAGMA user_version = {self.schema_version}")
 
-    def save_channel(self, channel: ChannelEntity) -> None:
-        cursor: sqlite3.Cursor = self.conn.cursor()
-        main_table: str = self._table_for_type(channel.type)
-        fts_table: str = self._fts_table_for_type(channel.type)
-        self.conn.execute("BEGIN")
+    def _create_search_index(self, cursor: sqlite3.Cursor) -> None:
         cursor.execute(
             f"""
-            INSERT OR REPLACE INTO {main_table} (id, name, playable_url)
-            VALUES (?, ?, ?)
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+            USING fts5(
+                id UNINDEXED,
+                type UNINDEXED,
+                name,
+                url_prefix UNINDEXED,
+                url_suffix UNINDEXED,
+                epg_id UNINDEXED,
+                ngrams,
+                tokenize='{FTS_TOKENIZER}'
+            )
+            """
+        )
+
+    def _drop_schema(self) -> None:
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'view'"
+        ).fetchall():
+            cursor.execute(f"DROP VIEW IF EXISTS {row[0]}")
+        # Virtual tables first, dropping them removes their shadow tables too.
+        for virtual_only in (True, False):
+            rows = cursor.execute(
+                """
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+                """
+            ).fetchall()
+            for name, sql in rows:
+                if sql.startswith("CREATE VIRTUAL") == virtual_only:
+                    cursor.execute(f"DROP TABLE IF EXISTS {name}")
+
+    def _write_channels(
+        self,
+        cursor: sqlite3.Cursor,
+        channel_type: ChannelType,
+        channels: List[ChannelEntity],
+        ngrams: List[str],
+        lookup_existing: bool = True,
+    ) -> None:
+        """Upsert channels of one type, keeping FTS rowids in step with the main table.
+
+        Channel ids must be unique; ``ngrams[i]`` belongs to ``channels[i]``.
+        Without ``lookup_existing`` every channel is assumed to be new.
+        """
+        main_table: str = self._table_for_type(channel_type)
+        existing: Dict[str, int] = (
+            self._rowids_for(cursor, main_table, channels) if lookup_existing else {}
+        )
+        next_seq: int = self._next_sequence(cursor)
+        type_code: int = TYPE_CODES[channel_type]
+        prefix_ids: Dict[str, int] = self._url_prefix_ids(cursor, channels)
+        rowids: Dict[str, int] = {}
+        inserts: List[tuple[int, str, str, int, str, str, str]] = []
+        updates: List[tuple[str, int, str, str, str, int]] = []
+        for ch in channels:
+            content_hash: str = _content_hash(ch)
+            prefix_id: int = prefix_ids[ch.url_prefix]
+            rowid: Optional[int] = existing.get(ch.id)
+            if rowid is None:
+                rowid = next_seq << TYPE_BITS | type_code
+                next_seq += 1
+                inserts.append(
+                    (
+                        rowid,
+                        ch.id,
+                        ch.name,
+                        prefix_id,
+                        ch.url_suffix,
+                        ch.epg_id,
+                        content_hash,
+                    )
+                )
+            else:
+                updates.append(
+                    (ch.name, prefix_id, ch.url_suffix, ch.epg_id, content_hash, rowid)
+                )
+            rowids[ch.id] = rowid
+        self._unindex_rowids(cursor, list(existing.values()))
+        cursor.executemany(
+            f"""
+            INSERT INTO {main_table}
+                (rowid, id, name, url_prefix, url_suffix, epg_id, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            inserts,
+        )
+        cursor.executemany(
+            f"""
+            UPDATE {main_table}
+            SET name = ?, url_prefix = ?, url_suffix = ?, epg_id = ?,
+                content_hash = ?
+            WHERE rowid = ?
             """,
-            (channel.id, channel.name, channel.playable_url),
+            updates,
+        )
+        self._index_channels(cursor, channel_type, channels, rowids, ngrams, prefix_ids)
+
+    def _url_prefix_ids(
+        self, cursor: sqlite3.Cursor, channels: List[ChannelEntity]
+    ) -> Dict[str, int]:
+        """Ids of the URL prefixes of channels, storing any new ones."""
+        prefixes: List[str] = list({ch.url_prefix for ch in channels})
+        cursor.executemany(
+            "INSERT OR IGNORE INTO url_prefixes (prefix) VALUES (?)",
+            [(prefix,) for prefix in prefixes],
         )
-        ngrams: str = generate_ngrams(channel.name)
+        placeholders: str = ", ".join("?" for _ in prefixes)
         cursor.execute(
+            f"SELECT prefix, id FROM url_prefixes WHERE prefix IN ({placeholders})",
+            prefixes,
+        )
+        return dict(cursor.fetchall())
+
+    def _index_channels(
+        self,
+        cursor: sqlite3.Cursor,
+        channel_type: ChannelType,
+        channels: List[ChannelEntity],
+        rowids: Dict[str, int],
+        ngrams: List[str],
+        prefix_ids: Dict[str, int],
+    ) -> None:
+        target: str = (
+            "OR REPLACE INTO temp.bulk_index"
+            if self._bulk_loading
+            else f"INTO {FTS_TABLE}"
+        )
+        cursor.executemany(
             f"""
-            INSERT OR REPLACE INTO {fts_table} (id, name, playable_url, ngrams)
-            VALUES (?, ?, ?, ?)
+            INSERT {target}
+                (rowid, id, type, name, url_prefix, url_suffix, epg_id, ngrams)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (channel.id, channel.name, channel.playable_url, ngrams),
+            [
+                (
+                    rowids[ch.id],
+                    ch.id,
+                    channel_type.value,
+                    ch.name,
+                    prefix_ids[ch.url_prefix],
+                    ch.url_suffix,
+                    ch.epg_id,
+                    grams,
+                )
+                for ch, grams in zip(channels, ngrams)
+            ],
         )
-        self.conn.commit()
 
-    def save_channel_bulk(self, channels: List[ChannelEntity]) -> None:
-        cursor: sqlite3.Cursor = self.conn.cursor()
-        self.conn.execute("BEGIN")
+    def _unindex_rowids(self, cursor: sqlite3.Cursor, rowids: List[int]) -> None:
+        """Remove index entries of rows about to be updated or deleted."""
+        params: List[Tuple[int]] = [(rowid,) for rowid in rowids]
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", params)
+        if self._bulk_loading:
+            cursor.executemany("DELETE FROM temp.bulk_index WHERE rowid = ?", params)
+
+    def _write_batches(
+        self,
+        cursor: sqlite3.Cursor,
+        batches: List[Tuple[ChannelType, List[ChannelEntity]]],
+    ) -> None:
+        """Write batches, generating n-grams for upcoming ones in the background.
+
+        SQLite releases the GIL while it indexes a batch, so a worker thread
+        preparing the next batch runs alongside it.
+        """
+        if not batches:
+            return
+        names: List[List[str]] = [[ch.name for ch in batch] for _, batch in batches]
+        # Batches never share ids, so only rows stored before this write can
+        # already exist.
+        prefilled: Dict[ChannelType, bool] = {
+            t: self._has_rows(cursor, t) for t, _ in batches
+        }
+        if len(batches) == 1:
+            t, batch = batches[0]
+            self._write_channels(
+                cursor,
+                t,
+                batch,
+                self._timed_ngrams(*_ngrams_timed(names[0])),
+                prefilled[t],
+            )
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending: Future = executor.submit(_ngrams_timed, names[0])
+            for i, (t, batch) in enumerate(batches):
+                ngrams: List[str] = self._timed_ngrams(*pending.result())
+                if i + 1 < len(names):
+                    pending = executor.submit(_ngrams_timed, names[i + 1])
+                self._write_channels(cursor, t, batch, ngrams, prefilled[t])
+
+    def _timed_ngrams(self, ngrams: List[str], seconds: float) -> List[str]:
+        metrics.observe("ngram_seconds", seconds, engine=self.engine)
+        return ngrams
+
+    def _ingest_batches(
+        self, grouped: Dict[ChannelType, List[ChannelEntity]]
+    ) -> List[Tuple[ChannelType, List[ChannelEntity]]]:
+        batches: List[Tuple[ChannelType, List[ChannelEntity]]] = []
+        for t, channels in grouped.items():
+            channels = _dedupe_by_id(channels)
+            for start in range(0, len(channels), INGEST_BATCH_SIZE):
+                batches.append((t, channels[start : start + INGEST_BATCH_SIZE]))
+        return batches
+
+    def _next_sequence(self, cursor: sqlite3.Cursor) -> int:
+        """Next free sequence number; rowids are ``seq << TYPE_BITS | type_code``."""
+        maxima: str = " UNION ALL ".join(
+            f"SELECT MAX(rowid) AS m FROM {self._table_for_type(t)}"
+            for t in ChannelType
+        )
+        last: int = cursor.execute(
+            f"SELECT COALESCE(MAX(m), 0) FROM ({maxima})"
+        ).fetchone()[0]
+        return (last >> TYPE_BITS) + 1
+
+    def _has_rows(self, cursor: sqlite3.Cursor, channel_type: ChannelType) -> bool:
+        main_table: str = self._table_for_type(channel_type)
+        row = cursor.execute(f"SELECT 1 FROM {main_table} LIMIT 1").fetchone()
+        return row is not None
+
+    def _rowids_for(
+        self,
+        cursor: sqlite3.Cursor,
+        main_table: str,
+        channels: List[ChannelEntity],
+    ) -> Dict[str, int]:
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS write_ids (id TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        cursor.execute("DELETE FROM temp.write_ids")
+        cursor.executemany(
+            "INSERT OR IGNORE INTO temp.write_ids (id) VALUES (?)",
+            [(ch.id,) for ch in channels],
+        )
+        cursor.execute(
+            f"""
+            SELECT m.id, m.rowid FROM temp.write_ids AS w
+            JOIN {main_table} AS m ON m.id = w.id
+            """
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def _group_by_type(
+        self, channels: List[ChannelEntity]
+    ) -> Dict[ChannelType, List[ChannelEntity]]:
         grouped: Dict[ChannelType, List[ChannelEntity]] = {}
         for ch in channels:
             grouped.setdefault(ch.type, []).append(ch)
-        for t, batch in grouped.items():
-            main_table: str = self._table_for_type(t)
-            fts_table: str = self._fts_table_for_type(t)
-            main_rows: List[tuple[str, str, str]] = [
-                (ch.id, ch.name, ch.playable_url) for ch in batch
-            ]
-            fts_rows: List[tuple[str, str, str, str]] = [
-                (ch.id, ch.name, ch.playable_url, generate_ngrams(ch.name))
-                for ch in batch
-            ]
-            cursor.executemany(
+        return grouped
+
+    def save_channel(self, channel: ChannelEntity) -> None:
+        with self._write_transaction() as cursor:
+            self._write_batches(cursor, [(channel.type, [channel])])
+        self.query_cache.invalidate()
+
+    def save_channel_bulk(self, channels: List[ChannelEntity]) -> None:
+        with metrics.timer("ingest_seconds", engine=self.engine):
+            with self._write_transaction() as cursor:
+                self._write_batches(
+                    cursor, self._ingest_batches(self._group_by_type(channels))
+                )
+            metrics.increment("ingest_rows_total", len(channels), engine=self.engine)
+            self.query_cache.invalidate()
+
+    def begin_sync(self, channel_type: ChannelType) -> None:
+        seen: str = self._seen_table_for_type(channel_type)
+        self.conn.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {seen} (id TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        self.conn.execute(f"DELETE FROM temp.{seen}")
+        self.conn.commit()
+
+    def sync_channel_bulk(self, channels: List[ChannelEntity]) -> int:
+        with metrics.timer("ingest_seconds", engine=self.engine):
+            self.conn.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS sync_incoming (
+                    id TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            with self._write_transaction() as cursor:
+                changed_by_type: Dict[ChannelType, List[ChannelEntity]] = {}
+                for t, batch in self._group_by_type(channels).items():
+                    main_table: str = self._table_for_type(t)
+                    seen: str = self._seen_table_for_type(t)
+                    batch = _dedupe_by_id(batch)
+                    cursor.execute("DELETE FROM temp.sync_incoming")
+                    cursor.executemany(
+                        "INSERT INTO temp.sync_incoming (id, content_hash) VALUES (?, ?)",
+                        [(ch.id, _content_hash(ch)) for ch in batch],
+                    )
+                    cursor.execute(
+                        f"INSERT OR IGNORE INTO temp.{seen} (id) SELECT id FROM temp.sync_incoming"
+                    )
+                    cursor.execute(
+                        f"""
+                        SELECT i.id FROM temp.sync_incoming AS i
+                        LEFT JOIN {main_table} AS m ON m.id = i.id
+                        WHERE m.content_hash IS NOT i.content_hash
+                        """
+                    )
+                    changed_ids: Set[str] = {row[0] for row in cursor.fetchall()}
+                    changed: List[ChannelEntity] = [
+                        ch for ch in batch if ch.id in changed_ids
+                    ]
+                    if changed:
+                        changed_by_type[t] = changed
+                self._write_batches(cursor, self._ingest_batches(changed_by_type))
+            written: int = sum(map(len, changed_by_type.values()))
+            metrics.increment("ingest_rows_total", len(channels), engine=self.engine)
+            metrics.increment("ingest_written_rows_total", written, engine=self.engine)
+            if written:
+                self.query_cache.invalidate()
+            return written
+
+    def finish_sync(self, channel_type: ChannelType) -> int:
+        main_table: str = self._table_for_type(channel_type)
+        seen: str = self._seen_table_for_type(channel_type)
+        with self._write_transaction() as cursor:
+            cursor.execute(
                 f"""
-                INSERT OR REPLACE INTO {main_table} (id, name, playable_url)
-                VALUES (?, ?, ?)
+                SELECT rowid FROM {main_table}
+                WHERE id NOT IN (SELECT id FROM temp.{seen})
+                """
+            )
+            self._unindex_rowids(cursor, [row[0] for row in cursor.fetchall()])
+            cursor.execute(
+                f"DELETE FROM {main_table} WHERE id NOT IN (SELECT id FROM temp.{seen})"
+            )
+            deleted: int = cursor.rowcount
+            cursor.execute(
+                f"""
+                DELETE FROM stream_health
+                WHERE channel_type = ? AND channel_id NOT IN (SELECT id FROM temp.{seen})
+                """,
+                (channel_type.value,),
+            )
+            if channel_type == ChannelType.SERIES:
+                for table in ("series_episodes", "series_episodes_state"):
+                    cursor.execute(
+                        f"""
+                        DELETE FROM {table}
+                        WHERE series_id NOT IN (SELECT id FROM {main_table})
+                        """
+                    )
+            cursor.execute(
+                "INSERT OR REPLACE INTO sync_state (channel_type, synced_at) VALUES (?, ?)",
+                (channel_type.value, time.time()),
+            )
+        self.conn.execute(f"DROP TABLE IF EXISTS temp.{seen}")
+        if deleted:
+            self.query_cache.invalidate()
+        return deleted
+
+    def get_last_sync(self, channel_type: ChannelType) -> Optional[float]:
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT synced_at FROM sync_state WHERE channel_type = ?",
+            (channel_type.value,),
+        )
+        row: Optional[Tuple[float]] = cursor.fetchone()
+        return row[0] if row else None
+
+    def save_series_episodes(
+        self, series_id: str, episodes: List[ChannelEntity]
+    ) -> None:
+        with self._write_transaction() as cursor:
+            cursor.execute(
+                "DELETE FROM series_episodes WHERE series_id = ?", (series_id,)
+            )
+            prefix_ids: Dict[str, int] = self._url_prefix_ids(cursor, episodes)
+            cursor.executemany(
+                """
+                INSERT INTO series_episodes
+                    (series_id, position, id, name, url_prefix, url_suffix)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                main_rows,
+                [
+                    (
+                        series_id,
+                        position,
+                        ep.id,
+                        ep.name,
+                        prefix_ids[ep.url_prefix],
+                        ep.url_suffix,
+                    )
+                    for position, ep in enumerate(episodes)
+                ],
             )
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO series_episodes_state (series_id, fetched_at)
+                VALUES (?, ?)
+                """,
+                (series_id, time.time()),
+            )
+
+    def get_series_episodes(
+        self, series_id: str, max_age: Optional[float] = None
+    ) -> Optional[List[ChannelEntity]]:
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT fetched_at FROM series_episodes_state WHERE series_id = ?",
+            (series_id,),
+        )
+        state: Optional[Tuple[float]] = cursor.fetchone()
+        if state is None:
+            return None
+        if max_age is not None and time.time() - state[0] >= max_age:
+            return None
+        cursor.execute(
+            """
+            SELECT id, name, url_prefix, url_suffix, 'series', ''
+            FROM series_episodes
+            WHERE series_id = ? ORDER BY position
+            """,
+            (series_id,),
+        )
+        return self._to_entities(cursor.fetchall())
+
+    def save_stream_health(self, results: List[StreamHealth]) -> None:
+        with self._write_transaction() as cursor:
             cursor.executemany(
+                """
+                INSERT OR REPLACE INTO stream_health
+                    (channel_type, channel_id, alive, latency_ms, checked_at, detail)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        r.channel_type.value,
+                        r.channel_id,
+                        r.alive,
+                        r.latency_ms,
+                        r.checked_at,
+                        r.detail,
+                    )
+                    for r in results
+                ],
+            )
+
+    def get_stream_health(
+        self, channels: Iterable[ChannelEntity], max_age: Optional[float] = None
+    ) -> Dict[ChannelEntity, StreamHealth]:
+        by_key: Dict[Tuple[str, str], ChannelEntity] = {
+            (ch.type.value, ch.id): ch for ch in channels
+        }
+        oldest: float = -1.0 if max_age is None else time.time() - max_age
+        found: Dict[ChannelEntity, StreamHealth] = {}
+        keys: List[Tuple[str, str]] = list(by_key)
+        for start in range(0, len(keys), HEALTH_LOOKUP_BATCH):
+            batch: List[Tuple[str, str]] = keys[start : start + HEALTH_LOOKUP_BATCH]
+            values: str = ", ".join("(?, ?)" for _ in batch)
+            cursor: sqlite3.Cursor = self.conn.execute(
                 f"""
-                INSERT OR REPLACE INTO {fts_table} (id, name, playable_url, ngrams)
-                VALUES (?, ?, ?, ?)
+                WITH wanted(channel_type, channel_id) AS (VALUES {values})
+                SELECT h.channel_type, h.channel_id, h.alive, h.latency_ms,
+                    h.checked_at, h.detail
+                FROM wanted AS w CROSS JOIN stream_health AS h
+                ON h.channel_type = w.channel_type AND h.channel_id = w.channel_id
+                WHERE h.checked_at >= ?
                 """,
-                fts_rows,
+                [*(value for key in batch for value in key), oldest],
             )
-        self.conn.commit()
+            for type_value, id_, alive, latency_ms, checked_at, detail in cursor:
+                found[by_key[type_value, id_]] = StreamHealth(
+                    channel_id=id_,
+                    channel_type=TYPES_BY_VALUE[type_value],
+                    alive=bool(alive),
+                    latency_ms=latency_ms,
+                    checked_at=checked_at,
+                    detail=detail,
+                )
+        return found
 
     def get_channel(self, channel_id: str) -> Optional[ChannelEntity]:
         cursor: sqlite3.Cursor = self.conn.cursor()
         for t in ChannelType:
             table: str = self._table_for_type(t)
-            cursor.execute(f"SELECT * FROM {table} WHERE id = ?", (channel_id,))
-            row: Optional[sqlite3.Row] = cursor.fetchone()
-            if row:
-                return self._row_to_entity(row, t)
+            cursor.execute(
+                f"""
+                SELECT id, name, url_prefix, url_suffix, '{t.value}', epg_id
+                FROM {table}
+                WHERE id = ?
+                """,
+                (channel_id,),
+            )
+            rows: List[Tuple[Any, ...]] = cursor.fetchall()
+            if rows:
+                return self._to_entities(rows)[0]
         return None
 
+    def iter_channels(
+        self, channel_type: ChannelType, batch_size: int = 1000
+    ) -> Iterator[List[ChannelEntity]]:
+        table: str = self._table_for_type(channel_type)
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        # Paged by rowid, so no read transaction is held open between batches.
+        last_rowid: int = 0
+        while True:
+            cursor.execute(
+                f"""
+                SELECT id, name, url_prefix, url_suffix, '{channel_type.value}',
+                    epg_id, rowid
+                FROM {table}
+                WHERE rowid > ?
+                ORDER BY rowid
+                LIMIT ?
+                """,
+                (last_rowid, batch_size),
+            )
+            rows: List[Tuple[Any, ...]] = cursor.fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][6]
+            yield self._to_entities(rows)
+
     def search_by_name_and_type(
         self, name: str, channel_type: ChannelType
     ) -> List[ChannelEntity]:
-        logger.debug(
-            f"Searching for channels with name '{name}' and type '{channel_type}'"
+        return self.search(name, [channel_type])
+
+    def search(
+        self,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[ChannelEntity]:
+        with metrics.timer("search_seconds", engine=self.engine, kind="search"):
+            channel_types = list(dict.fromkeys(channel_types))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Searching for channels with name '{name}' and types "
+                    f"{[t.value for t in channel_types]}"
+                )
+            tokens: List[str] = query_tokens(name)
+            if not tokens or not channel_types:
+                return []
+            self._drop_stale_results()
+            key: QueryKey = QueryResultCache.key(tokens, channel_types)
+            cached: Optional[List[ChannelEntity]] = self.query_cache.page(
+                key, limit, offset
+            )
+            if cached is not None:
+                metrics.increment("search_cache_hits_total", engine=self.engine)
+                metrics.increment("search_rows_total", len(cached), engine=self.engine)
+                return cached
+            metrics.increment("search_cache_misses_total", engine=self.engine)
+            generation: int = self.query_cache.generation
+            results: List[ChannelEntity] = self._ranked(
+                self._matching(tokens, channel_types), limit, offset
+            )
+            metrics.increment("search_rows_total", len(results), engine=self.engine)
+            self.query_cache.store_page(key, results, limit, offset, generation)
+            return results
+
+    def search_fuzzy(
+        self,
+        name: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+    ) -> List[ChannelEntity]:
+        with metrics.timer("search_seconds", engine=self.engine, kind="fuzzy"):
+            channel_types = list(dict.fromkeys(channel_types))
+            tokens: List[str] = query_tokens(name)
+            grams: Set[str] = query_trigrams(tokens)
+            if not grams or not channel_types:
+                return []
+            cursor: sqlite3.Cursor = self.conn.cursor()
+            needed: int = min_overlap(tokens)
+            indexed: Set[str] = self._indexed_grams(grams)
+            rowids: List[int] = []
+            if len(indexed) >= needed:
+                rowids = self._fuzzy_candidates(cursor, indexed, needed, channel_types)
+            # A stemmed trigram matches every name containing its stem, so
+            # those are only looked up when the others find nothing.
+            if not rowids and indexed != grams:
+                rowids = self._fuzzy_candidates(cursor, grams, needed, channel_types)
+            candidates: List[ChannelEntity] = self._rows_in_order(cursor, rowids)
+            results: List[ChannelEntity] = rank_fuzzy(tokens, candidates, limit)
+            logger.debug(
+                f"Found {len(results)} channels close to '{name}' "
+                f"among {len(candidates)} candidates"
+            )
+            return results
+
+    def _fuzzy_candidates(
+        self,
+        cursor: sqlite3.Cursor,
+        grams: Set[str],
+        needed: int,
+        channel_types: List[ChannelType],
+    ) -> List[int]:
+        """Rows sharing the most of grams (at least needed of them), at most
+        FUZZY_CANDIDATE_LIMIT; shared grams are counted in one query."""
+        arms: List[str] = []
+        params: Tuple[Any, ...] = ()
+        for gram in sorted(grams):
+            _, matches, gram_params = self._matching([gram], channel_types)
+            arms.append(f"SELECT rowid FROM (SELECT rowid {matches} LIMIT ?)")
+            params += gram_params + (FUZZY_GRAM_LIMIT,)
+        cursor.execute(
+            f"""
+            SELECT rowid FROM ({" UNION ALL ".join(arms)})
+            GROUP BY rowid HAVING COUNT(*) >= ?
+            ORDER BY COUNT(*) DESC, rowid LIMIT ?
+            """,
+            params + (needed, FUZZY_CANDIDATE_LIMIT),
         )
-        cursor: sqlite3.Cursor = self.conn.cursor()
-        fts_table: str = self._fts_table_for_type(channel_type)
-        tokens: List[str] = [_clean_token(tok) for tok in name.lower().split()]
-        if not tokens:
+        return [row[0] for row in cursor.fetchall()]
+
+    def _indexed_grams(self, grams: Set[str]) -> Set[str]:
+        """Those of grams the index stores unchanged.
+
+        The Porter tokenizer stems some trigrams ("rts" to "rt"); looking one
+        up would match every name containing the shorter term.
+        """
+        unknown: List[str] = sorted(gram for gram in grams if gram not in self._stems)
+        if unknown:
+            stemmer: sqlite3.Connection = self._stemmer
+            stemmer.executemany(
+                "INSERT INTO words (rowid, word) VALUES (?, ?)", enumerate(unknown)
+            )
+            stems: Dict[int, str] = dict(
+                stemmer.execute("SELECT doc, term FROM stems").fetchall()
+            )
+            stemmer.rollback()
+            for position, gram in enumerate(unknown):
+                self._stems[gram] = stems.get(position, "")
+        return {gram for gram in grams if self._stems[gram] == gram}
+
+    @property
+    def _stemmer(self) -> sqlite3.Connection:
+        """A scratch database tokenizing words as the index does."""
+        stemmer: Optional[sqlite3.Connection] = getattr(self._local, "stemmer", None)
+        if stemmer is None:
+            stemmer = sqlite3.connect(":memory:")
+            stemmer.execute(
+                f"""
+                CREATE VIRTUAL TABLE words
+                USING fts5(word, tokenize='{FTS_TOKENIZER}')
+                """
+            )
+            # One row per token: the word's rowid (doc) and its stored term.
+            stemmer.execute(
+                "CREATE VIRTUAL TABLE stems USING fts5vocab(words, 'instance')"
+            )
+            self._local.stemmer = stemmer
+        return stemmer
+
+    def _rows_in_order(
+        self, cursor: sqlite3.Cursor, rowids: List[int]
+    ) -> List[ChannelEntity]:
+        if not rowids:
             return []
-        match_query: str = " AND ".join(f'ngrams:"{tok}"' for tok in tokens if tok)
+        values: str = ", ".join("(?, ?)" for _ in rowids)
         cursor.execute(
             f"""
-            SELECT id, name, playable_url, bm25({fts_table}) AS score
-            FROM {fts_table}
-            WHERE {fts_table} MATCH ?
+            WITH hits(rowid, score) AS (VALUES {values})
+            {self._hit_rows}
             ORDER BY score
             """,
-            (match_query,),
+            [
+                value
+                for position, rowid in enumerate(rowids)
+                for value in (rowid, position)
+            ],
         )
-        rows: List[sqlite3.Row] = cursor.fetchall()
-        logger.debug(
-            f"Found {len(rows)} matching channels. Names: {[r['name'] for r in rows]}"
+        return self._to_entities(cursor.fetchall())
+
+    def _ranked(
+        self,
+        matching: Tuple[str, str, Tuple[Any, ...]],
+        limit: Optional[int],
+        offset: int,
+    ) -> List[ChannelEntity]:
+        score, matches, params = matching
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        # Rank on index data alone, then read stored columns for the page only.
+        cursor.execute(
+            f"""
+            WITH hits AS (
+                SELECT rowid, {score} AS score
+                {matches}
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            )
+            {self._hit_rows}
+            ORDER BY score
+            """,
+            (*params, -1 if limit is None else limit, offset),
         )
-        return [self._row_to_entity(r, channel_type) for r in rows]
+        return self._to_entities(cursor.fetchall())
+
+    def count(self, name: str, channel_types: Iterable[ChannelType]) -> int:
+        with metrics.timer("search_seconds", engine=self.engine, kind="count"):
+            channel_types = list(dict.fromkeys(channel_types))
+            tokens: List[str] = query_tokens(name)
+            if not tokens or not channel_types:
+                return 0
+            self._drop_stale_results()
+            key: QueryKey = QueryResultCache.key(tokens, channel_types)
+            cached: Optional[int] = self.query_cache.count(key)
+            if cached is not None:
+                return cached
+            generation: int = self.query_cache.generation
+            cursor: sqlite3.Cursor = self.conn.cursor()
+            _, matches, params = self._matching(tokens, channel_types)
+            cursor.execute(f"SELECT COUNT(*) {matches}", params)
+            total: int = cursor.fetchone()[0]
+            self.query_cache.store_count(key, total, generation)
+            return total
+
+    def _matching(
+        self, tokens: List[str], channel_types: List[ChannelType]
+    ) -> Tuple[str, str, Tuple[Any, ...]]:
+        """Score expression, FROM/WHERE clause and parameters matching tokens.
+
+        Rows are selected by rowid; lower scores rank first.
+        """
+        match_query: str = " AND ".join(f'ngrams:"{tok}"' for tok in tokens)
+        return (
+            f"bm25({FTS_TABLE})",
+            f"""
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH ? AND {self._type_filter(channel_types)}
+            """,
+            (match_query,),
+        )
+
+    def _type_filter(self, channel_types: List[ChannelType]) -> str:
+        codes: str = ", ".join(str(TYPE_CODES[t]) for t in channel_types)
+        return f"(rowid & {(1 << TYPE_BITS) - 1}) IN ({codes})"
+
+    def _to_entities(self, rows: List[Tuple[Any, ...]]) -> List[ChannelEntity]:
+        """Entities from rows starting (id, name, url_prefix, url_suffix, type,
+        epg_id)."""
+        prefixes: Dict[int, str] = self._url_prefixes
+        from_parts = ChannelEntity.from_parts
+        entities: List[ChannelEntity] = []
+        for row in rows:
+            prefix: Optional[str] = prefixes.get(row[2])
+            if prefix is None:
+                prefix = self._load_url_prefix(row[2])
+            entities.append(
+                from_parts(
+                    row[0], row[1], prefix, row[3], TYPES_BY_VALUE[row[4]], row[5]
+                )
+            )
+        return entities
 
-    def _row_to_entity(
-        self, row: sqlite3.Row, channel_type: ChannelType
-    ) -> ChannelEntity:
-        return ChannelEntity(
-            id=row["id"],
-            name=row["name"],
-            playable_url=row["playable_url"],
-            type=channel_type,
+    def _load_url_prefix(self, prefix_id: int) -> str:
+        cursor: sqlite3.Cursor = self.conn.execute(
+            "SELECT id, prefix FROM url_prefixes"
         )
+        self._url_prefixes = {
+            id_: sys.intern(prefix) for id_, prefix in cursor.fetchall()
+        }
+        return self._url_prefixes[prefix_id]
@@ -0,0 +1,147 @@
+import sqlite3
+from typing import Any, Dict, List, Set, Tuple
+
+from pyiptv.dao.channel_storage.sqlite import SCHEMA_VERSION, ChannelStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+# Every main table, read through one view so a single index can cover them.
+CONTENT_VIEW = "channels_content"
+TRIGRAM_TABLE = "channels_trigram"
+
+# The trigram tokenizer cannot look up shorter substrings in its index.
+MIN_TRIGRAM_TOKEN = 3
+
+
+def _like_pattern(token: str) -> str:
+    """Substring LIKE pattern; tokens are word characters, so only ``_`` is special."""
+    return "%" + token.replace("_", "\\_") + "%"
+
+
+class ChannelStorageSQLiteTrigram(ChannelStorageSQLite):
+    """SQLite storage searched through FTS5's native trigram tokenizer.
+
+    The index is an external-content table over the main tables, so it
+    stores no copy of any column and no n-grams are generated in Python.
+    Inside ``bulk_load`` it is not maintained row by row but rebuilt from
+    the main tables in one pass at the end. Query tokens of three or more
+    characters match as substrings through the index; shorter ones are
+    checked with LIKE.
+    """
+
+    # Distinct from the n-gram engine's, so switching engines on an existing
+    # database rebuilds it instead of reading the other engine's index.
+    schema_version: int = 1000 + SCHEMA_VERSION
+    engine: str = "trigram"
+    # Joined per main table: a join against the UNION ALL view would scan it.
+    _hit_rows: str = " UNION ALL ".join(
+        f"""
+        SELECT m.id, m.name, m.url_prefix, m.url_suffix, '{t.value}', m.epg_id,
+            hits.score
+        FROM hits JOIN channels_{t.value} AS m ON m.rowid = hits.rowid
+        """
+        for t in ChannelType
+    )
+
+    def _create_search_index(self, cursor: sqlite3.Cursor) -> None:
+        arms: str = " UNION ALL ".join(
+            f"""
+            SELECT rowid, id, name, url_prefix, url_suffix, '{t.value}'
+            FROM {self._table_for_type(t)}
+            """
+            for t in ChannelType
+        )
+        cursor.execute(
+            f"""
+            CREATE VIEW IF NOT EXISTS {CONTENT_VIEW}
+            (rowid, id, name, url_prefix, url_suffix, type) AS {arms}
+            """
+        )
+        cursor.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_TABLE}
+            USING fts5(name, content='{CONTENT_VIEW}', tokenize='trigram')
+            """
+        )
+
+    def _begin_bulk_load(self, cursor: sqlite3.Cursor) -> None:
+        # The index is rebuilt from the main tables at the end instead.
+        pass
+
+    def _finish_bulk_load(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            f"INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}) VALUES ('rebuild')"
+        )
+        cursor.execute(
+            f"INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}) VALUES ('optimize')"
+        )
+
+    def _write_batches(
+        self,
+        cursor: sqlite3.Cursor,
+        batches: List[Tuple[ChannelType, List[ChannelEntity]]],
+    ) -> None:
+        # Names are indexed as stored, so there is nothing to prepare.
+        prefilled: Dict[ChannelType, bool] = {
+            t: self._has_rows(cursor, t) for t, _ in batches
+        }
+        for t, batch in batches:
+            self._write_channels(cursor, t, batch, [], prefilled[t])
+
+    def _index_channels(
+        self,
+        cursor: sqlite3.Cursor,
+        channel_type: ChannelType,
+        channels: List[ChannelEntity],
+        rowids: Dict[str, int],
+        ngrams: List[str],
+        prefix_ids: Dict[str, int],
+    ) -> None:
+        if self._bulk_loading:
+            return
+        cursor.executemany(
+            f"INSERT INTO {TRIGRAM_TABLE} (rowid, name) VALUES (?, ?)",
+            [(rowids[ch.id], ch.name) for ch in channels],
+        )
+
+    def _unindex_rowids(self, cursor: sqlite3.Cursor, rowids: List[int]) -> None:
+        if self._bulk_loading:
+            return
+        # External-content entries are removed by passing back the indexed
+        # values, read from the main tables before they change.
+        cursor.executemany(
+            f"""
+            INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}, rowid, name)
+            SELECT 'delete', rowid, name FROM {CONTENT_VIEW} WHERE rowid = ?
+            """,
+            [(rowid,) for rowid in rowids],
+        )
+
+    def _indexed_grams(self, grams: Set[str]) -> Set[str]:
+        # The trigram tokenizer only folds case, as query tokens already are.
+        return grams
+
+    def _matching(
+        self, tokens: List[str], channel_types: List[ChannelType]
+    ) -> Tuple[str, str, Tuple[Any, ...]]:
+        indexed: List[str] = [tok for tok in tokens if len(tok) >= MIN_TRIGRAM_TOKEN]
+        short: List[str] = [tok for tok in tokens if len(tok) < MIN_TRIGRAM_TOKEN]
+        conditions: List[str] = [self._type_filter(channel_types)]
+        params: Tuple[Any, ...] = ()
+        if indexed:
+            conditions.append(f"{TRIGRAM_TABLE} MATCH ?")
+            params += (" AND ".join(f'"{tok}"' for tok in indexed),)
+        for tok in short:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params += (_like_pattern(tok),)
+        where: str = " AND ".join(conditions)
+        if indexed:
+            return (
+                f"bm25({TRIGRAM_TABLE})",
+                f"FROM {TRIGRAM_TABLE} WHERE {where}",
+                params,
+            )
+        # Nothing to look up in the index, so scan the main tables directly
+        # (cheaper than the index fetching each name from them), preferring
+        # the shortest names, where the match covers the most of the name.
+        return "length(name)", f"FROM {CONTENT_VIEW} WHERE {where}", params
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.programme import GuideChannel, Programme
+
+# The programme on now and the one after it; either may be unknown.
+NowNext = Tuple[Optional[Programme], Optional[Programme]]
+
+
+class BaseProgrammeStorage(ABC):
+    @abstractmethod
+    def replace_guide(self, items: Iterable[Union[GuideChannel, Programme]]) -> int:
+        """Replace the stored guide with items, returning the programmes stored.
+
+        The previous guide stays readable until the new one is complete, and
+        is kept if reading items fails.
+        """
+        pass
+
+    @abstractmethod
+    def now_next(
+        self, channels: Sequence[ChannelEntity], now: Optional[float] = None
+    ) -> List[NowNext]:
+        """Now and next programme of each channel, in one lookup.
+
+        Channels are matched to guide channels by their ``epg_id`` where the
+        guide has it, and otherwise by normalized name.
+        """
+        pass
+
+    @abstractmethod
+    def get_last_update(self) -> Optional[float]:
+        """Time the guide was last replaced, or None if it never was."""
+        pass
@@ -0,0 +1,220 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from pyiptv.dao.channel_storage.ngrams import normalized_name
+from pyiptv.dao.channel_storage.sqlite import CONNECTION_PRAGMAS
+from pyiptv.dao.programme_storage.base import BaseProgrammeStorage, NowNext
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.programme import GuideChannel, Programme
+
+logger = logging.getLogger(__name__)
+
+# Programmes are written in batches of this size while the guide is parsed.
+INGEST_BATCH_SIZE = 10000
+
+
+class ProgrammeStorageSQLite(BaseProgrammeStorage):
+    """Programme guide in SQLite, clustered by (channel, start).
+
+    Now and next of a channel are found with one index seek each: the
+    latest programme starting by now and the first starting after it. The
+    lookup for a whole screen of channels is a single query.
+
+    Channels are matched to the guide by the guide id their source gives
+    them (``epg_id``, compared case-insensitively), and otherwise by
+    normalized name.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath: str = filepath
+        self._local: threading.local = threading.local()
+        # Guide channel ids by casefolded id and by normalized display name,
+        # loaded on first lookup.
+        self._guide_keys: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+        logger.debug(f"Initialized SQLite programme storage at {filepath}")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.filepath)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self) -> None:
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS guide_channels (id TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS guide_names (
+                name_key TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                PRIMARY KEY (name_key, channel)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS programmes (
+                channel TEXT NOT NULL,
+                start INTEGER NOT NULL,
+                stop INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                PRIMARY KEY (channel, start)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS guide_state (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def replace_guide(self, items: Iterable[Union[GuideChannel, Programme]]) -> int:
+        start: float = time.perf_counter()
+        cursor: sqlite3.Cursor = self.conn.cursor()
+        channel_ids: List[Tuple[str]] = []
+        names: List[Tuple[str, str]] = []
+        programmes: List[Tuple[str, int, int, str]] = []
+        stored: int = 0
+        self.conn.execute("BEGIN")
+        try:
+            cursor.execute("DELETE FROM guide_channels")
+            cursor.execute("DELETE FROM guide_names")
+            cursor.execute("DELETE FROM programmes")
+            for item in items:
+                if isinstance(item, Programme):
+                    programmes.append((item.channel, item.start, item.stop, item.title))
+                    if len(programmes) >= INGEST_BATCH_SIZE:
+                        stored += self._write_programmes(cursor, programmes)
+                        programmes = []
+                else:
+                    channel_ids.append((item.id,))
+                    names.extend(
+                        (normalized_name(name), item.id) for name in item.names
+                    )
+            stored += self._write_programmes(cursor, programmes)
+            cursor.executemany(
+                "INSERT OR IGNORE INTO guide_channels (id) VALUES (?)", channel_ids
+            )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO guide_names (name_key, channel) VALUES (?, ?)",
+                names,
+            )
+            cursor.execute(
+                "INSERT OR REPLACE INTO guide_state (id, updated_at) VALUES (0, ?)",
+                (time.time(),),
+            )
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self._guide_keys = None
+        logger.info(
+            f"Stored {stored} programmes of {len(names)} guide channel names "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        return stored
+
+    def _write_programmes(
+        self, cursor: sqlite3.Cursor, programmes: List[Tuple[str, int, int, str]]
+    ) -> int:
+        # Guides repeat a slot now and then; the last one wins.
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO programmes (channel, start, stop, title)
+            VALUES (?, ?, ?, ?)
+            """,
+            programmes,
+        )
+        return len(programmes)
+
+    def _guide_channel_ids(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        guide_keys = self._guide_keys
+        if guide_keys is None:
+            by_id: Dict[str, str] = {
+                row[0].casefold(): row[0]
+                for row in self.conn.execute("SELECT id FROM guide_channels")
+            }
+            # With several guide channels of one name, any of them will do.
+            by_name: Dict[str, str] = dict(
+                self.conn.execute("SELECT name_key, channel FROM guide_names")
+            )
+            guide_keys = self._guide_keys = (by_id, by_name)
+        return guide_keys
+
+    def _guide_id(
+        self, channel: ChannelEntity, by_id: Dict[str, str], by_name: Dict[str, str]
+    ) -> Optional[str]:
+        if channel.epg_id:
+            guide_id: Optional[str] = by_id.get(channel.epg_id.casefold())
+            if guide_id is not None:
+                return guide_id
+        return by_name.get(normalized_name(channel.name))
+
+    def now_next(
+        self, channels: Sequence[ChannelEntity], now: Optional[float] = None
+    ) -> List[NowNext]:
+        result: List[NowNext] = [(None, None)] * len(channels)
+        by_id, by_name = self._guide_channel_ids()
+        wanted: List[Tuple[int, str]] = []
+        for position, channel in enumerate(channels):
+            guide_id: Optional[str] = self._guide_id(channel, by_id, by_name)
+            if guide_id is not None:
+                wanted.append((position, guide_id))
+        if not wanted:
+            return result
+        # ?1 is now; the (position, guide channel) pairs follow it.
+        values: str = ", ".join(
+            f"(?{2 + 2 * i}, ?{3 + 2 * i})" for i in range(len(wanted))
+        )
+        cursor: sqlite3.Cursor = self.conn.execute(
+            f"""
+            WITH wanted(position, channel) AS (VALUES {values})
+            SELECT w.position, 0, p.channel, p.start, p.stop, p.title
+            FROM wanted AS w CROSS JOIN programmes AS p
+            ON p.channel = w.channel AND p.start = (
+                SELECT max(start) FROM programmes
+                WHERE channel = w.channel AND start <= ?1
+            )
+            WHERE p.stop > ?1
+            UNION ALL
+            SELECT w.position, 1, p.channel, p.start, p.stop, p.title
+            FROM wanted AS w CROSS JOIN programmes AS p
+            ON p.channel = w.channel AND p.start = (
+                SELECT min(start) FROM programmes
+                WHERE channel = w.channel AND start > ?1
+            )
+            """,
+            [
+                int(time.time() if now is None else now),
+                *(value for pair in wanted for value in pair),
+            ],
+        )
+        found: Dict[int, List[Optional[Programme]]] = {}
+        for position, is_next, channel, start, stop, title in cursor.fetchall():
+            found.setdefault(position, [None, None])[is_next] = Programme(
+                channel=channel, start=start, stop=stop, title=title
+            )
+        for position, (current, upcoming) in found.items():
+            result[position] = (current, upcoming)
+        return result
+
+    def get_last_update(self) -> Optional[float]:
+        row: Optional[Tuple[float]] = self.conn.execute(
+            "SELECT updated_at FROM guide_state WHERE id = 0"
+        ).fetchone()
+        return row[0] if row else None
@@ -1,11 +1,102 @@
 import dataclasses
+import sys
+from typing import Tuple
 
 from pyiptv.enum.channel_type import ChannelType
 
+# Joins a provider and its own channel id in catalogs of several providers.
+PROVIDER_SEPARATOR = ":"
 
-@dataclasses.dataclass
+
+def split_url(url: str) -> Tuple[str, str]:
+    """Split url after its last ``/``: the shared prefix and the per-stream rest."""
+    cut: int = url.rfind("/") + 1
+    return sys.intern(url[:cut]), url[cut:]
+
+
+@dataclasses.dataclass(frozen=True, slots=True, init=False)
 class ChannelEntity:
+    """A channel, movie, series or episode of a catalog.
+
+    The playable URL is held in two parts and only joined when read. The
+    prefix (for Xtream sources: base URL, stream kind and credentials) is
+    the same for every stream of a source and kind, so it is interned and
+    shared by all of them; only the suffix (``<id>.<extension>``) is per
+    channel. Streams without a URL (series) have both parts empty.
+
+    ``epg_id`` is the source's id for the channel in its programme guide
+    (XMLTV ``<channel id>``), or "" if it has none.
+    """
+
     id: str
     name: str
-    playable_url: str
+    url_prefix: str
+    url_suffix: str
     type: ChannelType
+    epg_id: str
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        playable_url: str,
+        type: ChannelType,
+        epg_id: str = "",
+    ) -> None:
+        url_prefix, url_suffix = split_url(playable_url)
+        _set_fields(self, id, name, url_prefix, url_suffix, type, epg_id)
+
+    @classmethod
+    def from_parts(
+        cls,
+        id: str,
+        name: str,
+        url_prefix: str,
+        url_suffix: str,
+        type: ChannelType,
+        epg_id: str = "",
+    ) -> "ChannelEntity":
+        """Build from an already split URL; url_prefix should be shared."""
+        entity: ChannelEntity = cls.__new__(cls)
+        _set_fields(entity, id, name, url_prefix, url_suffix, type, epg_id)
+        return entity
+
+    @property
+    def playable_url(self) -> str:
+        return self.url_prefix + self.url_suffix
+
+    @property
+    def provider(self) -> str:
+        """Provider the channel comes from, or "" outside aggregated catalogs."""
+        provider, separator, _ = self.id.partition(PROVIDER_SEPARATOR)
+        return provider if separator else ""
+
+    def namespaced(self, provider: str) -> "ChannelEntity":
+        """This channel with its id prefixed by provider."""
+        return ChannelEntity.from_parts(
+            f"{provider}{PROVIDER_SEPARATOR}{self.id}",
+            self.name,
+            self.url_prefix,
+            self.url_suffix,
+            self.type,
+            self.epg_id,
+        )
+
+
+def _set_fields(
+    entity: ChannelEntity,
+    id: str,
+    name: str,
+    url_prefix: str,
+    url_suffix: str,
+    type: ChannelType,
+    epg_id: str,
+) -> None:
+    # Frozen instances are only written here, right after creation.
+    setattr_ = object.__setattr__
+    setattr_(entity, "id", id)
+    setattr_(entity, "name", name)
+    setattr_(entity, "url_prefix", url_prefix)
+    setattr_(entity, "url_suffix", url_suffix)
+    setattr_(entity, "type", type)
+    setattr_(entity, "epg_id", epg_id)
@@ -0,0 +1,20 @@
+import dataclasses
+from typing import List
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GuideChannel:
+    """A channel of a programme guide, by its guide id and display names."""
+
+    id: str
+    names: List[str]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Programme:
+    """A programme of a guide channel; start and stop are Unix timestamps."""
+
+    channel: str
+    start: int
+    stop: int
+    title: str
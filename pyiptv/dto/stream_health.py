@@ -0,0 +1,20 @@
+import dataclasses
+from typing import Optional
+
+from pyiptv.enum.channel_type import ChannelType
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class StreamHealth:
+    """Outcome of probing a channel's stream at checked_at (a Unix time).
+
+    latency_ms is the time to the first byte of the stream, if any came;
+    detail says why a dead stream failed (an HTTP status or error name).
+    """
+
+    channel_id: str
+    channel_type: ChannelType
+    alive: bool
+    latency_ms: Optional[float]
+    checked_at: float
+    detail: str = ""
@@ -1,50 +1,261 @@
+import argparse
 import logging
-import os
+import sys
+from typing import Dict, List, Optional, Tuple
 
-from dotenv import load_dotenv
-
-load_dotenv()
-logging.basicConfig(
-    filename="pyiptv.log",
-    filemode="w",
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+from pyiptv.config import (
+    M3UProvider,
+    XtremeProvider,
+    cache_ttl,
+    catalog_db_path,
+    epg_location,
+    hide_dead_streams,
+    log_level,
+    m3u_providers,
+    metrics_file,
+    metrics_interval,
+    player_mode,
+    probe_streams,
+    probe_workers,
+    search_engine,
+    xtreme_providers,
 )
+from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval
+from pyiptv.dao.channel_retreival.lazy import LazyChannelSource
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services.sync import CATALOG_TYPES, CatalogSyncService
+
+# Everything else is imported where it is used, so that a start only loads
+# what it needs: the chosen storage engine, and the HTTP client and parsers
+# of the sources only once a stale catalog or guide is actually synced.
+
 
-import tempfile
+def build_channel_storage(
+    engine: str, source_identity: Tuple[str, ...]
+) -> BaseChannelStorage:
+    if engine == "memory":
+        from pyiptv.dao.channel_storage.memory import ChannelStorageMemory
+
+        return ChannelStorageMemory(catalog_db_path(*source_identity, suffix=".idx"))
+    if engine == "trigram":
+        from pyiptv.dao.channel_storage.sqlite_trigram import (
+            ChannelStorageSQLiteTrigram,
+        )
 
-from pyiptv.dao.channel_retreival.xtreme import XtremeChannelSource
-from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
-from pyiptv.players.vlc import VLCPlayer
-from pyiptv.services.cli import CLIService
+        return ChannelStorageSQLiteTrigram(catalog_db_path(*source_identity))
+    from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
 
+    return ChannelStorageSQLite(catalog_db_path(*source_identity))
+
+
+def build_channel_source(
+    providers: List[XtremeProvider], playlists: List[M3UProvider]
+) -> BaseChannelRetrieval:
+    from pyiptv.dao.channel_retreival.aggregate import AggregateChannelSource
+    from pyiptv.dao.channel_retreival.m3u import M3UChannelSource
+    from pyiptv.dao.channel_retreival.xtreme import XtremeChannelSource
+
+    sources: Dict[str, BaseChannelRetrieval] = {
+        provider.id: XtremeChannelSource(
+            base_url=provider.url,
+            username=provider.username,
+            password=provider.password,
+        )
+        for provider in providers
+    }
+    for playlist in playlists:
+        sources[playlist.id] = M3UChannelSource(playlist.location)
+    # A single provider keeps its own channel ids, as before aggregation.
+    return (
+        AggregateChannelSource(sources)
+        if len(sources) > 1
+        else next(iter(sources.values()))
+    )
 
-def main():
-    xtreme_url = os.getenv("XTREME_URL", "")
-    xtreme_username = os.getenv("XTREME_USERNAME", "")
-    xtreme_password = os.getenv("XTREME_PASSWORD", "")
 
-    if not all([xtreme_url, xtreme_username, xtreme_password]):
+def build_catalog(
+    providers: List[XtremeProvider],
+    playlists: List[M3UProvider],
+    bulk_first_sync: bool = False,
+) -> Tuple[BaseChannelStorage, CatalogSyncService]:
+    if not providers and not playlists:
         raise ValueError(
-            "XTREME_URL, XTREME_USERNAME, and XTREME_PASSWORD must be set in environment variables."
+            "XTREME_URL, XTREME_USERNAME, and XTREME_PASSWORD (or M3U_URL) must be "
+            "set in environment variables."
         )
+    provider_ids = [provider.id for provider in providers] + [
+        playlist.id for playlist in playlists
+    ]
+    for provider_id in provider_ids:
+        if provider_ids.count(provider_id) > 1:
+            raise ValueError(f"Provider id {provider_id} is used twice")
 
-    with tempfile.NamedTemporaryFile() as temp_db_file:
-        storage = ChannelStorageSQLite(temp_db_file.name)
+    source_identity = tuple(
+        value
+        for provider in providers
+        for value in (provider.url, provider.username, provider.password)
+    ) + tuple(playlist.location for playlist in playlists)
+    storage = build_channel_storage(search_engine(), source_identity)
 
-        xtreme_source = XtremeChannelSource(
-            base_url=xtreme_url,
-            username=xtreme_username,
-            password=xtreme_password,
+    catalog_sync = CatalogSyncService(
+        channel_storage=storage,
+        channel_retreival=LazyChannelSource(
+            lambda: build_channel_source(providers, playlists)
+        ),
+        ttl=cache_ttl(),
+        bulk_first_sync=bulk_first_sync,
+    )
+    return storage, catalog_sync
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    from pyiptv.services.batch import EXPORT_FORMATS
+
+    parser = argparse.ArgumentParser(
+        prog="pyiptv",
+        description="Search and play IPTV catalogs. Without a command, opens "
+        "the interactive UI.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    type_names = [t.value for t in CATALOG_TYPES]
+
+    def add_types(command: argparse.ArgumentParser) -> None:
+        command.add_argument(
+            "--type",
+            dest="types",
+            action="append",
+            choices=type_names,
+            help="channel type, repeatable (default: all)",
         )
 
-        vlc_player = VLCPlayer()
+    sync = commands.add_parser("sync", help="refresh the stored catalog")
+    sync.add_argument("--force", action="store_true", help="refresh even if fresh")
+    add_types(sync)
+
+    search = commands.add_parser("search", help="search the stored catalog")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=None)
+    search.add_argument("--fuzzy", action="store_true", help="tolerate typos")
+    search.add_argument("--json", action="store_true", help="write JSON lines")
+    add_types(search)
+
+    get = commands.add_parser("get", help="print the stream URL of a channel")
+    get.add_argument("id")
+    get.add_argument("--json", action="store_true", help="write a JSON line")
+
+    export = commands.add_parser("export", help="write every stored channel")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    add_types(export)
+    return parser.parse_args(argv)
+
 
-        cli_service = CLIService(
-            channel_storage=storage, channel_retreival=xtreme_source, player=vlc_player
+def run_command(args: argparse.Namespace) -> int:
+    from pyiptv.services.batch import BatchService
+
+    # No one searches while a command syncs, so a first sync may bulk load.
+    storage, catalog_sync = build_catalog(
+        xtreme_providers(), m3u_providers(), bulk_first_sync=True
+    )
+    batch = BatchService(channel_storage=storage, catalog_sync=catalog_sync)
+    channel_types = [
+        ChannelType(value) for value in getattr(args, "types", None) or []
+    ] or CATALOG_TYPES
+    if args.command == "sync":
+        return 0 if batch.sync(channel_types, force=args.force) else 1
+    if args.command == "search":
+        batch.search(
+            args.query,
+            channel_types,
+            limit=args.limit,
+            fuzzy=args.fuzzy,
+            as_json=args.json,
+        )
+        return 0
+    if args.command == "get":
+        if not batch.get(args.id, as_json=args.json):
+            print(f"pyiptv: no channel with id {args.id}", file=sys.stderr)
+            return 1
+        return 0
+    batch.export(channel_types, output_format=args.format)
+    return 0
+
+
+def run_interactive() -> None:
+    from pyiptv.dao.programme_storage.sqlite import ProgrammeStorageSQLite
+    from pyiptv.metrics import MetricsExporter
+    from pyiptv.players.vlc import VLCPlayer, VLCRemotePlayer
+    from pyiptv.services.cli import CLIService
+    from pyiptv.services.guide import GuideSyncService
+    from pyiptv.services.stream_health import StreamHealthService
+
+    providers = xtreme_providers()
+    storage, catalog_sync = build_catalog(providers, m3u_providers())
+
+    guide_location = epg_location(providers)
+    guide_sync = None
+    if guide_location:
+        from pyiptv.dao.channel_retreival.xmltv import XMLTVGuideSource
+
+        guide_sync = GuideSyncService(
+            programme_storage=ProgrammeStorageSQLite(
+                catalog_db_path(guide_location, suffix=".epg.db")
+            ),
+            guide_source=XMLTVGuideSource(guide_location),
+            ttl=cache_ttl(),
+        )
+
+    stream_health = None
+    if probe_streams():
+        from pyiptv.dao.channel_retreival.probe import StreamProber
+
+        stream_health = StreamHealthService(
+            channel_storage=storage, prober=StreamProber(max_workers=probe_workers())
         )
 
+    vlc_player = VLCRemotePlayer() if player_mode() == "warm" else VLCPlayer()
+
+    cli_service = CLIService(
+        channel_storage=storage,
+        catalog_sync=catalog_sync,
+        player=vlc_player,
+        guide_sync=guide_sync,
+        stream_health=stream_health,
+        hide_dead=hide_dead_streams(),
+    )
+
+    metrics_path = metrics_file()
+    exporter = (
+        MetricsExporter(metrics_path, interval=metrics_interval())
+        if metrics_path
+        else None
+    )
+    if exporter is not None:
+        exporter.start()
+    try:
         cli_service.run()
+    finally:
+        if exporter is not None:
+            exporter.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from dotenv import load_dotenv
+
+    args = parse_args(argv)
+    load_dotenv()
+    log_format = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    if args.command is None:
+        logging.basicConfig(
+            filename="pyiptv.log", filemode="w", level=log_level(), format=log_format
+        )
+        run_interactive()
+        return
+    # Commands keep stdout for their results and pyiptv.log for the UI.
+    logging.basicConfig(
+        stream=sys.stderr, level=log_level("WARNING"), format=log_format
+    )
+    sys.exit(run_command(args))
 
 
 if __name__ == "__main__":
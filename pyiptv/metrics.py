@@ -0,0 +1,230 @@
+import bisect
+import contextlib
+import dataclasses
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A metric name and its labels, sorted by label name.
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Upper bounds, in seconds, of the latency histogram buckets of every timer.
+BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    math.inf,
+)
+
+
+@dataclasses.dataclass(slots=True)
+class TimerStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    buckets: List[int] = dataclasses.field(default_factory=lambda: [0] * len(BUCKETS))
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for the last)."""
+        rank: float = q * self.count
+        seen: int = 0
+        for bound, in_bucket in zip(BUCKETS, self.buckets):
+            seen += in_bucket
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """Counters and latency timers of the hot paths, cheap enough to leave on.
+
+    Recording is a dict update under a lock, so it is safe from any thread.
+    Metrics are keyed by name and labels (e.g. ``engine="ngram"``); read
+    them with ``snapshot`` (JSON-ready) or ``prometheus`` (text exposition).
+    """
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._timers: Dict[MetricKey, TimerStats] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key: MetricKey = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key: MetricKey = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            stats: Optional[TimerStats] = self._timers.get(key)
+            if stats is None:
+                stats = self._timers[key] = TimerStats()
+            stats.add(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Time the block, also when it raises."""
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def _copy(self) -> Tuple[Dict[MetricKey, float], Dict[MetricKey, TimerStats]]:
+        with self._lock:
+            return dict(self._counters), {
+                key: dataclasses.replace(stats, buckets=list(stats.buckets))
+                for key, stats in self._timers.items()
+            }
+
+    def snapshot(self) -> Dict:
+        counters, timers = self._copy()
+        return {
+            "time": time.time(),
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            "timers": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": stats.count,
+                    "sum_s": round(stats.total, 6),
+                    "max_ms": round(stats.max * 1000, 3),
+                    "mean_ms": round(stats.total / stats.count * 1000, 3),
+                    "p50_ms": round(stats.quantile(0.50) * 1000, 3),
+                    "p95_ms": round(stats.quantile(0.95) * 1000, 3),
+                    "p99_ms": round(stats.quantile(0.99) * 1000, 3),
+                }
+                for (name, labels), stats in sorted(timers.items())
+            ],
+        }
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text format, timers as histograms."""
+        counters, timers = self._copy()
+        lines: List[str] = []
+        typed: Set[str] = set()
+        for (name, labels), value in sorted(counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE pyiptv_{name} counter")
+            lines.append(f"pyiptv_{name}{_labels(labels)} {value:g}")
+        for (name, labels), stats in sorted(timers.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE pyiptv_{name} histogram")
+            cumulative: int = 0
+            for bound, in_bucket in zip(BUCKETS, stats.buckets):
+                cumulative += in_bucket
+                le: str = "+Inf" if bound == math.inf else f"{bound:g}"
+                lines.append(
+                    f"pyiptv_{name}_bucket{_labels(labels + (('le', le),))} {cumulative}"
+                )
+            lines.append(f"pyiptv_{name}_sum{_labels(labels)} {stats.total:.6f}")
+            lines.append(f"pyiptv_{name}_count{_labels(labels)} {stats.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Where the application records its metrics.
+metrics: Metrics = Metrics()
+
+
+class MetricsExporter:
+    """Writes the metrics to a file every interval seconds, and once more on stop.
+
+    A path ending in ``.prom`` gets the Prometheus text format (for the node
+    exporter's textfile collector), any other path a JSON snapshot. Files
+    are replaced atomically, so readers never see a partial write.
+    """
+
+    def __init__(
+        self, path: str, interval: float = 15.0, registry: Metrics = metrics
+    ) -> None:
+        self.path: str = path
+        self.interval: float = interval
+        self.registry: Metrics = registry
+        self._stopped: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-export", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+
+    def write(self) -> None:
+        text: str = (
+            self.registry.prometheus()
+            if self.path.endswith(".prom")
+            else json.dumps(self.registry.snapshot(), indent=2)
+        )
+        tmp_path: str = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to write metrics to {self.path}: {e}")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+
+def counted_bytes(
+    chunks: Iterable[bytes], name: str = "retrieval_bytes_total", **labels: str
+) -> Iterator[bytes]:
+    """Pass chunks through, adding their size to a counter."""
+    for chunk in chunks:
+        metrics.increment(name, len(chunk), **labels)
+        yield chunk
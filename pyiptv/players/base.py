@@ -5,3 +5,9 @@ class BasePlayer(ABC):
     @abstractmethod
     def play(self, url: str):
         pass
+
+    def start(self) -> None:
+        """Get ready to play, e.g. start a player process ahead of time."""
+
+    def stop(self) -> None:
+        """Stop playback and release the player."""
@@ -1,64 +1,259 @@
 import logging
 import os
-import signal
+import shutil
+import socket
 import subprocess
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
 
+from pyiptv.metrics import metrics
 from pyiptv.players.base import BasePlayer
 
 logger = logging.getLogger(__name__)
 
+# Seconds a VLC process gets to exit before it is killed.
+TERMINATE_TIMEOUT = 2.0
+
+
+def _terminate(process: subprocess.Popen) -> None:
+    """End process, politely first, and reap it."""
+    try:
+        process.terminate()
+        process.wait(timeout=TERMINATE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    except Exception as e:
+        logger.debug(f"Error stopping VLC process {process.pid}: {e}")
+
+
+def _terminate_in_background(process: subprocess.Popen) -> None:
+    threading.Thread(
+        target=_terminate, args=(process,), name="vlc-teardown", daemon=True
+    ).start()
+
 
 class VLCPlayer(BasePlayer):
+    """Plays each URL in a new VLC process, replacing the previous one.
+
+    The previous process is ended on a background thread, so switching
+    never waits for it to exit.
+    """
+
     def __init__(self, vlc_path: str = "/usr/bin/cvlc") -> None:
         self.vlc_path = vlc_path
         self.current_process = None
 
     def play(self, url: str) -> None:
+        start: float = time.perf_counter()
+        if self.current_process:
+            _terminate_in_background(self.current_process)
+            self.current_process = None
         try:
-            # Kill previous VLC process if it exists
-            if self.current_process:
-                try:
-                    os.kill(self.current_process.pid, signal.SIGTERM)
-                    self.current_process.wait(
-                        timeout=2
-                    )  # Wait for process to terminate
-                except (ProcessLookupError, subprocess.TimeoutExpired):
-                    # Process already dead or not responding, try force kill
-                    try:
-                        os.kill(self.current_process.pid, signal.SIGKILL)
-                    except ProcessLookupError:
-                        pass  # Process already terminated
-                except Exception as e:
-                    logger.debug(f"Error killing previous process: {e}")
-
-            # Start new VLC process and capture it
             self.current_process = subprocess.Popen(
                 [self.vlc_path, url],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-
         except Exception as e:
             logger.error(f"Failed to play URL {url} with VLC: {e}")
-            # Reset current_process if there was an error
-            self.current_process = None
+            return
+        elapsed: float = time.perf_counter() - start
+        metrics.observe("player_switch_seconds", elapsed, mode="spawn")
+        logger.info(f"Switched channel by spawning VLC in {elapsed * 1000:.1f} ms")
 
     def stop(self) -> None:
         """Stop the current playback"""
         if self.current_process:
-            try:
-                os.kill(self.current_process.pid, signal.SIGTERM)
-                self.current_process.wait(timeout=2)
-            except (ProcessLookupError, subprocess.TimeoutExpired):
-                try:
-                    os.kill(self.current_process.pid, signal.SIGKILL)
-                except ProcessLookupError:
-                    pass  # Process already terminated
-            except Exception as e:
-                logger.debug(f"Error stopping process: {e}")
-            finally:
-                self.current_process = None
+            _terminate(self.current_process)
+            self.current_process = None
 
     def __del__(self):
         """Clean up when object is destroyed"""
         self.stop()
+
+
+class VLCRemotePlayer(BasePlayer):
+    """Keeps one VLC process running and switches channels through its RC
+    (remote control) interface, so a switch is a command, not a new process.
+
+    VLC is started by ``start`` (or the first ``play``) on a worker thread,
+    which also sends every command, so ``play`` never blocks its caller; a
+    switch requested while another is under way replaces it. The interface
+    listens on a Unix socket in a private directory, so other users cannot
+    drive it. The time from ``play`` until VLC reports playing is logged.
+    If VLC or its RC interface cannot be started, each channel is played in
+    a new process instead, like VLCPlayer.
+    """
+
+    def __init__(
+        self,
+        vlc_path: str = "/usr/bin/cvlc",
+        startup_timeout: float = 5.0,
+        playing_timeout: float = 15.0,
+    ) -> None:
+        self.vlc_path: str = vlc_path
+        self.startup_timeout: float = startup_timeout
+        self.playing_timeout: float = playing_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.fallback: Optional[VLCPlayer] = None
+        self._socket: Optional[socket.socket] = None
+        self._socket_dir: Optional[str] = None
+        # Held for each exchange over the socket and while closing it.
+        self._socket_lock: threading.RLock = threading.RLock()
+        self._wakeup: threading.Condition = threading.Condition()
+        self._pending: Optional[Tuple[str, float]] = None
+        self._started: bool = False
+        self._stopping: bool = False
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._wakeup:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="vlc-remote", daemon=True
+                )
+                self._worker.start()
+
+    def play(self, url: str) -> None:
+        # The RC interface reads one command per line.
+        if "\n" in url or "\r" in url:
+            logger.error(f"Refusing to play URL with a line break: {url!r}")
+            return
+        self.start()
+        with self._wakeup:
+            self._pending = (url, time.perf_counter())
+            self._wakeup.notify()
+
+    def stop(self) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._worker is not None:
+            self._worker.join(self.startup_timeout + TERMINATE_TIMEOUT)
+        # If the join timed out, this waits for the worker's exchange to end.
+        with self._socket_lock:
+            if self.process is not None:
+                try:
+                    self._command("quit", expect_reply=False)
+                    self.process.wait(timeout=TERMINATE_TIMEOUT)
+                except (OSError, subprocess.TimeoutExpired):
+                    _terminate(self.process)
+                self.process = None
+            self._close_socket()
+        if self.fallback is not None:
+            self.fallback.stop()
+
+    def _run(self) -> None:
+        self._started = self._launch()
+        while True:
+            with self._wakeup:
+                while self._pending is None and not self._stopping:
+                    self._wakeup.wait()
+                if self._stopping:
+                    return
+                url, requested_at = self._pending
+                self._pending = None
+            if not self._started:
+                if self.fallback is None:
+                    self.fallback = VLCPlayer(self.vlc_path)
+                self.fallback.play(url)
+                continue
+            try:
+                self._switch(url, requested_at)
+            except OSError as e:
+                with self._wakeup:
+                    if self._stopping:
+                        return
+                logger.error(f"Lost VLC remote control, restarting VLC: {e}")
+                self._shutdown_process()
+                self._started = self._launch()
+                with self._wakeup:
+                    if self._pending is None:
+                        self._pending = (url, requested_at)
+
+    def _launch(self) -> bool:
+        self._socket_dir = tempfile.mkdtemp(prefix="pyiptv-vlc-")
+        path: str = os.path.join(self._socket_dir, "rc.sock")
+        try:
+            self.process = subprocess.Popen(
+                [self.vlc_path, "-I", "rc", "--rc-unix", path],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.error(f"Failed to start VLC with remote control: {e}")
+            self._close_socket()
+            return False
+        deadline: float = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline and self.process.poll() is None:
+            try:
+                with self._socket_lock:
+                    self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self._socket.settimeout(self.startup_timeout)
+                    self._socket.connect(path)
+                    self._read_reply()
+                logger.info(f"VLC {self.process.pid} is ready for remote control")
+                return True
+            except OSError:
+                self._close_socket(keep_dir=True)
+                time.sleep(0.05)
+        logger.error("VLC remote control did not come up, spawning VLC per channel")
+        self._shutdown_process()
+        return False
+
+    def _switch(self, url: str, requested_at: float) -> None:
+        self._command("stop")
+        self._command("clear")
+        self._command(f"add {url}")
+        command_ms: float = (time.perf_counter() - requested_at) * 1000
+        deadline: float = time.monotonic() + self.playing_timeout
+        while time.monotonic() < deadline:
+            if self._command("is_playing").strip().endswith("1"):
+                elapsed: float = time.perf_counter() - requested_at
+                metrics.observe("player_switch_seconds", elapsed, mode="warm")
+                logger.info(
+                    f"Switched channel in {elapsed * 1000:.1f} ms "
+                    f"(command sent after {command_ms:.1f} ms)"
+                )
+                return
+            with self._wakeup:
+                if self._pending is not None or self._stopping:
+                    return
+                self._wakeup.wait(0.05)
+        logger.warning(f"VLC not playing {self.playing_timeout:.0f} s after switch")
+
+    def _command(self, command: str, expect_reply: bool = True) -> str:
+        with self._socket_lock:
+            if self._socket is None:
+                raise OSError("VLC remote control is not connected")
+            self._socket.sendall(command.encode("utf-8") + b"\n")
+            return self._read_reply() if expect_reply else ""
+
+    def _read_reply(self) -> str:
+        # Every reply ends with the "> " prompt.
+        reply: bytes = b""
+        while not reply.endswith(b"> "):
+            chunk: bytes = self._socket.recv(4096)
+            if not chunk:
+                raise OSError("VLC closed the remote control connection")
+            reply += chunk
+        return reply[:-2].decode("utf-8", "replace")
+
+    def _shutdown_process(self) -> None:
+        self._close_socket()
+        if self.process is not None:
+            _terminate_in_background(self.process)
+            self.process = None
+
+    def _close_socket(self, keep_dir: bool = False) -> None:
+        with self._socket_lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+        if not keep_dir and self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            self._socket_dir = None
@@ -0,0 +1,147 @@
+import json
+import logging
+import sys
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services.sync import CatalogSyncService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("jsonl", "m3u")
+
+# Channels read from storage per batch when exporting.
+EXPORT_BATCH = 1000
+
+
+def channel_record(channel: ChannelEntity) -> Dict[str, str]:
+    return {
+        "id": channel.id,
+        "name": channel.name,
+        "type": channel.type.value,
+        "url": channel.playable_url,
+        "provider": channel.provider,
+    }
+
+
+class BatchService:
+    """Scriptable commands over the stored catalog, for use outside the UI.
+
+    Only ``sync`` reaches the provider; the others read the catalog as last
+    synced and write one line per channel to ``output``: JSON objects with
+    ``as_json``, tab-separated fields otherwise.
+    """
+
+    def __init__(
+        self,
+        channel_storage: BaseChannelStorage,
+        catalog_sync: CatalogSyncService,
+        output: TextIO = sys.stdout,
+    ) -> None:
+        self.channel_storage: BaseChannelStorage = channel_storage
+        self.catalog_sync: CatalogSyncService = catalog_sync
+        self.output: TextIO = output
+
+    def sync(self, channel_types: Iterable[ChannelType], force: bool = False) -> bool:
+        channel_types = list(channel_types)
+        ok: bool = self.catalog_sync.sync(channel_types, force=force)
+        for channel_type in channel_types:
+            last_sync: Optional[float] = self.channel_storage.get_last_sync(
+                channel_type
+            )
+            self._write_json(
+                {
+                    "type": channel_type.value,
+                    "synced_at": last_sync,
+                    "fresh": self.catalog_sync.is_fresh(channel_type),
+                }
+            )
+        return ok
+
+    def search(
+        self,
+        query: str,
+        channel_types: Iterable[ChannelType],
+        limit: Optional[int] = None,
+        fuzzy: bool = False,
+        as_json: bool = False,
+    ) -> int:
+        """Write the channels matching query, best first; returns how many."""
+        channel_types = list(channel_types)
+        self._warn_if_never_synced(channel_types)
+        results: List[ChannelEntity] = (
+            self.channel_storage.search_fuzzy(query, channel_types, limit=limit)
+            if fuzzy
+            else self.channel_storage.search(query, channel_types, limit=limit)
+        )
+        for channel in results:
+            self._write_channel(channel, as_json)
+        return len(results)
+
+    def get(self, channel_id: str, as_json: bool = False) -> bool:
+        """Write the channel's URL (its record with as_json), if it is stored."""
+        channel: Optional[ChannelEntity] = self.channel_storage.get_channel(channel_id)
+        if channel is None:
+            return False
+        if as_json:
+            self._write_json(channel_record(channel))
+        else:
+            self.output.write(f"{channel.playable_url}\n")
+        return True
+
+    def export(
+        self, channel_types: Iterable[ChannelType], output_format: str = "jsonl"
+    ) -> int:
+        """Write every stored channel of the types; returns how many."""
+        channel_types = list(channel_types)
+        self._warn_if_never_synced(channel_types)
+        if output_format == "m3u":
+            self.output.write("#EXTM3U\n")
+        written: int = 0
+        for channel_type in channel_types:
+            for batch in self.channel_storage.iter_channels(
+                channel_type, batch_size=EXPORT_BATCH
+            ):
+                for channel in batch:
+                    if output_format == "m3u":
+                        # Series are containers without a stream of their own.
+                        if not channel.playable_url:
+                            continue
+                        self.output.write(_m3u_entry(channel))
+                    else:
+                        self._write_json(channel_record(channel))
+                    written += 1
+        return written
+
+    def _write_channel(self, channel: ChannelEntity, as_json: bool) -> None:
+        if as_json:
+            self._write_json(channel_record(channel))
+        else:
+            self.output.write(
+                f"{channel.id}\t{channel.type.value}\t{channel.name}\t"
+                f"{channel.playable_url}\n"
+            )
+
+    def _write_json(self, record: Dict) -> None:
+        self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _warn_if_never_synced(self, channel_types: List[ChannelType]) -> None:
+        never: List[str] = [
+            t.value
+            for t in channel_types
+            if self.channel_storage.get_last_sync(t) is None
+        ]
+        if never:
+            logger.warning(
+                f"No {', '.join(never)} catalog stored yet; run `pyiptv sync` first"
+            )
+
+
+def _m3u_entry(channel: ChannelEntity) -> str:
+    name: str = channel.name.replace("\n", " ")
+    return (
+        f'#EXTINF:-1 tvg-id="{channel.id}" group-title="{channel.type.value}",'
+        f"{name}\n{channel.playable_url}\n"
+    )
@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Any, List
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from prompt_toolkit import Application
 from prompt_toolkit.key_binding import KeyBindings
@@ -11,41 +13,66 @@ from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.styles import Style
 from prompt_toolkit.widgets import TextArea
 
-from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval
 from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dao.channel_storage.cursor import GroupedResults, SearchResultCursor
 from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
 from pyiptv.enum.channel_type import ChannelType
 from pyiptv.players.base import BasePlayer
+from pyiptv.services.guide import GuideSyncService
+from pyiptv.services.search_scheduler import SearchScheduler
+from pyiptv.services.stream_health import StreamHealthService
+from pyiptv.services.sync import CATALOG_TYPES, CatalogSyncService
 
 logger = logging.getLogger(__name__)
 
+HELP_TEXT = (
+    "Up/Down to navigate  |  ENTER to play  |  Tab for another source  |  "
+    "Ctrl+C to quit"
+)
+
 
 class CLIService:
     def __init__(
         self,
         channel_storage: BaseChannelStorage,
-        channel_retreival: BaseChannelRetrieval,
+        catalog_sync: CatalogSyncService,
         player: BasePlayer,
+        guide_sync: Optional[GuideSyncService] = None,
+        stream_health: Optional[StreamHealthService] = None,
+        hide_dead: bool = False,
     ) -> None:
         self.channel_storage: BaseChannelStorage = channel_storage
-        self.channel_retreival: BaseChannelRetrieval = channel_retreival
+        self.catalog_sync: CatalogSyncService = catalog_sync
         self.player: BasePlayer = player
+        self.guide_sync: Optional[GuideSyncService] = guide_sync
+        self.stream_health: Optional[StreamHealthService] = stream_health
+        self.hide_dead: bool = hide_dead
 
-        self.current_matches: List[ChannelEntity] = []
+        self.current_matches: Sequence[ChannelEntity] = []
+        self.showing_close_matches: bool = False
         self.selected_index: int = 0
         self.view_start_index: int = 0
         self.max_visible_rows: int = 30
         self.last_query: str = ""
-
-        for channel_list in self.channel_retreival.retreive_channels_by_type(
-            ChannelType.LIVE, page_size=10000
-        ):
-            self.channel_storage.save_channel_bulk(channel_list)
-
-        for channel_list in self.channel_retreival.retreive_channels_by_type(
-            ChannelType.VOD, page_size=10000
-        ):
-            self.channel_storage.save_channel_bulk(channel_list)
+        self.sync_status: str = ""
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sync_thread: Optional[threading.Thread] = None
+        self.guide_thread: Optional[threading.Thread] = None
+        self.probe_thread: Optional[threading.Thread] = None
+        # Latest rows to probe and the results they belong to; a newer request
+        # replaces one the probe worker has not taken yet.
+        self.probe_request: Optional[Tuple[GroupedResults, List[ChannelEntity]]] = None
+        self.probe_wakeup: threading.Condition = threading.Condition()
+        self.last_probed: Set[ChannelEntity] = set()
+        self.expanded_series: Optional[ChannelEntity] = None
+        self.search_scheduler: SearchScheduler[Tuple[Sequence[ChannelEntity], bool]] = (
+            SearchScheduler(
+                search=self._search_all,
+                on_result=lambda query, result: self.show_results(query, *result),
+                on_error=lambda query: self.show_results(query, []),
+            )
+        )
 
         self.output_field: TextArea = TextArea(
             style="class:output",
@@ -55,7 +82,7 @@ class CLIService:
         )
 
         self.help_bar: TextArea = TextArea(
-            text="Up/Down to navigate  |  ENTER to play  |  Ctrl+C to quit",
+            text=HELP_TEXT,
             style="class:help",
             height=1,
             focusable=False,
@@ -85,6 +112,8 @@ class CLIService:
         self.kb.add("up")(self.move_up)
         self.kb.add("down")(self.move_down)
         self.kb.add("enter")(self.play_selected)
+        self.kb.add("escape")(self.collapse_series)
+        self.kb.add("tab")(self.switch_source)
 
         self.application: Application[Any] = Application(
             layout=Layout(self.container),
@@ -104,39 +133,115 @@ class CLIService:
         event.app.exit()
 
     def on_text_change(self, _: Any) -> None:
-        asyncio.get_event_loop().call_soon(self.update_output)
+        self.expanded_series = None
+        self.update_output()
 
     def move_up(self, event: KeyPressEvent) -> None:
         if self.selected_index > 0:
             self.selected_index -= 1
             if self.selected_index < self.view_start_index:
                 self.view_start_index = self.selected_index
-            self.update_output()
+            self.render_output()
 
     def move_down(self, event: KeyPressEvent) -> None:
         if self.selected_index + 1 < len(self.current_matches):
             self.selected_index += 1
             if self.selected_index >= self.view_start_index + self.max_visible_rows:
                 self.view_start_index = self.selected_index - self.max_visible_rows + 1
-            self.update_output()
+            self.render_output()
 
     def play_selected(self, event: KeyPressEvent) -> None:
         if 0 <= self.selected_index < len(self.current_matches):
             selected_channel: ChannelEntity = self.current_matches[self.selected_index]
+            if not selected_channel.playable_url:
+                if selected_channel.type == ChannelType.SERIES:
+                    self.expand_series(selected_channel)
+                return
             logger.info(f"Playing channel: {selected_channel.name}")
             self.player.play(selected_channel.playable_url)
 
-    def _search_all(self, query: str) -> List[ChannelEntity]:
-        results: List[ChannelEntity] = []
-        for channel_type in [ChannelType.LIVE, ChannelType.VOD]:
-            results.extend(
-                self.channel_storage.search_by_name_and_type(query, channel_type)
+    def switch_source(self, event: KeyPressEvent) -> None:
+        """Show the selected channel's next alternate (another provider) instead."""
+        matches: Sequence[ChannelEntity] = self.current_matches
+        if not isinstance(matches, GroupedResults):
+            return
+        if 0 <= self.selected_index < len(matches) and matches.alternates(
+            self.selected_index
+        ):
+            matches.next_alternate(self.selected_index)
+            self.render_output()
+
+    def expand_series(self, series: ChannelEntity) -> None:
+        """List the episodes of a series, fetching them off the event loop."""
+        self.help_bar.text = f"Loading episodes of {series.name}..."
+        future = asyncio.get_event_loop().run_in_executor(
+            None, self.catalog_sync.series_episodes, series.id
+        )
+
+        def show(done: "asyncio.Future[List[ChannelEntity]]") -> None:
+            self.help_bar.text = HELP_TEXT
+            try:
+                episodes = done.result()
+            except Exception:
+                logger.exception(f"Failed to load episodes of series {series.id}")
+                self.help_bar.text = f"{HELP_TEXT}  |  Could not load episodes"
+                return
+            self.expanded_series = series
+            self.current_matches = episodes
+            self.selected_index = 0
+            self.view_start_index = 0
+            self.render_output()
+            self.application.invalidate()
+
+        future.add_done_callback(show)
+
+    def collapse_series(self, event: KeyPressEvent) -> None:
+        if self.expanded_series is not None:
+            self.expanded_series = None
+            self.last_query = ""
+            self.update_output()
+
+    def _search_all(
+        self, query: str, is_cancelled: Callable[[], bool]
+    ) -> Tuple[Sequence[ChannelEntity], bool]:
+        """Run on the search worker: count and fetch the first visible page.
+
+        Channels of the same name are shown once, with the others as its
+        alternates. Without any match, falls back to channels with similar
+        names (a typo in the query) and says so with the second element.
+        """
+        with self.channel_storage.cancellable(is_cancelled):
+            matches = SearchResultCursor(
+                self.channel_storage,
+                query,
+                CATALOG_TYPES,
+                page_size=self.max_visible_rows,
+                prefetch=self.max_visible_rows,
             )
-        return results
+            if len(matches):
+                grouped = GroupedResults(
+                    matches, chunk_size=self.max_visible_rows, hide_dead=self.hide_dead
+                )
+                grouped[0 : self.max_visible_rows]
+                close = False
+            else:
+                grouped = GroupedResults(
+                    self.channel_storage.search_fuzzy(query, CATALOG_TYPES),
+                    hide_dead=self.hide_dead,
+                )
+                close = True
+            if self.stream_health is not None:
+                grouped.apply_health(self.stream_health.cached(grouped.loaded))
+            return grouped, close
 
     def update_output(self) -> None:
+        if self.expanded_series is not None:
+            self.render_output()
+            return
+
         query: str = self.input_field.text.strip()
         if not query:
+            self.search_scheduler.cancel()
             self.output_field.text = ""
             self.current_matches = []
             self.selected_index = 0
@@ -144,17 +249,23 @@ class CLIService:
             self.last_query = ""
             return
 
-        try:
-            self.current_matches: List[ChannelEntity] = self._search_all(query)
-        except Exception:
-            logger.exception("Search failed")
-            self.current_matches = []
+        self.search_scheduler.submit(query)
+
+    def show_results(
+        self, query: str, matches: Sequence[ChannelEntity], close: bool = False
+    ) -> None:
+        self.current_matches = matches
+        self.showing_close_matches = close
 
         if query != self.last_query:
             self.selected_index = 0
             self.view_start_index = 0
             self.last_query = query
 
+        self.render_output()
+        self.application.invalidate()
+
+    def render_output(self) -> None:
         self.selected_index = max(
             0, min(self.selected_index, len(self.current_matches) - 1)
         )
@@ -164,20 +275,164 @@ class CLIService:
         elif self.selected_index >= self.view_start_index + self.max_visible_rows:
             self.view_start_index = self.selected_index - self.max_visible_rows + 1
 
-        lines: List[str] = [f"{'':<3}{'ID':<8} | Name", f"{'':<3}{'-' * 30}"]
+        found: str = (
+            "close matches"
+            if self.showing_close_matches and self.expanded_series is None
+            else "results"
+        )
+        lines: List[str] = [
+            f"{'':<3}{'ID':<8} | Name  ({len(self.current_matches)} {found})",
+            f"{'':<3}{'-' * 30}",
+        ]
+        if self.expanded_series is not None:
+            lines.insert(0, f"{self.expanded_series.name}  (Esc to go back)")
 
         visible_items = self.current_matches[
             self.view_start_index : self.view_start_index + self.max_visible_rows
         ]
 
+        grouped: bool = isinstance(self.current_matches, GroupedResults)
+        guide: List[str] = self._guide_texts(visible_items)
         for i, ch in enumerate(visible_items):
             actual_index = self.view_start_index + i
             prefix = ">>" if actual_index == self.selected_index else "  "
-            lines.append(f"{prefix} {ch.id:<8} | {ch.name}")
+            suffix = " [series]" if not ch.playable_url else ""
+            if grouped:
+                health: Optional[StreamHealth] = self.current_matches.health(ch)
+                if health is not None and not health.alive:
+                    suffix += " [dead]"
+                alternates = len(self.current_matches.alternates(actual_index))
+                if alternates:
+                    suffix += f" [+{alternates} sources]"
+            lines.append(f"{prefix} {ch.id:<8} | {ch.name}{suffix}{guide[i]}")
 
         self.output_field.text = "\n".join(lines)
+        if grouped:
+            self._request_probe(self.current_matches, len(visible_items))
+
+    def _request_probe(self, matches: GroupedResults, visible: int) -> None:
+        """Have the probe worker check the visible rows and their alternates."""
+        if self.stream_health is None:
+            return
+        channels: List[ChannelEntity] = []
+        for index in range(self.view_start_index, self.view_start_index + visible):
+            channels.append(matches[index])
+            channels.extend(matches.alternates(index))
+        if self.last_probed.issuperset(channels):
+            return
+        self.last_probed = set(channels)
+        with self.probe_wakeup:
+            self.probe_request = (matches, channels)
+            self.probe_wakeup.notify()
+        if self.probe_thread is None:
+            self.probe_thread = threading.Thread(
+                target=self._probe_worker, name="stream-probe", daemon=True
+            )
+            self.probe_thread.start()
+
+    def _probe_worker(self) -> None:
+        while True:
+            with self.probe_wakeup:
+                while self.probe_request is None:
+                    self.probe_wakeup.wait()
+                matches, channels = self.probe_request
+                self.probe_request = None
+            try:
+                health: Dict[ChannelEntity, StreamHealth] = self.stream_health.check(
+                    channels
+                )
+            except Exception:
+                logger.exception("Stream health check failed")
+                continue
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self._show_health, matches, health)
+
+    def _show_health(
+        self, matches: GroupedResults, health: Dict[ChannelEntity, StreamHealth]
+    ) -> None:
+        if matches is not self.current_matches:
+            return
+        matches.apply_health(health)
+        self.render_output()
+        self.application.invalidate()
+
+    def _guide_texts(self, channels: Sequence[ChannelEntity]) -> List[str]:
+        """Now and next programme of each live channel, in one guide lookup."""
+        texts: List[str] = [""] * len(channels)
+        if self.guide_sync is None:
+            return texts
+        live: List[int] = [
+            i for i, ch in enumerate(channels) if ch.type == ChannelType.LIVE
+        ]
+        try:
+            now_next = self.guide_sync.programme_storage.now_next(
+                [channels[i] for i in live]
+            )
+        except Exception:
+            logger.exception("Programme guide lookup failed")
+            return texts
+        for i, (current, upcoming) in zip(live, now_next):
+            if current is not None:
+                texts[i] += f"  | Now: {current.title}"
+            if upcoming is not None:
+                start = time.strftime("%H:%M", time.localtime(upcoming.start))
+                texts[i] += f"  | {start} {upcoming.title}"
+        return texts
+
+    def start_background_sync(self) -> None:
+        """Ingest the catalog on a worker thread while the UI is already usable."""
+        self.loop = asyncio.get_event_loop()
+        self.player.start()
+        self.sync_thread = threading.Thread(
+            target=self._sync_worker, name="catalog-sync", daemon=True
+        )
+        self.sync_thread.start()
+        if self.guide_sync is not None:
+            self.guide_thread = threading.Thread(
+                target=self._guide_worker, name="guide-sync", daemon=True
+            )
+            self.guide_thread.start()
+
+    def _guide_worker(self) -> None:
+        try:
+            self.guide_sync.sync()
+        except Exception:
+            logger.exception("Background programme guide sync failed")
+        self._schedule_refresh()
+
+    def _sync_worker(self) -> None:
+        try:
+            ok = self.catalog_sync.sync(
+                CATALOG_TYPES,
+                on_progress=self._on_sync_progress,
+            )
+            self.sync_status = "" if ok else "Catalog refresh failed, showing cache"
+        except Exception:
+            logger.exception("Background catalog sync failed")
+            self.sync_status = "Catalog refresh failed, showing cache"
+        self._schedule_refresh()
+
+    def _on_sync_progress(self, channel_type: ChannelType, seen: int) -> None:
+        self.sync_status = f"Loading {channel_type.value}: {seen} channels"
+        self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._refresh_after_sync)
+
+    def _refresh_after_sync(self) -> None:
+        self.help_bar.text = (
+            f"{HELP_TEXT}  |  {self.sync_status}" if self.sync_status else HELP_TEXT
+        )
+        if self.input_field.text.strip():
+            self.update_output()
+        self.application.invalidate()
 
     def run(self) -> None:
         logger.info("Starting interactive CLI UI")
-        with patch_stdout():
-            self.application.run()
+        try:
+            with patch_stdout():
+                self.application.run(pre_run=self.start_background_sync)
+        finally:
+            self.search_scheduler.shutdown()
+            self.player.stop()
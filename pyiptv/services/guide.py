@@ -0,0 +1,39 @@
+import logging
+import time
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+from pyiptv.dao.channel_retreival.xmltv import XMLTVGuideSource
+from pyiptv.dao.programme_storage.base import BaseProgrammeStorage
+
+logger = logging.getLogger(__name__)
+
+
+class GuideSyncService:
+    def __init__(
+        self,
+        programme_storage: BaseProgrammeStorage,
+        guide_source: XMLTVGuideSource,
+        ttl: float,
+    ) -> None:
+        self.programme_storage: BaseProgrammeStorage = programme_storage
+        self.guide_source: XMLTVGuideSource = guide_source
+        self.ttl: float = ttl
+
+    def is_fresh(self) -> bool:
+        last_update = self.programme_storage.get_last_update()
+        return last_update is not None and time.time() - last_update < self.ttl
+
+    def sync(self, force: bool = False) -> bool:
+        """Refresh a stale guide, returning False if that failed.
+
+        A failed refresh keeps the stored guide.
+        """
+        if not force and self.is_fresh():
+            logger.info("Cached programme guide is fresh, skipping")
+            return True
+        try:
+            self.programme_storage.replace_guide(self.guide_source.retreive_guide())
+        except ChannelRetrievalError as e:
+            logger.error(f"Keeping cached programme guide: {e}")
+            return False
+        return True
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Runs the search for a query; polls the callable to abandon superseded work.
+SearchFunction = Callable[[str, Callable[[], bool]], T]
+
+
+class SearchScheduler(Generic[T]):
+    """Debounced search-as-you-type that keeps queries off the event loop.
+
+    Each submitted query supersedes the previous one. A query only starts
+    once input has been quiet for ``debounce`` seconds, runs on a single
+    worker thread, can poll whether it has been superseded to stop early,
+    and its result is only delivered if it is still the latest query.
+    Must be driven from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        search: SearchFunction[T],
+        on_result: Callable[[str, T], None],
+        on_error: Optional[Callable[[str], None]] = None,
+        debounce: float = 0.05,
+    ) -> None:
+        self.search: SearchFunction[T] = search
+        self.on_result: Callable[[str, T], None] = on_result
+        self.on_error: Optional[Callable[[str], None]] = on_error
+        self.debounce: float = debounce
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="search"
+        )
+        self._generation: int = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def submit(self, query: str) -> None:
+        generation = self._supersede()
+        self._timer = asyncio.get_event_loop().call_later(
+            self.debounce, self._start, query, generation
+        )
+
+    def cancel(self) -> None:
+        """Drop any pending or running query without delivering a result."""
+        self._supersede()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _supersede(self) -> int:
+        self._generation += 1
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return self._generation
+
+    def _is_stale(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _start(self, query: str, generation: int) -> None:
+        self._timer = None
+        future = asyncio.get_event_loop().run_in_executor(
+            self._executor, self._run, query, generation
+        )
+        future.add_done_callback(lambda done: self._finish(done, query, generation))
+
+    def _run(self, query: str, generation: int) -> T:
+        if self._is_stale(generation):
+            raise _Superseded()
+        return self.search(query, lambda: self._is_stale(generation))
+
+    def _finish(self, done: "asyncio.Future[T]", query: str, generation: int) -> None:
+        # A superseded query may have been aborted mid-way; its error is moot.
+        if self._is_stale(generation) or done.cancelled():
+            return
+        try:
+            result = done.result()
+        except Exception:
+            logger.exception(f"Search for '{query}' failed")
+            if self.on_error:
+                self.on_error(query)
+            return
+        self.on_result(query, result)
+
+
+class _Superseded(Exception):
+    pass
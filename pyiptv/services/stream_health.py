@@ -0,0 +1,66 @@
+import logging
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+
+if TYPE_CHECKING:
+    from pyiptv.dao.channel_retreival.probe import StreamProber
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_TTL_SECONDS = 30 * 60
+
+# Probe results are stored in batches of this many as they complete.
+SAVE_BATCH = 64
+
+
+class StreamHealthService:
+    def __init__(
+        self,
+        channel_storage: BaseChannelStorage,
+        prober: "StreamProber",
+        ttl: float = DEFAULT_HEALTH_TTL_SECONDS,
+    ) -> None:
+        self.channel_storage: BaseChannelStorage = channel_storage
+        self.prober: "StreamProber" = prober
+        self.ttl: float = ttl
+
+    def cached(
+        self, channels: Sequence[ChannelEntity]
+    ) -> Dict[ChannelEntity, StreamHealth]:
+        """Stored results still within the TTL, without probing anything."""
+        return self.channel_storage.get_stream_health(channels, max_age=self.ttl)
+
+    def check(
+        self,
+        channels: Sequence[ChannelEntity],
+        on_progress: Optional[Callable[[StreamHealth], None]] = None,
+    ) -> Dict[ChannelEntity, StreamHealth]:
+        """Health of the channels, probing those without a fresh stored result.
+
+        New results are stored as they come in, so an interrupted check keeps
+        what it found. on_progress is called with each new result.
+        """
+        health: Dict[ChannelEntity, StreamHealth] = self.cached(channels)
+        by_key: Dict[tuple, ChannelEntity] = {
+            (ch.type, ch.id): ch for ch in channels if ch not in health
+        }
+        if not by_key:
+            return health
+        logger.info(f"Probing {len(by_key)} streams")
+        unsaved: List[StreamHealth] = []
+        try:
+            for result in self.prober.probe_all(by_key.values()):
+                health[by_key[(result.channel_type, result.channel_id)]] = result
+                unsaved.append(result)
+                if len(unsaved) >= SAVE_BATCH:
+                    self.channel_storage.save_stream_health(unsaved)
+                    unsaved = []
+                if on_progress is not None:
+                    on_progress(result)
+        finally:
+            if unsaved:
+                self.channel_storage.save_stream_health(unsaved)
+        return health
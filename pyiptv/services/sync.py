@@ -0,0 +1,156 @@
+import contextlib
+import logging
+import time
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional, Set
+
+from pyiptv.dao.channel_retreival.base import (
+    BaseChannelRetrieval,
+    ChannelRetrievalError,
+)
+from pyiptv.dao.channel_storage.base import BaseChannelStorage
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Called after every stored batch with the type and the rows seen so far.
+ProgressCallback = Callable[[ChannelType, int], None]
+
+# Types a catalog sync covers; movies are stored as VOD.
+CATALOG_TYPES: List[ChannelType] = [
+    ChannelType.LIVE,
+    ChannelType.VOD,
+    ChannelType.SERIES,
+]
+
+
+class CatalogSyncService:
+    def __init__(
+        self,
+        channel_storage: BaseChannelStorage,
+        channel_retreival: BaseChannelRetrieval,
+        ttl: float,
+        page_size: int = 10000,
+        bulk_first_sync: bool = False,
+    ) -> None:
+        self.channel_storage: BaseChannelStorage = channel_storage
+        self.channel_retreival: BaseChannelRetrieval = channel_retreival
+        self.ttl: float = ttl
+        self.page_size: int = page_size
+        # A first sync inside bulk_load is faster, but its rows only become
+        # searchable once it completes; only worth it when nobody is searching.
+        self.bulk_first_sync: bool = bulk_first_sync
+
+    def is_fresh(self, channel_type: ChannelType) -> bool:
+        last_sync = self.channel_storage.get_last_sync(channel_type)
+        return last_sync is not None and time.time() - last_sync < self.ttl
+
+    def sync(
+        self,
+        channel_types: Iterable[ChannelType],
+        force: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> bool:
+        """Refresh stale channel types, returning False if any of them failed.
+
+        Stale types are retrieved together, so the source may fetch them
+        concurrently. A type whose retrieval fails keeps its cached rows,
+        so a flaky provider never wipes a previously good catalog. Rows
+        become searchable page by page, unless bulk_first_sync has a first
+        sync written as one bulk load. Processes sharing the storage sync one at a
+        time; while another one holds the storage's sync lock this returns
+        at once, and searches keep reading the stored catalog.
+        """
+        channel_types = list(channel_types)
+        stale: List[ChannelType] = self._stale(channel_types, force)
+        for channel_type in channel_types:
+            if channel_type not in stale:
+                logger.info(f"Cached {channel_type.value} catalog is fresh, skipping")
+        if not stale:
+            return True
+        with self.channel_storage.sync_lock() as granted:
+            if not granted:
+                logger.info("Another process is syncing the catalog, keeping cache")
+                return True
+            # Checked again now that it is ours: the process that held the
+            # lock may just have refreshed them.
+            stale = self._stale(stale, force)
+            if not stale:
+                return True
+            first_sync: bool = self.bulk_first_sync and all(
+                self.channel_storage.get_last_sync(t) is None for t in stale
+            )
+            load: ContextManager[None] = (
+                self.channel_storage.bulk_load()
+                if first_sync
+                else contextlib.nullcontext()
+            )
+            with load:
+                failed: Set[ChannelType] = self._sync_stale(stale, on_progress)
+            return not failed
+
+    def _stale(
+        self, channel_types: Iterable[ChannelType], force: bool
+    ) -> List[ChannelType]:
+        return [t for t in channel_types if force or not self.is_fresh(t)]
+
+    def _sync_stale(
+        self,
+        stale: List[ChannelType],
+        on_progress: Optional[ProgressCallback],
+    ) -> Set[ChannelType]:
+        start = time.perf_counter()
+        seen: Dict[ChannelType, int] = {t: 0 for t in stale}
+        written: Dict[ChannelType, int] = {t: 0 for t in stale}
+        failed: Set[ChannelType] = set()
+        for channel_type in stale:
+            self.channel_storage.begin_sync(channel_type)
+        try:
+            batches = self.channel_retreival.retreive_all(
+                stale, page_size=self.page_size
+            )
+            # Time to each batch covers its download and parsing.
+            waited_from: float = time.perf_counter()
+            for channel_type, channel_list in batches:
+                metrics.observe(
+                    "retrieval_seconds",
+                    time.perf_counter() - waited_from,
+                    type=channel_type.value,
+                )
+                metrics.increment("retrieval_batches_total", type=channel_type.value)
+                metrics.increment(
+                    "retrieval_rows_total", len(channel_list), type=channel_type.value
+                )
+                seen[channel_type] += len(channel_list)
+                written[channel_type] += self.channel_storage.sync_channel_bulk(
+                    channel_list
+                )
+                if on_progress:
+                    on_progress(channel_type, seen[channel_type])
+                waited_from = time.perf_counter()
+        except ChannelRetrievalError as e:
+            failed = set(e.channel_types) or set(stale)
+            logger.error(
+                f"Keeping cached {', '.join(t.value for t in failed)} catalog: {e}"
+            )
+
+        for channel_type in stale:
+            if channel_type in failed:
+                continue
+            deleted = self.channel_storage.finish_sync(channel_type)
+            logger.info(
+                f"Synced {channel_type.value}: {seen[channel_type]} seen, "
+                f"{written[channel_type]} written, {deleted} deleted "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+        self.channel_storage.end_sync()
+        return failed
+
+    def series_episodes(self, series_id: str) -> List[ChannelEntity]:
+        """Episodes of a series, fetched on first use and then served from cache."""
+        episodes = self.channel_storage.get_series_episodes(series_id, max_age=self.ttl)
+        if episodes is None:
+            episodes = self.channel_retreival.retreive_series_episodes(series_id)
+            self.channel_storage.save_series_episodes(series_id, episodes)
+        return episodes
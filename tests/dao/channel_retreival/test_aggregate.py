@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from pyiptv.dao.channel_retreival.aggregate import AggregateChannelSource
+from pyiptv.dao.channel_retreival.base import (
+    BaseChannelRetrieval,
+    ChannelRetrievalError,
+)
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+
+class FakeSource(BaseChannelRetrieval):
+    def __init__(self, names, delay=0.0, fail=False):
+        self.names = names
+        self.delay = delay
+        self.fail = fail
+
+    def retreive_channels_by_type(self, channel_type, page_size):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ChannelRetrievalError("down")
+        yield [
+            ChannelEntity(
+                id=str(i),
+                name=name,
+                playable_url=f"http://fake/{i}.ts",
+                type=channel_type,
+            )
+            for i, name in enumerate(self.names)
+        ]
+
+    def retreive_series_episodes(self, series_id):
+        return [
+            ChannelEntity(
+                id=f"{series_id}-1",
+                name="E1",
+                playable_url="http://fake/e1.mp4",
+                type=ChannelType.SERIES,
+            )
+        ]
+
+
+class TestAggregateChannelSource(unittest.TestCase):
+    def test_ids_are_namespaced_by_provider(self):
+        source = AggregateChannelSource(
+            {"a": FakeSource(["One", "Two"]), "b": FakeSource(["One"])}
+        )
+
+        batches = list(source.retreive_all([ChannelType.LIVE], page_size=10))
+        channels = [ch for _, batch in batches for ch in batch]
+
+        self.assertCountEqual([ch.id for ch in channels], ["a:0", "a:1", "b:0"])
+        self.assertCountEqual([ch.provider for ch in channels], ["a", "a", "b"])
+        self.assertEqual(source.retreive_series_episodes("b:7")[0].id, "b:7-1")
+        with self.assertRaises(ChannelRetrievalError):
+            source.retreive_series_episodes("c:7")
+
+    def test_providers_are_fetched_in_parallel(self):
+        source = AggregateChannelSource(
+            {name: FakeSource(["One"], delay=0.2) for name in "abc"}
+        )
+
+        start = time.perf_counter()
+        batches = list(source.retreive_all([ChannelType.LIVE], page_size=10))
+        self.assertEqual(len(batches), 3)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_failing_provider_does_not_stop_others(self):
+        source = AggregateChannelSource(
+            {"a": FakeSource(["One"]), "b": FakeSource(["Two"], fail=True)}
+        )
+
+        channels = []
+        with self.assertRaises(ChannelRetrievalError) as ctx:
+            for _, batch in source.retreive_all([ChannelType.LIVE], page_size=10):
+                channels.extend(batch)
+        self.assertEqual([ch.id for ch in channels], ["a:0"])
+        self.assertEqual(ctx.exception.channel_types, [ChannelType.LIVE])
+        self.assertIn("b:", str(ctx.exception))
+
+    def test_provider_id_must_not_contain_separator(self):
+        with self.assertRaises(ValueError):
+            AggregateChannelSource({"a:b": FakeSource([])})
@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+from pyiptv.dao.channel_retreival.concurrent import merge_concurrently
+from pyiptv.enum.channel_type import ChannelType
+
+
+class TestMergeConcurrently(unittest.TestCase):
+    def test_yields_every_item(self):
+        producers = [lambda: iter(range(100)), lambda: iter(range(100, 150))]
+        self.assertEqual(
+            sorted(merge_concurrently(producers, max_pending=2)), list(range(150))
+        )
+
+    def test_producers_run_in_parallel(self):
+        def slow():
+            time.sleep(0.2)
+            yield "done"
+
+        start = time.perf_counter()
+        self.assertEqual(list(merge_concurrently([slow, slow, slow])), ["done"] * 3)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_failures_are_merged_after_other_items(self):
+        def failing():
+            yield "partial"
+            raise ChannelRetrievalError("boom", channel_types=[ChannelType.VOD])
+
+        items = []
+        with self.assertRaises(ChannelRetrievalError) as ctx:
+            for item in merge_concurrently([failing, lambda: iter(["ok"])]):
+                items.append(item)
+        self.assertEqual(sorted(items), ["ok", "partial"])
+        self.assertEqual(ctx.exception.channel_types, [ChannelType.VOD])
+
+    def test_closing_early_releases_producers(self):
+        finished = threading.Event()
+
+        def endless():
+            try:
+                while True:
+                    yield 1
+            finally:
+                finished.set()
+
+        merged = merge_concurrently([endless], max_pending=1)
+        next(merged)
+        merged.close()
+        self.assertTrue(finished.wait(timeout=1))
@@ -0,0 +1,39 @@
+import json
+import unittest
+
+from pyiptv.dao.channel_retreival.json_stream import iter_json_array
+
+
+def chunked(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_matches_json_loads_for_any_chunk_size(self):
+        payload = [
+            {"stream_id": i, "name": f"Channel {i} – ünïcode", "rating": 4.5}
+            for i in range(50)
+        ] + [12345, "tail", None, [1, 2, {"a": "]"}]]
+        data = json.dumps(payload).encode("utf-8")
+        for size in (1, 2, 7, 64, len(data)):
+            with self.subTest(chunk_size=size):
+                self.assertEqual(list(iter_json_array(chunked(data, size))), payload)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [ ] "])), [])
+
+    def test_yields_before_payload_is_complete(self):
+        def chunks():
+            yield b'[{"stream_id": 1}, '
+            raise AssertionError("read past the first element")
+
+        elements = iter_json_array(chunks())
+        self.assertEqual(next(elements), {"stream_id": 1})
+
+    def test_rejects_non_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"user_info": {"auth": 0}}']))
+
+    def test_rejects_truncated_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"stream_id": 1}, {"stream_id"']))
@@ -0,0 +1,133 @@
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+from pyiptv.dao.channel_retreival.m3u import (
+    M3UChannelSource,
+    entry_id,
+    iter_lines,
+    iter_m3u_entries,
+)
+from pyiptv.enum.channel_type import ChannelType
+
+PLAYLIST = """#EXTM3U
+#EXTINF:-1 tvg-id="news.uk" tvg-name="News, UK" tvg-logo="http://img/1.png" group-title="UK",News HD
+#EXTVLCOPT:http-user-agent=test
+http://host:80/live/user/pass/101.ts
+#EXTINF:-1 tvg-id="" group-title="Movies",Some Movie (2024)
+http://host:80/movie/user/pass/202.mkv
+#EXTINF:-1 group-title="Shows",Show S01E01
+http://host:80/series/user/pass/303.mp4
+#EXTINF:-1 tvg-name="Radio One",
+http://radio.example/stream/index.m3u8
+"""
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path != "/get.php?type=m3u_plus":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = PLAYLIST.replace("\n", "\r\n").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestM3UParsing(unittest.TestCase):
+    def test_entries_and_attributes(self):
+        entries = list(iter_m3u_entries(PLAYLIST.splitlines()))
+
+        self.assertEqual(
+            [e.name for e in entries],
+            ["News HD", "Some Movie (2024)", "Show S01E01", "Radio One"],
+        )
+        self.assertEqual(entries[0].url, "http://host:80/live/user/pass/101.ts")
+        self.assertEqual(entries[0].attributes["tvg-name"], "News, UK")
+        self.assertEqual(entries[0].attributes["group-title"], "UK")
+        self.assertEqual(entries[0].attributes["tvg-logo"], "http://img/1.png")
+
+    def test_numeric_file_names_outside_xtreme_urls_are_hashed(self):
+        entries = list(
+            iter_m3u_entries(["http://one.example/1.ts", "http://two.example/1.ts"])
+        )
+
+        ids = [entry_id(entry) for entry in entries]
+        self.assertNotEqual(ids[0], ids[1])
+        self.assertNotIn("1", ids)
+
+    def test_lines_split_across_chunks(self):
+        data = "a\r\nbé\nc".encode("utf-8")
+        chunks = [data[i : i + 1] for i in range(len(data))]
+
+        self.assertEqual(
+            [line.strip() for line in iter_lines(chunks)], ["a", "bé", "c"]
+        )
+
+
+class TestM3UChannelSource(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_types_are_inferred_and_batched(self):
+        source = M3UChannelSource(f"{self.url}/get.php?type=m3u_plus")
+
+        batches = list(
+            source.retreive_all(
+                [ChannelType.LIVE, ChannelType.VOD, ChannelType.SERIES], page_size=1
+            )
+        )
+
+        self.assertEqual(
+            [(t, [(ch.id, ch.name) for ch in batch]) for t, batch in batches],
+            [
+                (ChannelType.LIVE, [("101", "News HD")]),
+                (ChannelType.VOD, [("202", "Some Movie (2024)")]),
+                (ChannelType.SERIES, [("303", "Show S01E01")]),
+                (ChannelType.LIVE, [(batches[3][1][0].id, "Radio One")]),
+            ],
+        )
+        self.assertEqual(len(batches[3][1][0].id), 16)
+        self.assertEqual(
+            [batch[0].epg_id for _, batch in batches], ["news.uk", "", "", ""]
+        )
+        self.assertEqual(
+            batches[0][1][0].playable_url, "http://host:80/live/user/pass/101.ts"
+        )
+
+    def test_reads_playlist_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "playlist.m3u")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(PLAYLIST)
+
+        movies = list(
+            M3UChannelSource(path).retreive_channels_by_type(ChannelType.MOVIE)
+        )
+
+        self.assertEqual([[ch.id for ch in batch] for batch in movies], [["202"]])
+        self.assertEqual(movies[0][0].type, ChannelType.MOVIE)
+
+    def test_http_error_raises_retrieval_error(self):
+        source = M3UChannelSource(f"{self.url}/missing.m3u")
+
+        with self.assertRaises(ChannelRetrievalError) as ctx:
+            list(source.retreive_all([ChannelType.LIVE]))
+        self.assertEqual(ctx.exception.channel_types, [ChannelType.LIVE])
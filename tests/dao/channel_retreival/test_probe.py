@@ -0,0 +1,93 @@
+import http.server
+import threading
+import time
+import unittest
+
+from pyiptv.dao.channel_retreival.probe import StreamProber
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    lock = threading.Lock()
+    active = 0
+    most_active = 0
+    ranges = []
+
+    def do_GET(self) -> None:
+        with Handler.lock:
+            Handler.active += 1
+            Handler.most_active = max(Handler.most_active, Handler.active)
+            Handler.ranges.append(self.headers.get("Range"))
+        try:
+            if self.path.startswith("/live/"):
+                time.sleep(0.05)
+                self.send_response(206)
+                self.end_headers()
+                self.wfile.write(b"\x47" * 1024)
+            elif self.path == "/empty":
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif self.path == "/slow":
+                time.sleep(1)
+            else:
+                self.send_response(404)
+                self.end_headers()
+        finally:
+            with Handler.lock:
+                Handler.active -= 1
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def live(id: str, url: str) -> ChannelEntity:
+    return ChannelEntity(id=id, name=id, playable_url=url, type=ChannelType.LIVE)
+
+
+class TestStreamProber(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        Handler.most_active = 0
+        Handler.ranges = []
+
+    def test_probe_reports_live_and_dead_streams(self):
+        prober = StreamProber(read_timeout=0.3)
+
+        alive = prober.probe(live("1", f"{self.url}/live/1.ts"))
+        self.assertTrue(alive.alive)
+        self.assertGreater(alive.latency_ms, 0)
+        self.assertEqual(Handler.ranges, ["bytes=0-1023"])
+
+        missing = prober.probe(live("2", f"{self.url}/missing.ts"))
+        self.assertEqual((missing.alive, missing.detail), (False, "HTTP 404"))
+        empty = prober.probe(live("3", f"{self.url}/empty"))
+        self.assertEqual((empty.alive, empty.detail), (False, "empty response"))
+        slow = prober.probe(live("4", f"{self.url}/slow"))
+        self.assertEqual((slow.alive, slow.detail), (False, "ReadTimeout"))
+
+    def test_probe_all_bounds_concurrent_requests(self):
+        channels = [live(str(i), f"{self.url}/live/{i}.ts") for i in range(40)]
+        series = ChannelEntity(
+            id="s", name="Show", playable_url="", type=ChannelType.SERIES
+        )
+        prober = StreamProber(max_workers=4)
+
+        results = list(prober.probe_all(iter(channels + [series])))
+
+        self.assertEqual(
+            sorted(r.channel_id for r in results), sorted(ch.id for ch in channels)
+        )
+        self.assertTrue(all(r.alive for r in results))
+        self.assertLessEqual(Handler.most_active, 4)
+        self.assertGreater(Handler.most_active, 1)
@@ -0,0 +1,65 @@
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+from pyiptv.dao.channel_retreival.xmltv import (
+    XMLTVGuideSource,
+    iter_xmltv,
+    parse_xmltv_time,
+)
+from pyiptv.dto.programme import GuideChannel, Programme
+
+GUIDE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<tv>
+  <channel id="news.uk"><display-name>News HD</display-name><display-name>News</display-name></channel>
+  <programme start="20240101120000 +0100" stop="20240101130000 +0100" channel="news.uk">
+    <title lang="en">Midday News</title><desc>Headlines</desc>
+  </programme>
+  <programme start="20240101100000 +0000" stop="20240101103000 +0000" channel="news.uk">
+    <title>Early</title>
+  </programme>
+  <programme start="bad" stop="20240101103000" channel="news.uk"><title>Broken</title></programme>
+</tv>
+"""
+
+
+class TestXMLTV(unittest.TestCase):
+    def test_parse_time_with_offset(self):
+        self.assertEqual(parse_xmltv_time("20240101120000 +0100"), 1704106800)
+        self.assertEqual(parse_xmltv_time("20240101110000"), 1704106800)
+        self.assertEqual(parse_xmltv_time("20240101103000 -0030"), 1704106800)
+        self.assertIsNone(parse_xmltv_time("soon"))
+
+    def test_channels_and_programmes_since(self):
+        items = list(iter_xmltv(io.BytesIO(GUIDE), since=1704105000))
+
+        self.assertEqual(
+            items,
+            [
+                GuideChannel(id="news.uk", names=["News HD", "News"]),
+                Programme(
+                    channel="news.uk",
+                    start=1704106800,
+                    stop=1704110400,
+                    title="Midday News",
+                ),
+            ],
+        )
+
+    def test_gzipped_file_and_parse_errors(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "guide.xml.gz")
+        with gzip.open(path, "wb") as f:
+            f.write(GUIDE)
+
+        items = list(XMLTVGuideSource(path).retreive_guide())
+        self.assertEqual(items[0].id, "news.uk")
+
+        with open(path, "wb") as f:
+            f.write(GUIDE[:200])
+        with self.assertRaises(ChannelRetrievalError):
+            list(XMLTVGuideSource(path).retreive_guide())
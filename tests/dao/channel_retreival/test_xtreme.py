@@ -0,0 +1,141 @@
+import http.server
+import json
+import threading
+import unittest
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+from pyiptv.dao.channel_retreival.base import ChannelRetrievalError
+from pyiptv.dao.channel_retreival.xtreme import XtremeChannelSource
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+RESPONSES: Dict[str, Any] = {
+    "get_live_streams": [
+        {"stream_id": 1, "name": " News HD ", "epg_channel_id": "news.uk"}
+    ],
+    "get_vod_streams": [
+        {"stream_id": 2, "name": "Movie", "container_extension": "mkv"},
+        {"stream_id": 3, "name": "Old Movie"},
+    ],
+    "get_series": [{"series_id": 4, "name": "Show"}],
+    "get_series_info": {
+        "episodes": {
+            "2": [{"id": "21", "title": "Show S02E01", "container_extension": "mp4"}],
+            "1": [
+                {"id": "11", "title": "Show S01E01", "container_extension": "avi"},
+                {"id": "12", "title": "", "episode_num": 2},
+            ],
+        }
+    },
+}
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        action = parse_qs(url.query).get("action", [""])[0]
+        if url.path != "/player_api.php" or action not in RESPONSES:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps(RESPONSES[action]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestXtremeChannelSource(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.source = XtremeChannelSource(self.base_url + "/", "user", "pass")
+
+    def fetch(self, channel_type: ChannelType):
+        return [
+            ch
+            for batch in self.source.retreive_channels_by_type(channel_type, 1)
+            for ch in batch
+        ]
+
+    def test_live_streams(self):
+        self.assertEqual(
+            self.fetch(ChannelType.LIVE),
+            [
+                ChannelEntity(
+                    id="1",
+                    name="News HD",
+                    playable_url=f"{self.base_url}/live/user/pass/1.ts",
+                    type=ChannelType.LIVE,
+                    epg_id="news.uk",
+                )
+            ],
+        )
+
+    def test_vod_streams_use_movie_urls_and_extension(self):
+        self.assertEqual(
+            self.fetch(ChannelType.VOD),
+            [
+                ChannelEntity(
+                    id="2",
+                    name="Movie",
+                    playable_url=f"{self.base_url}/movie/user/pass/2.mkv",
+                    type=ChannelType.VOD,
+                ),
+                ChannelEntity(
+                    id="3",
+                    name="Old Movie",
+                    playable_url=f"{self.base_url}/movie/user/pass/3.mp4",
+                    type=ChannelType.VOD,
+                ),
+            ],
+        )
+
+    def test_movie_type_is_served_from_vod_listing(self):
+        movies = self.fetch(ChannelType.MOVIE)
+        self.assertEqual([m.type for m in movies], [ChannelType.MOVIE] * 2)
+
+    def test_series_are_listed_without_url(self):
+        self.assertEqual(
+            self.fetch(ChannelType.SERIES),
+            [
+                ChannelEntity(
+                    id="4", name="Show", playable_url="", type=ChannelType.SERIES
+                )
+            ],
+        )
+
+    def test_series_episodes_in_season_order(self):
+        episodes = self.source.retreive_series_episodes("4")
+        self.assertEqual([ep.id for ep in episodes], ["11", "12", "21"])
+        self.assertEqual(
+            episodes[0].playable_url, f"{self.base_url}/series/user/pass/11.avi"
+        )
+        self.assertEqual(episodes[1].name, "Episode 2")
+
+    def test_retreive_all_tags_batches(self):
+        tagged = list(
+            self.source.retreive_all([ChannelType.LIVE, ChannelType.SERIES], 10)
+        )
+        self.assertEqual(
+            sorted((t.value, len(batch)) for t, batch in tagged),
+            [("live", 1), ("series", 1)],
+        )
+
+    def test_http_error_raises_retrieval_error(self):
+        self.source.base_url = self.base_url + "/missing"
+        with self.assertRaises(ChannelRetrievalError):
+            self.fetch(ChannelType.LIVE)
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import time
+import unittest
+
+from pyiptv.dao.channel_storage.cursor import GroupedResults, SearchResultCursor
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+from pyiptv.enum.channel_type import ChannelType
+
+TYPES = [ChannelType.LIVE, ChannelType.VOD]
+
+
+class CountingStorage(ChannelStorageSQLite):
+    def __init__(self, filepath: str) -> None:
+        super().__init__(filepath)
+        self.fetched = 0
+
+    def search(self, name, channel_types, limit=None, offset=0):
+        results = super().search(name, channel_types, limit=limit, offset=offset)
+        self.fetched += len(results)
+        return results
+
+
+class TestSearchResultCursor(unittest.TestCase):
+    def setUp(self):
+        temp_db_file = tempfile.NamedTemporaryFile(delete=False)
+        self.addCleanup(lambda: os.remove(temp_db_file.name))
+        self.storage = CountingStorage(temp_db_file.name)
+        self.storage.save_channel_bulk(
+            [
+                ChannelEntity(
+                    id=str(i),
+                    name=f"Sports {i}",
+                    playable_url=f"http://{i}",
+                    type=TYPES[i % 2],
+                )
+                for i in range(500)
+            ]
+        )
+        self.storage.fetched = 0
+
+    def test_matches_full_search(self):
+        cursor = SearchResultCursor(self.storage, "sports", TYPES, page_size=7)
+        self.assertEqual(list(cursor), self.storage.search("sports", TYPES))
+
+    def test_only_visible_window_is_fetched(self):
+        cursor = SearchResultCursor(
+            self.storage, "sports", TYPES, page_size=30, prefetch=10
+        )
+        self.assertEqual(len(cursor), 500)
+        self.assertEqual(self.storage.fetched, 0)
+
+        self.assertEqual(len(cursor[0:30]), 30)
+        self.assertEqual(self.storage.fetched, 40)
+
+        cursor[35]
+        self.assertEqual(self.storage.fetched, 40)
+        cursor[40]
+        self.assertEqual(cursor.loaded, 80)
+
+    def test_index_out_of_range(self):
+        cursor = SearchResultCursor(self.storage, "nomatch", TYPES)
+        self.assertEqual(len(cursor), 0)
+        self.assertEqual(cursor[0:30], [])
+        with self.assertRaises(IndexError):
+            cursor[0]
+
+
+def live(id: str, name: str) -> ChannelEntity:
+    return ChannelEntity(
+        id=id, name=name, playable_url=f"http://{id}", type=ChannelType.LIVE
+    )
+
+
+class TestGroupedResults(unittest.TestCase):
+    def test_same_name_channels_become_alternates(self):
+        a1, b1, a2 = (
+            live("p1:1", "Sky Sports"),
+            live("p1:2", "BBC"),
+            live("p2:9", "sky  sports!"),
+        )
+        movie = ChannelEntity(
+            id="p2:3", name="Sky Sports", playable_url="", type=ChannelType.VOD
+        )
+        grouped = GroupedResults([a1, b1, a2, movie], chunk_size=2)
+
+        self.assertEqual(list(grouped), [a1, b1, movie])
+        self.assertEqual(len(grouped), 3)
+        self.assertEqual(grouped.alternates(0), [a2])
+        self.assertEqual(grouped[-1], movie)
+
+        self.assertEqual(grouped.next_alternate(0), a2)
+        self.assertEqual(grouped[0], a2)
+        self.assertEqual(grouped.alternates(0), [a1])
+
+    def test_reads_results_only_as_far_as_accessed(self):
+        results = [live(str(i), f"Channel {i}") for i in range(100)]
+        grouped = GroupedResults(results, chunk_size=10)
+
+        self.assertEqual(grouped[0:5], results[:5])
+        self.assertEqual(grouped._scanned, 10)
+        with self.assertRaises(IndexError):
+            grouped[100]
+
+    def test_groups_are_ordered_by_stream_health(self):
+        slow, dead, fast, unknown = (live(f"p{i}:1", "Sky Sports") for i in range(1, 5))
+        other = live("p1:2", "BBC")
+        grouped = GroupedResults([slow, dead, other, fast, unknown])
+
+        def health(channel, alive, latency_ms=None):
+            return StreamHealth(
+                channel.id, channel.type, alive, latency_ms, time.time()
+            )
+
+        grouped.apply_health(
+            {
+                slow: health(slow, True, 900.0),
+                dead: health(dead, False),
+                fast: health(fast, True, 40.0),
+            }
+        )
+        self.assertEqual(grouped[0:2], [fast, other])
+        self.assertEqual(grouped.alternates(0), [slow, unknown, dead])
+        self.assertFalse(grouped.health(dead).alive)
+
+    def test_hide_dead_drops_dead_channels_and_emptied_groups(self):
+        a1, a2, b = (
+            live("p1:1", "Sky Sports"),
+            live("p2:1", "Sky Sports"),
+            live("p1:2", "BBC"),
+        )
+        grouped = GroupedResults([a1, b, a2], chunk_size=1, hide_dead=True)
+        self.assertEqual(grouped[0], a1)
+
+        grouped.apply_health(
+            {
+                a1: StreamHealth(a1.id, a1.type, False, None, time.time()),
+                b: StreamHealth(b.id, b.type, False, None, time.time()),
+            }
+        )
+        self.assertEqual(list(grouped), [a2])
+        self.assertEqual(len(grouped), 1)
@@ -0,0 +1,46 @@
+import unittest
+
+from pyiptv.dao.channel_storage.fuzzy import (
+    edit_distance,
+    min_overlap,
+    query_trigrams,
+    rank_fuzzy,
+)
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+
+def live(id: str, name: str) -> ChannelEntity:
+    return ChannelEntity(
+        id=id, name=name, playable_url=f"http://{id}", type=ChannelType.LIVE
+    )
+
+
+class TestFuzzy(unittest.TestCase):
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("sports", "sports", 2), 0)
+        self.assertEqual(edit_distance("kitten", "sitting", 3), 3)
+        self.assertEqual(edit_distance("spotrs", "sports", 2), 1)
+        self.assertEqual(edit_distance("chanel", "channel", 2), 1)
+        self.assertEqual(edit_distance("news", "sports", 2), 3)
+        self.assertEqual(edit_distance("", "abc", 5), 3)
+
+    def test_short_queries_include_transposed_trigrams(self):
+        self.assertTrue({"por", "ort", "rts"} <= query_trigrams(["spotrs"]))
+        self.assertEqual(min_overlap(["spotrs"]), 1)
+        self.assertEqual(query_trigrams(["hd"]), set())
+        self.assertEqual(
+            query_trigrams(["extrem", "sprots"]),
+            {"ext", "xtr", "tre", "rem", "spr", "pro", "rot", "ots"},
+        )
+
+    def test_rank_fuzzy_orders_by_similarity_then_length(self):
+        exact = live("1", "Sports")
+        longer = live("2", "Sports Extra HD")
+        typo = live("3", "Sporty")
+        unrelated = live("4", "Spokane News")
+        self.assertEqual(
+            rank_fuzzy(["spotrs"], [unrelated, typo, longer, exact]),
+            [exact, longer, typo],
+        )
+        self.assertEqual(rank_fuzzy(["spotrs"], [exact, longer], limit=1), [exact])
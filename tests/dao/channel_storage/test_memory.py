@@ -0,0 +1,317 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from pyiptv.dao.channel_storage.memory import (
+    _HEADER_LENGTH,
+    SNAPSHOT_MAGIC,
+    ChannelStorageMemory,
+)
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+from pyiptv.enum.channel_type import ChannelType
+
+
+def live(id: str, name: str) -> ChannelEntity:
+    return ChannelEntity(
+        id=id, name=name, playable_url=f"http://{id}", type=ChannelType.LIVE
+    )
+
+
+class TestChannelStorageMemory(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshot_path = os.path.join(directory.name, "catalog.idx")
+        self.storage = ChannelStorageMemory(self.snapshot_path)
+
+    def test_save_and_get_channel(self):
+        ch = live("1", "LoremTV")
+        self.storage.save_channel(ch)
+
+        self.assertEqual(self.storage.get_channel("1"), ch)
+        self.assertIsNone(self.storage.get_channel("2"))
+
+    def test_search_by_word_prefix_and_substring(self):
+        ch = live("1", "Amet Sport-Alpha")
+        self.storage.save_channel(ch)
+
+        for query in ("amet", "spo", "lph", "amet sportalpha"):
+            self.assertEqual(self.storage.search(query, [ChannelType.LIVE]), [ch])
+        self.assertEqual(self.storage.search(" - ", [ChannelType.LIVE]), [])
+
+    def test_longer_token_must_be_a_whole_word(self):
+        self.storage.save_channel(live("1", "Sports"))
+
+        self.assertEqual(self.storage.search("port", [ChannelType.LIVE]), [])
+        self.assertEqual(self.storage.count("sports", [ChannelType.LIVE]), 1)
+
+    def test_search_ranking_order(self):
+        ch1 = live("1", "Test Channel Sports Alpha")
+        ch2 = live("2", "Test Sports")
+        self.storage.save_channel_bulk([ch1, ch2, live("3", "Test")])
+
+        self.assertEqual(
+            self.storage.search_by_name_and_type("test sports", ChannelType.LIVE),
+            [ch2, ch1],
+        )
+
+    def test_search_ranks_across_types_with_limit_and_offset(self):
+        channels = [
+            ChannelEntity(
+                id=str(i),
+                name="Sports " + "x" * i,
+                playable_url=f"http://{i}",
+                type=ChannelType.LIVE if i % 2 else ChannelType.VOD,
+            )
+            for i in range(1, 7)
+        ]
+        self.storage.save_channel_bulk(channels)
+
+        types = [ChannelType.LIVE, ChannelType.VOD]
+        everything = self.storage.search("sports", types)
+        self.assertEqual(everything, channels)
+        self.assertEqual(self.storage.search("sports", types, limit=2), channels[:2])
+        self.assertEqual(
+            self.storage.search("sports", types, limit=2, offset=3), channels[3:5]
+        )
+        self.assertEqual(
+            self.storage.search("sports", [ChannelType.VOD]), channels[1::2]
+        )
+
+    def test_search_fuzzy_tolerates_typos(self):
+        sports, channel = live("1", "Sports HD"), live("2", "Channel One")
+        self.storage.save_channel_bulk([sports, channel, live("3", "News")])
+
+        self.assertEqual(self.storage.search("spotrs", [ChannelType.LIVE]), [])
+        self.assertEqual(
+            self.storage.search_fuzzy("spotrs", [ChannelType.LIVE]), [sports]
+        )
+        self.assertEqual(
+            self.storage.search_fuzzy("chanel on", [ChannelType.LIVE]), [channel]
+        )
+        self.assertEqual(self.storage.search_fuzzy("chanel", [ChannelType.VOD]), [])
+
+    def test_save_channel_twice_replaces_search_entry(self):
+        self.storage.save_channel(live("1", "OldName"))
+        renamed = live("1", "NewName")
+        self.storage.save_channel(renamed)
+
+        self.assertEqual(self.storage.search("oldname", [ChannelType.LIVE]), [])
+        self.assertEqual(self.storage.search("newname", [ChannelType.LIVE]), [renamed])
+
+    def test_sync_writes_only_changed_and_drops_missing(self):
+        kept, dropped = live("1", "Kept"), live("3", "Dropped")
+        self.storage.save_channel_bulk([kept, live("2", "Before"), dropped])
+        self.assertIsNone(self.storage.get_last_sync(ChannelType.LIVE))
+
+        changed, added = live("2", "After"), live("4", "Added")
+        self.storage.begin_sync(ChannelType.LIVE)
+        written = self.storage.sync_channel_bulk([kept, changed, added])
+        deleted = self.storage.finish_sync(ChannelType.LIVE)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(deleted, 1)
+        self.assertIsNone(self.storage.get_channel("3"))
+        self.assertEqual(self.storage.get_channel("2"), changed)
+        self.assertEqual(self.storage.search("dropped", [ChannelType.LIVE]), [])
+        self.assertIsNotNone(self.storage.get_last_sync(ChannelType.LIVE))
+
+    def test_iter_channels_survives_compaction_between_batches(self):
+        self.storage.save_channel_bulk([live(str(i), f"Ch {i}") for i in range(5)])
+        self.storage.save_channel(live("0", "Ch 0 renamed"))
+
+        batches = self.storage.iter_channels(ChannelType.LIVE, batch_size=2)
+        first = next(batches)
+        self.storage.save_snapshot()
+        rest = [ch for batch in batches for ch in batch]
+
+        self.assertEqual([ch.id for ch in first], ["1", "2"])
+        self.assertEqual([ch.id for ch in rest], ["3", "4", "0"])
+        self.assertEqual(rest[-1].name, "Ch 0 renamed")
+
+    def test_iter_channels_does_not_block_while_a_batch_is_consumed(self):
+        self.storage.save_channel_bulk([live(str(i), f"Ch {i}") for i in range(4)])
+        batches = self.storage.iter_channels(ChannelType.LIVE, batch_size=2)
+        self.addCleanup(batches.close)
+        next(batches)
+
+        searcher = threading.Thread(
+            target=self.storage.search, args=("ch", [ChannelType.LIVE])
+        )
+        searcher.start()
+        searcher.join(5)
+
+        self.assertFalse(searcher.is_alive())
+
+    def test_series_episodes_are_cached_and_dropped_with_series(self):
+        series = ChannelEntity(
+            id="7", name="Show", playable_url="", type=ChannelType.SERIES
+        )
+        episodes = [
+            ChannelEntity(
+                id="1", name="Show E1", playable_url="http://ep/1", type=series.type
+            )
+        ]
+        self.storage.save_channel(series)
+        self.storage.save_series_episodes("7", episodes)
+        self.assertEqual(self.storage.get_series_episodes("7"), episodes)
+        self.assertIsNone(self.storage.get_series_episodes("7", max_age=0))
+
+        self.storage.begin_sync(ChannelType.SERIES)
+        self.storage.finish_sync(ChannelType.SERIES)
+        self.assertIsNone(self.storage.get_series_episodes("7"))
+
+    def test_snapshot_round_trip_after_sync(self):
+        series = ChannelEntity(
+            id="7", name="Show", playable_url="", type=ChannelType.SERIES
+        )
+        episode = ChannelEntity(
+            id="1", name="Show E1", playable_url="http://ep/1", type=series.type
+        )
+        self.storage.save_channel_bulk(
+            [live("1", "Old Sports"), live("2", "Dropped"), live("3", "Ünïcode TV")]
+        )
+        self.storage.save_channel(series)
+        self.storage.save_series_episodes("7", [episode])
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.storage.sync_channel_bulk(
+            [live("1", "Sports HD"), live("3", "Ünïcode TV")]
+        )
+        self.storage.finish_sync(ChannelType.LIVE)
+        self.assertFalse(os.path.exists(self.snapshot_path))
+        self.storage.end_sync()
+
+        reopened = ChannelStorageMemory(self.snapshot_path)
+        self.assertEqual(
+            reopened.search("sports", [ChannelType.LIVE]), [live("1", "Sports HD")]
+        )
+        types = [ChannelType.LIVE, ChannelType.SERIES]
+        for query in ("sports", "hd", "ünïcode", "show", "dropped", "old"):
+            self.assertEqual(
+                reopened.search(query, types), self.storage.search(query, types)
+            )
+        self.assertEqual(reopened.get_channel("7"), series)
+        self.assertEqual(reopened.get_series_episodes("7"), [episode])
+        self.assertEqual(
+            reopened.get_last_sync(ChannelType.LIVE),
+            self.storage.get_last_sync(ChannelType.LIVE),
+        )
+        self.assertIsNone(reopened.get_last_sync(ChannelType.VOD))
+
+    def test_epg_id_survives_sync_and_snapshot(self):
+        ch = ChannelEntity(
+            id="1",
+            name="News",
+            playable_url="http://1",
+            type=ChannelType.LIVE,
+            epg_id="news.uk",
+        )
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.storage.sync_channel_bulk([live("1", "News")])
+        self.assertEqual(self.storage.sync_channel_bulk([ch]), 1)
+        self.storage.finish_sync(ChannelType.LIVE)
+        self.storage.end_sync()
+
+        reopened = ChannelStorageMemory(self.snapshot_path)
+        self.assertEqual(reopened.search("news", [ChannelType.LIVE]), [ch])
+
+    def test_failed_snapshot_write_is_retried_by_next_sync(self):
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.storage.sync_channel_bulk([live("1", "News")])
+        self.storage.finish_sync(ChannelType.LIVE)
+        # A directory in the way makes the final rename fail.
+        os.mkdir(self.snapshot_path)
+
+        with self.assertRaises(OSError):
+            self.storage.end_sync()
+        os.rmdir(self.snapshot_path)
+        self.storage.end_sync()
+
+        reopened = ChannelStorageMemory(self.snapshot_path)
+        self.assertEqual(
+            reopened.search("news", [ChannelType.LIVE]), [live("1", "News")]
+        )
+        self.assertFalse(os.path.exists(f"{self.snapshot_path}.tmp"))
+
+    def test_url_prefix_survives_snapshot(self):
+        prefix = "http://provider.test/live/user/pass/"
+        channels = [
+            ChannelEntity(
+                id=str(i),
+                name=f"Channel {i}",
+                playable_url=f"{prefix}{i}.ts",
+                type=ChannelType.LIVE,
+            )
+            for i in range(3)
+        ]
+        self.storage.save_channel_bulk(channels)
+        self.storage.save_snapshot()
+
+        reopened = ChannelStorageMemory(self.snapshot_path)
+        found = reopened.search("channel", [ChannelType.LIVE])
+        self.assertEqual(found, channels)
+        self.assertTrue(all(ch.url_prefix is found[0].url_prefix for ch in found))
+
+    def test_stream_health_survives_snapshot(self):
+        channels = [live("1", "Sports"), live("2", "News")]
+        results = [
+            StreamHealth("1", ChannelType.LIVE, True, 12.5, time.time()),
+            StreamHealth("2", ChannelType.LIVE, False, None, time.time() - 600, "x"),
+        ]
+        self.storage.save_channel_bulk(channels)
+        self.storage.save_stream_health(results)
+        self.storage.save_snapshot()
+
+        reopened = ChannelStorageMemory(self.snapshot_path)
+        self.assertEqual(
+            reopened.get_stream_health(channels),
+            {channels[0]: results[0], channels[1]: results[1]},
+        )
+        self.assertEqual(
+            reopened.get_stream_health(channels, max_age=60), {channels[0]: results[0]}
+        )
+
+    def test_unreadable_snapshot_starts_empty(self):
+        with open(self.snapshot_path, "wb") as f:
+            f.write(b"not a snapshot")
+
+        storage = ChannelStorageMemory(self.snapshot_path)
+        self.assertIsNone(storage.get_channel("1"))
+        self.assertEqual(storage.search("sports", [ChannelType.LIVE]), [])
+
+    def rewrite_snapshot_header(self, change):
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+        start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+        (length,) = _HEADER_LENGTH.unpack_from(data, len(SNAPSHOT_MAGIC))
+        header = json.loads(data[start : start + length])
+        change(header)
+        encoded = json.dumps(header).encode("utf-8")
+        with open(self.snapshot_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + _HEADER_LENGTH.pack(len(encoded)) + encoded)
+            f.write(data[start + length :])
+
+    def test_snapshot_failing_partway_leaves_no_type_fresh(self):
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.storage.sync_channel_bulk([live("1", "Sports")])
+        self.storage.finish_sync(ChannelType.LIVE)
+        self.storage.end_sync()
+        self.rewrite_snapshot_header(
+            lambda header: header.update(stream_health=[["live", "1"]])
+        )
+
+        storage = ChannelStorageMemory(self.snapshot_path)
+        self.assertIsNone(storage.get_last_sync(ChannelType.LIVE))
+        self.assertIsNone(storage.get_channel("1"))
+
+    def test_malformed_snapshot_header_starts_empty(self):
+        self.storage.save_channel(live("1", "Sports"))
+        self.storage.save_snapshot()
+        self.rewrite_snapshot_header(lambda header: header.update(sections=None))
+
+        storage = ChannelStorageMemory(self.snapshot_path)
+        self.assertIsNone(storage.get_channel("1"))
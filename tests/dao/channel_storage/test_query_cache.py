@@ -0,0 +1,72 @@
+import unittest
+
+from pyiptv.dao.channel_storage.query_cache import QueryResultCache
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+
+TYPES = [ChannelType.LIVE, ChannelType.VOD]
+
+
+def channels(count: int):
+    return [
+        ChannelEntity(id=str(i), name=f"Ch {i}", playable_url="", type=ChannelType.LIVE)
+        for i in range(count)
+    ]
+
+
+class TestQueryResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryResultCache(max_rows=100)
+        self.key = QueryResultCache.key(["sport"], TYPES)
+
+    def test_key_ignores_token_and_type_order(self):
+        self.assertEqual(
+            QueryResultCache.key(["news", "bbc"], TYPES),
+            QueryResultCache.key(["bbc", "news"], list(reversed(TYPES))),
+        )
+
+    def test_pages_inside_cached_prefix_are_hits(self):
+        rows = channels(60)
+        self.cache.store_page(self.key, rows, 60, 0, self.cache.generation)
+
+        self.assertEqual(self.cache.page(self.key, 30, 30), rows[30:60])
+        self.assertIsNone(self.cache.page(self.key, 30, 50))
+        self.assertIsNone(self.cache.count(self.key))
+
+    def test_contiguous_pages_extend_entry_until_complete(self):
+        rows = channels(45)
+        self.cache.store_page(self.key, rows[:30], 30, 0, self.cache.generation)
+        self.cache.store_page(self.key, rows[30:], 30, 30, self.cache.generation)
+
+        self.assertEqual(self.cache.page(self.key, None, 0), rows)
+        self.assertEqual(self.cache.count(self.key), 45)
+
+    def test_store_after_invalidate_is_dropped(self):
+        generation = self.cache.generation
+        self.cache.invalidate()
+        self.cache.store_page(self.key, channels(5), 30, 0, generation)
+        self.cache.store_count(self.key, 5, generation)
+
+        self.assertIsNone(self.cache.page(self.key, 30, 0))
+        self.assertIsNone(self.cache.count(self.key))
+
+    def test_extending_an_empty_query_is_empty(self):
+        self.cache.store_page(self.key, [], 30, 0, self.cache.generation)
+        narrower = QueryResultCache.key(["sport", "xyz"], TYPES)
+
+        self.assertEqual(self.cache.page(narrower, 30, 0), [])
+        self.assertEqual(self.cache.count(narrower), 0)
+        other_types = QueryResultCache.key(["sport", "xyz"], [ChannelType.LIVE])
+        self.assertIsNone(self.cache.page(other_types, 30, 0))
+
+    def test_evicts_least_recently_used_beyond_row_budget(self):
+        first = QueryResultCache.key(["first"], TYPES)
+        second = QueryResultCache.key(["second"], TYPES)
+        self.cache.store_page(first, channels(60), None, 0, self.cache.generation)
+        self.cache.store_page(self.key, channels(30), None, 0, self.cache.generation)
+        self.cache.page(first, 10, 0)
+        self.cache.store_page(second, channels(30), None, 0, self.cache.generation)
+
+        self.assertIsNotNone(self.cache.page(first, 10, 0))
+        self.assertIsNone(self.cache.page(self.key, 10, 0))
+        self.assertIsNotNone(self.cache.page(second, 10, 0))
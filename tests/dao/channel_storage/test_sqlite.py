@@ -1,24 +1,21 @@
 import os
-import random
-import string
+import sqlite3
+import stat
 import tempfile
+import threading
 import time
 import unittest
+from unittest import mock
 
+from pyiptv.dao.channel_storage import sqlite as sqlite_storage
+from pyiptv.dao.channel_storage.ngrams import generate_ngrams, generate_ngrams_batch
 from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dao.channel_storage.sqlite_trigram import ChannelStorageSQLiteTrigram
 from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
 from pyiptv.enum.channel_type import ChannelType
 
 
-def random_word(length: int) -> str:
-    return "".join(random.choices(string.ascii_lowercase, k=length))
-
-
-def random_channel_name() -> str:
-    words = [random_word(random.randint(3, 8)) for _ in range(random.randint(1, 8))]
-    return " ".join(words)
-
-
 class TestChannelStorageSQLite(unittest.TestCase):
     def setUp(self):
         temp_db_file = tempfile.NamedTemporaryFile(delete=False)
@@ -38,6 +35,33 @@ class TestChannelStorageSQLite(unittest.TestCase):
         self.assertIsNotNone(fetched)
         self.assertEqual(fetched, ch)  # dataclass equality
 
+    def test_epg_id_is_stored_and_synced(self):
+        ch = ChannelEntity(
+            id="1",
+            name="News",
+            playable_url="http://news.test",
+            type=ChannelType.LIVE,
+            epg_id="news.uk",
+        )
+        self.storage.save_channel(ch)
+        self.assertEqual(self.storage.get_channel("1").epg_id, "news.uk")
+        self.assertEqual(self.storage.search("news", [ChannelType.LIVE]), [ch])
+
+        renamed = ChannelEntity(
+            id="1",
+            name="News",
+            playable_url="http://news.test",
+            type=ChannelType.LIVE,
+            epg_id="news.fr",
+        )
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.assertEqual(self.storage.sync_channel_bulk([renamed]), 1)
+        self.storage.finish_sync(ChannelType.LIVE)
+        self.assertEqual(self.storage.search("news", [ChannelType.LIVE]), [renamed])
+        self.assertEqual(
+            list(self.storage.iter_channels(ChannelType.LIVE)), [[renamed]]
+        )
+
     def test_search_by_exact_name(self):
         ch = ChannelEntity(
             id="1",
@@ -147,76 +171,528 @@ class TestChannelStorageSQLite(unittest.TestCase):
         )
         self.assertIn(ch, results)
 
+    def test_search_ranks_across_types(self):
+        live = ChannelEntity(
+            id="1",
+            name="Test Channel Sports Alpha",
+            playable_url="http://1",
+            type=ChannelType.LIVE,
+        )
+        vod = ChannelEntity(
+            id="2", name="Test Sports", playable_url="http://2", type=ChannelType.VOD
+        )
+        series = ChannelEntity(
+            id="3", name="Test Sports", playable_url="", type=ChannelType.SERIES
+        )
+        self.storage.save_channel_bulk([live, vod, series])
 
-class TestChannelStoragePerformance(unittest.TestCase):
-    def setUp(self):
-        temp_db_file = tempfile.NamedTemporaryFile(delete_on_close=True)
-        self.addCleanup(lambda: os.remove(temp_db_file.name))
-        self.storage = ChannelStorageSQLite(temp_db_file.name)
-
-    def test_bulk_insert_and_search_performance_2000(self):
-        self.test_bulk_insert_and_search_performance(
-            total_channels=2000, insert_time_limit=0.1, search_time_limit=0.01
+        results = self.storage.search(
+            "test sports", [ChannelType.LIVE, ChannelType.VOD]
         )
+        self.assertEqual(results, [vod, live])
 
-    def test_bulk_insert_and_search_performance_20000(self):
-        self.test_bulk_insert_and_search_performance(
-            total_channels=20000, insert_time_limit=1, search_time_limit=0.01
+    def test_search_limit_and_offset(self):
+        channels = [
+            ChannelEntity(
+                id=str(i),
+                name="Sports " + "x" * i,
+                playable_url=f"http://{i}",
+                type=ChannelType.LIVE if i % 2 else ChannelType.VOD,
+            )
+            for i in range(1, 7)
+        ]
+        self.storage.save_channel_bulk(channels)
+
+        types = [ChannelType.LIVE, ChannelType.VOD]
+        everything = self.storage.search("sports", types)
+        self.assertEqual(len(everything), 6)
+        self.assertEqual(self.storage.search("sports", types, limit=2), everything[:2])
+        self.assertEqual(
+            self.storage.search("sports", types, limit=2, offset=3), everything[3:5]
         )
 
-    def test_bulk_insert_and_search_performance_200000(self):
-        self.test_bulk_insert_and_search_performance(
-            total_channels=200000, insert_time_limit=10, search_time_limit=0.01
+    def test_search_without_usable_tokens(self):
+        self.assertEqual(self.storage.search(" - ", [ChannelType.LIVE]), [])
+
+    def test_search_fuzzy_tolerates_typos(self):
+        sports = ChannelEntity(
+            id="1", name="Sports HD", playable_url="http://1", type=ChannelType.LIVE
+        )
+        channel = ChannelEntity(
+            id="2", name="Channel One", playable_url="http://2", type=ChannelType.VOD
         )
+        self.storage.save_channel_bulk(
+            [
+                sports,
+                channel,
+                ChannelEntity(
+                    id="3", name="News", playable_url="http://3", type=ChannelType.LIVE
+                ),
+            ]
+        )
+        types = [ChannelType.LIVE, ChannelType.VOD]
+
+        self.assertEqual(self.storage.search("spotrs", types), [])
+        self.assertEqual(self.storage.search_fuzzy("spotrs", types), [sports])
+        self.assertEqual(self.storage.search_fuzzy("chanel on", types), [channel])
+        self.assertEqual(self.storage.search_fuzzy("chanel", [ChannelType.LIVE]), [])
+        self.assertEqual(self.storage.search_fuzzy("zzzz", types), [])
 
-    def test_bulk_insert_and_search_performance(
-        self,
-        total_channels: int = 200,
-        insert_time_limit: float = 0.1,
-        search_time_limit: float = 0.01,
-    ):
-        target_channel = ChannelEntity(
-            id="test-id",
-            name="Extreme Sports Channel HD",
-            playable_url="http://localhost/test",
+    def test_search_fuzzy_finds_rare_trigrams_past_frequent_ones(self):
+        channels = [
+            ChannelEntity(
+                id=str(i),
+                name=f"Sports {i}",
+                playable_url=f"http://{i}",
+                type=ChannelType.LIVE,
+            )
+            for i in range(50)
+        ]
+        extreme = ChannelEntity(
+            id="extreme",
+            name="Extreme Sports",
+            playable_url="http://extreme",
             type=ChannelType.LIVE,
         )
+        self.storage.save_channel_bulk(channels + [extreme])
+
+        with mock.patch.object(sqlite_storage, "FUZZY_GRAM_LIMIT", 5):
+            results = self.storage.search_fuzzy("extrem sprots", [ChannelType.LIVE])
+
+        self.assertEqual(results[0], extreme)
+
+    def test_search_fuzzy_looks_up_trigrams_the_index_stems(self):
+        # The n-gram index stores "one" stemmed, as "on".
+        channel = ChannelEntity(
+            id="1", name="BBC One", playable_url="http://1", type=ChannelType.LIVE
+        )
+        self.storage.save_channel(channel)
+
+        self.assertEqual(
+            self.storage.search_fuzzy("bcc one", [ChannelType.LIVE]), [channel]
+        )
+
+    def test_cancellable_interrupts_search(self):
+        self.storage.save_channel_bulk(
+            [
+                ChannelEntity(
+                    id=str(i),
+                    name=f"Sports {i}",
+                    playable_url=f"http://{i}",
+                    type=ChannelType.LIVE,
+                )
+                for i in range(2000)
+            ]
+        )
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.storage.cancellable(lambda: True):
+                self.storage.search("sports", [ChannelType.LIVE])
+
+        results = self.storage.search("sports", [ChannelType.LIVE])
+        self.assertEqual(len(results), 2000)
+
+    def test_save_channel_twice_replaces_search_entry(self):
+        ch = ChannelEntity(
+            id="1", name="OldName", playable_url="http://1", type=ChannelType.LIVE
+        )
+        renamed = ChannelEntity(
+            id="1", name="NewName", playable_url="http://1", type=ChannelType.LIVE
+        )
+        self.storage.save_channel(ch)
+        self.storage.save_channel(renamed)
+
+        self.assertEqual(
+            self.storage.search_by_name_and_type("oldname", ChannelType.LIVE), []
+        )
+        self.assertEqual(
+            self.storage.search_by_name_and_type("newname", ChannelType.LIVE),
+            [renamed],
+        )
+
+    def test_repeated_search_is_cached_until_write(self):
+        first = ChannelEntity(
+            id="1", name="Sports One", playable_url="http://1", type=ChannelType.LIVE
+        )
+        second = ChannelEntity(
+            id="2", name="Sports Two", playable_url="http://2", type=ChannelType.LIVE
+        )
+        self.storage.save_channel(first)
+
+        self.assertEqual(self.storage.search("sports", [ChannelType.LIVE]), [first])
+        hits = self.storage.query_cache.hits
+        self.assertEqual(self.storage.search("Sports", [ChannelType.LIVE]), [first])
+        self.assertEqual(self.storage.query_cache.hits, hits + 1)
 
-        # Generate random dummy channels
-        dummy_channels = [
+        self.storage.save_channel(second)
+        self.assertEqual(self.storage.count("sports", [ChannelType.LIVE]), 2)
+        self.assertEqual(len(self.storage.search("sports", [ChannelType.LIVE])), 2)
+
+    def test_generate_ngrams_batch_matches_single(self):
+        names = ["Sports HD", "", "BBC-One!", "Sports HD", "a  b"]
+        self.assertEqual(
+            generate_ngrams_batch(names), [generate_ngrams(n) for n in names]
+        )
+
+    def test_bulk_save_spanning_batches(self):
+        self.storage.save_channel(
+            ChannelEntity(
+                id="0", name="Old", playable_url="http://0", type=ChannelType.LIVE
+            )
+        )
+        channels = [
             ChannelEntity(
-                id=f"dummy-{i}",
-                name=random_channel_name(),
-                playable_url=f"http://localhost/{i}",
+                id=str(i % 9),
+                name=f"Sports {i}",
+                playable_url=f"http://{i}",
                 type=ChannelType.LIVE,
             )
-            for i in range(total_channels)
+            for i in range(12)
         ]
+        with mock.patch.object(sqlite_storage, "INGEST_BATCH_SIZE", 2):
+            self.storage.save_channel_bulk(channels)
+
+        self.assertEqual(len(self.storage.search("sports", [ChannelType.LIVE])), 9)
+        self.assertEqual(self.storage.search("old", [ChannelType.LIVE]), [])
+        self.assertEqual(self.storage.get_channel("0").name, "Sports 9")
+
+    def test_bulk_load_indexes_once_on_exit(self):
+        live = [ChannelType.LIVE]
+        for i, name in ((1, "Old Sports"), (2, "Dropped Sports")):
+            self.storage.save_channel(
+                ChannelEntity(
+                    id=str(i), name=name, playable_url="http://", type=ChannelType.LIVE
+                )
+            )
+        with self.storage.bulk_load():
+            self.storage.begin_sync(ChannelType.LIVE)
+            self.storage.sync_channel_bulk(
+                [
+                    ChannelEntity(
+                        id=str(i),
+                        name=f"News {i}",
+                        playable_url="http://",
+                        type=ChannelType.LIVE,
+                    )
+                    for i in (1, 3)
+                ]
+            )
+            self.storage.finish_sync(ChannelType.LIVE)
 
-        # Insert dummy + target channel in one bulk op
-        all_channels = dummy_channels + [target_channel]
+        self.assertEqual(self.storage.search("sports", live), [])
+        self.assertEqual(
+            sorted(ch.id for ch in self.storage.search("news", live)), ["1", "3"]
+        )
+        self.storage.save_channel(
+            ChannelEntity(
+                id="4", name="News 4", playable_url="http://", type=ChannelType.LIVE
+            )
+        )
+        self.assertEqual(self.storage.count("news", live), 3)
+
+    def test_sync_waits_for_a_write_committed_by_another_connection(self):
+        other = type(self.storage)(self.storage.filepath)
+        health = StreamHealth("1", ChannelType.LIVE, True, 12.5, time.time())
+        writer = threading.Thread(target=other.save_stream_health, args=([health],))
+        write_batches = self.storage._write_batches
+
+        def write_during_sync(cursor, batches):
+            # The other write commits here unless this sync holds the lock.
+            writer.start()
+            writer.join(0.5)
+            write_batches(cursor, batches)
+
+        self.storage.begin_sync(ChannelType.LIVE)
+        with mock.patch.object(self.storage, "_write_batches", write_during_sync):
+            written = self.storage.sync_channel_bulk(
+                [
+                    ChannelEntity(
+                        id="1",
+                        name="News",
+                        playable_url="http://",
+                        type=ChannelType.LIVE,
+                    )
+                ]
+            )
+        writer.join()
+        self.storage.finish_sync(ChannelType.LIVE)
 
-        start_insert = time.perf_counter()
-        self.storage.save_channel_bulk(all_channels)
-        duration_insert = time.perf_counter() - start_insert
+        self.assertEqual(written, 1)
+        channel = self.storage.get_channel("1")
+        self.assertEqual(self.storage.get_stream_health([channel]), {channel: health})
 
-        self.assertLess(
-            duration_insert,
-            insert_time_limit,
-            f"Bulk insert took too long: {duration_insert:.2f}s",
+    def test_failed_write_in_bulk_load_is_rolled_back(self):
+        self.storage.save_channel(
+            ChannelEntity(
+                id="1", name="Sports 1", playable_url="http://", type=ChannelType.LIVE
+            )
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "provider went away"):
+            with self.storage.bulk_load():
+                self.storage.save_channel(
+                    ChannelEntity(
+                        id="2",
+                        name="Sports 2",
+                        playable_url="http://",
+                        type=ChannelType.LIVE,
+                    )
+                )
+                with mock.patch.object(
+                    self.storage,
+                    "_write_batches",
+                    side_effect=RuntimeError("provider went away"),
+                ):
+                    self.storage.save_channel(
+                        ChannelEntity(
+                            id="3",
+                            name="Sports 3",
+                            playable_url="http://",
+                            type=ChannelType.LIVE,
+                        )
+                    )
+
+        self.assertFalse(self.storage.conn.in_transaction)
+        self.assertEqual(self.storage.count("sports", [ChannelType.LIVE]), 2)
+        self.storage.save_channel(
+            ChannelEntity(
+                id="4", name="Sports 4", playable_url="http://", type=ChannelType.LIVE
+            )
+        )
+        self.assertEqual(self.storage.count("sports", [ChannelType.LIVE]), 3)
+
+    def test_interrupted_bulk_load_leaves_index_config_unchanged(self):
+        def index_config():
+            conn = sqlite3.connect(self.storage.filepath)
+            self.addCleanup(conn.close)
+            tables = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE '%\\_config' ESCAPE '\\'"
+            ).fetchall()
+            return {
+                name: conn.execute(f"SELECT * FROM {name}").fetchall()
+                for (name,) in tables
+            }
+
+        before = index_config()
+        with self.storage.bulk_load():
+            self.storage.save_channel(
+                ChannelEntity(
+                    id="1", name="Sports", playable_url="http://", type=ChannelType.LIVE
+                )
+            )
+            # What a process killed here would leave behind.
+            self.assertEqual(index_config(), before)
+
+    def test_sync_writes_only_changed_and_drops_missing(self):
+        kept = ChannelEntity(
+            id="1", name="Kept", playable_url="http://1", type=ChannelType.LIVE
+        )
+        changed = ChannelEntity(
+            id="2", name="Before", playable_url="http://2", type=ChannelType.LIVE
+        )
+        dropped = ChannelEntity(
+            id="3", name="Dropped", playable_url="http://3", type=ChannelType.LIVE
+        )
+        self.storage.save_channel_bulk([kept, changed, dropped])
+        self.assertIsNone(self.storage.get_last_sync(ChannelType.LIVE))
+
+        changed = ChannelEntity(
+            id="2", name="After", playable_url="http://2", type=ChannelType.LIVE
+        )
+        added = ChannelEntity(
+            id="4", name="Added", playable_url="http://4", type=ChannelType.LIVE
+        )
+        self.storage.begin_sync(ChannelType.LIVE)
+        written = self.storage.sync_channel_bulk([kept, changed, added])
+        deleted = self.storage.finish_sync(ChannelType.LIVE)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(deleted, 1)
+        self.assertIsNone(self.storage.get_channel("3"))
+        self.assertEqual(self.storage.get_channel("2"), changed)
+        self.assertEqual(
+            self.storage.search_by_name_and_type("after", ChannelType.LIVE), [changed]
+        )
+        self.assertEqual(
+            self.storage.search_by_name_and_type("dropped", ChannelType.LIVE), []
+        )
+        self.assertIsNotNone(self.storage.get_last_sync(ChannelType.LIVE))
+
+    def test_iter_channels_pages_through_one_type(self):
+        channels = [
+            ChannelEntity(id=str(i), name=f"Ch {i}", playable_url=f"http://{i}", type=t)
+            for i, t in enumerate([ChannelType.LIVE] * 5 + [ChannelType.VOD])
+        ]
+        self.storage.save_channel_bulk(channels)
+
+        batches = list(self.storage.iter_channels(ChannelType.LIVE, batch_size=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([ch for batch in batches for ch in batch], channels[:5])
+
+    def test_sync_lock_is_exclusive_between_storages_of_one_file(self):
+        other = type(self.storage)(self.storage.filepath)
+        self.addCleanup(lambda: os.remove(f"{self.storage.filepath}.lock"))
+
+        with self.storage.sync_lock() as granted:
+            with other.sync_lock() as other_granted:
+                self.assertTrue(granted)
+                self.assertFalse(other_granted)
+        with other.sync_lock() as other_granted:
+            self.assertTrue(other_granted)
+
+    def test_sync_lock_is_refused_when_lock_file_cannot_be_opened(self):
+        os.mkdir(f"{self.storage.filepath}.lock")
+        self.addCleanup(os.rmdir, f"{self.storage.filepath}.lock")
+
+        with self.assertLogs(sqlite_storage.logger, "WARNING"):
+            with self.storage.sync_lock() as granted:
+                self.assertFalse(granted)
+
+    def test_new_database_and_lock_files_are_group_writable(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "shared.db")
+        storage = type(self.storage)(path)
+        with storage.sync_lock():
+            pass
+
+        for name in ("shared.db", "shared.db-wal", "shared.db-shm", "shared.db.lock"):
+            mode = os.stat(os.path.join(directory.name, name)).st_mode
+            self.assertTrue(mode & stat.S_IWGRP, name)
+
+    def test_cached_results_follow_writes_of_other_connections(self):
+        other = type(self.storage)(self.storage.filepath)
+        self.assertEqual(self.storage.count("lorem", [ChannelType.LIVE]), 0)
+
+        other.save_channel(
+            ChannelEntity(
+                id="1", name="Lorem TV", playable_url="http://1", type=ChannelType.LIVE
+            )
+        )
+
+        self.assertEqual(self.storage.count("lorem", [ChannelType.LIVE]), 1)
+
+    def test_url_prefix_is_stored_once_and_shared(self):
+        prefix = "http://provider.test/live/user/pass/"
+        channels = [
+            ChannelEntity(
+                id=str(i),
+                name=f"Channel {i}",
+                playable_url=f"{prefix}{i}.ts",
+                type=ChannelType.LIVE,
+            )
+            for i in range(3)
+        ]
+        self.storage.save_channel_bulk(channels)
+
+        found = self.storage.search("channel", [ChannelType.LIVE])
+        self.assertCountEqual(found, channels)
+        self.assertEqual(
+            {ch.playable_url for ch in found}, {f"{prefix}{i}.ts" for i in range(3)}
+        )
+        self.assertTrue(all(ch.url_prefix is found[0].url_prefix for ch in found))
+        conn = sqlite3.connect(self.storage.filepath)
+        self.addCleanup(conn.close)
+        self.assertEqual(
+            conn.execute("SELECT prefix FROM url_prefixes").fetchall(), [(prefix,)]
+        )
+        self.assertEqual(
+            conn.execute(
+                "SELECT DISTINCT url_suffix FROM channels_live WHERE url_suffix LIKE '%pass%'"
+            ).fetchall(),
+            [],
+        )
+
+    def test_sync_leaves_other_types_untouched(self):
+        vod = ChannelEntity(
+            id="9", name="Movie", playable_url="http://9", type=ChannelType.VOD
+        )
+        self.storage.save_channel(vod)
+
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.storage.finish_sync(ChannelType.LIVE)
+
+        self.assertEqual(self.storage.get_channel("9"), vod)
+
+    def test_series_episodes_are_cached_and_dropped_with_series(self):
+        series = ChannelEntity(
+            id="7", name="Show", playable_url="", type=ChannelType.SERIES
+        )
+        episodes = [
+            ChannelEntity(
+                id=str(i),
+                name=f"Show E{i}",
+                playable_url=f"http://ep/{i}",
+                type=ChannelType.SERIES,
+            )
+            for i in (3, 1, 2)
+        ]
+        self.storage.save_channel(series)
+        self.assertIsNone(self.storage.get_series_episodes("7"))
+
+        self.storage.save_series_episodes("7", episodes)
+        self.assertEqual(self.storage.get_series_episodes("7"), episodes)
+        self.assertIsNone(self.storage.get_series_episodes("7", max_age=0))
+
+        self.storage.begin_sync(ChannelType.SERIES)
+        self.storage.finish_sync(ChannelType.SERIES)
+        self.assertIsNone(self.storage.get_series_episodes("7"))
+
+    def test_stream_health_is_cached_and_dropped_with_channel(self):
+        kept, dropped = (
+            ChannelEntity(
+                id=id_, name=id_, playable_url=f"http://{id_}", type=ChannelType.LIVE
+            )
+            for id_ in ("1", "2")
+        )
+        now = time.time()
+        results = [
+            StreamHealth("1", ChannelType.LIVE, True, 12.5, now),
+            StreamHealth("2", ChannelType.LIVE, False, None, now - 600, "HTTP 404"),
+        ]
+        self.storage.save_channel_bulk([kept, dropped])
+        self.storage.save_stream_health(results)
+
+        self.assertEqual(
+            self.storage.get_stream_health([kept, dropped]),
+            {kept: results[0], dropped: results[1]},
         )
+        self.assertEqual(
+            self.storage.get_stream_health([kept, dropped], max_age=60),
+            {kept: results[0]},
+        )
+
+        self.storage.begin_sync(ChannelType.LIVE)
+        self.storage.sync_channel_bulk([kept])
+        self.storage.finish_sync(ChannelType.LIVE)
+        self.assertEqual(
+            self.storage.get_stream_health([kept, dropped]), {kept: results[0]}
+        )
+
 
-        # Search by partial multiword name
-        start_search = time.perf_counter()
-        results = self.storage.search_by_name_and_type("sports hd", ChannelType.LIVE)
-        duration_search = time.perf_counter() - start_search
+class TestChannelStorageSQLiteTrigram(TestChannelStorageSQLite):
+    def setUp(self):
+        temp_db_file = tempfile.NamedTemporaryFile(delete=False)
+        self.addCleanup(lambda: os.remove(temp_db_file.name))
+        self.storage = ChannelStorageSQLiteTrigram(temp_db_file.name)
 
-        self.assertLess(
-            duration_search,
-            search_time_limit,
-            f"Search took too long: {duration_search:.3f}s",
+    def test_search_by_inner_substring(self):
+        ch = ChannelEntity(
+            id="1", name="Eurosport 2", playable_url="http://1", type=ChannelType.LIVE
         )
-        self.assertTrue(
-            any(r.id == target_channel.id for r in results),
-            "Target channel not found in search results",
+        self.storage.save_channel(ch)
+
+        self.assertEqual(self.storage.search("rospo", [ChannelType.LIVE]), [ch])
+        self.assertEqual(self.storage.search("rospo 2", [ChannelType.LIVE]), [ch])
+        self.assertEqual(self.storage.search("ro", [ChannelType.LIVE]), [ch])
+        self.assertEqual(self.storage.search("rosa", [ChannelType.LIVE]), [])
+
+    def test_switching_engine_rebuilds_database(self):
+        self.storage.save_channel(
+            ChannelEntity(
+                id="1", name="Sports", playable_url="http://1", type=ChannelType.LIVE
+            )
         )
+        storage = ChannelStorageSQLite(self.storage.filepath)
+        self.assertIsNone(storage.get_channel("1"))
+        self.assertEqual(storage.search("sports", [ChannelType.LIVE]), [])
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services.sync import CatalogSyncService
+
+CHANNELS = 2000
+BATCHES = 5
+READERS = 3
+
+
+def catalog(prefix: str):
+    return [
+        ChannelEntity(
+            id=str(i),
+            name=f"{prefix} Channel {i}",
+            playable_url=f"http://fake/live/{i}.ts",
+            type=ChannelType.LIVE,
+        )
+        for i in range(CHANNELS)
+    ]
+
+
+def search_until_stopped(path, ready, stop, results):
+    """Search the shared catalog in a loop; report timings and what was seen."""
+    storage = ChannelStorageSQLite(path)
+    searches, errors, empty = [], 0, 0
+    ready.put(os.getpid())
+    while not stop.is_set():
+        started = time.time()
+        try:
+            if not storage.search("channel", [ChannelType.LIVE], limit=30):
+                empty += 1
+            storage.count("renamed", [ChannelType.LIVE])
+        except Exception:
+            errors += 1
+        searches.append((started, time.time()))
+    results.put(
+        {
+            "searches": searches,
+            "errors": errors,
+            "empty": empty,
+            "renamed": storage.count("renamed", [ChannelType.LIVE]),
+        }
+    )
+
+
+def try_sync(path, results):
+    storage = ChannelStorageSQLite(path)
+    sync = CatalogSyncService(storage, SlowSource("Other"), ttl=0)
+    results.put(sync.sync([ChannelType.LIVE]))
+
+
+class SlowSource(BaseChannelRetrieval):
+    """Yields a catalog in batches, running on_batch after the first one."""
+
+    def __init__(self, prefix, on_batch=None):
+        self.prefix = prefix
+        self.on_batch = on_batch
+
+    def retreive_channels_by_type(self, channel_type, page_size):
+        channels = catalog(self.prefix)
+        size = len(channels) // BATCHES
+        for start in range(0, len(channels), size):
+            yield channels[start : start + size]
+            if self.on_batch is not None:
+                self.on_batch()
+                self.on_batch = None
+            time.sleep(0.1)
+
+    def retreive_series_episodes(self, series_id):
+        return []
+
+
+class TestSharedDatabaseProcesses(unittest.TestCase):
+    def test_one_process_syncs_while_others_keep_searching(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "catalog.db")
+        storage = ChannelStorageSQLite(path)
+        CatalogSyncService(storage, SlowSource("Original"), ttl=3600).sync(
+            [ChannelType.LIVE]
+        )
+
+        context = multiprocessing.get_context("spawn")
+        ready, results, stop = context.Queue(), context.Queue(), context.Event()
+        readers = [
+            context.Process(
+                target=search_until_stopped, args=(path, ready, stop, results)
+            )
+            for _ in range(READERS)
+        ]
+        for reader in readers:
+            reader.start()
+        for _ in readers:
+            ready.get(timeout=60)
+
+        def second_writer():
+            writer = context.Process(target=try_sync, args=(path, results))
+            writer.start()
+            writer.join(timeout=60)
+
+        sync_started = time.time()
+        ok = CatalogSyncService(
+            storage, SlowSource("Renamed", on_batch=second_writer), ttl=3600
+        ).sync([ChannelType.LIVE], force=True)
+        sync_finished = time.time()
+        # The second writer found the lock taken and returned without syncing.
+        self.assertTrue(results.get(timeout=60))
+
+        stop.set()
+        reports = [results.get(timeout=60) for _ in readers]
+        for reader in readers:
+            reader.join(timeout=60)
+
+        self.assertTrue(ok)
+        self.assertEqual(storage.count("other", [ChannelType.LIVE]), 0)
+        for report in reports:
+            self.assertEqual(report["errors"], 0)
+            self.assertEqual(report["empty"], 0)
+            during_sync = [
+                (started, finished)
+                for started, finished in report["searches"]
+                if sync_started <= started and finished <= sync_finished
+            ]
+            self.assertGreater(len(during_sync), 5)
+            self.assertEqual(report["renamed"], CHANNELS)
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from pyiptv.dao.programme_storage.sqlite import ProgrammeStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.programme import GuideChannel, Programme
+from pyiptv.enum.channel_type import ChannelType
+
+NOW = 1_700_000_000
+
+
+def live(name: str, epg_id: str = "") -> ChannelEntity:
+    return ChannelEntity(
+        id=name,
+        name=name,
+        playable_url="http://x/1.ts",
+        type=ChannelType.LIVE,
+        epg_id=epg_id,
+    )
+
+
+def guide():
+    yield GuideChannel(id="news", names=["News HD"])
+    yield GuideChannel(id="film", names=["Film Channel"])
+    for hour in range(-2, 3):
+        yield Programme(
+            channel="news",
+            start=NOW + hour * 3600,
+            stop=NOW + (hour + 1) * 3600,
+            title=f"News {hour}",
+        )
+    # Nothing on right now, only later.
+    yield Programme(channel="film", start=NOW + 600, stop=NOW + 7200, title="Film")
+
+
+class TestProgrammeStorageSQLite(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ProgrammeStorageSQLite(os.path.join(directory.name, "epg.db"))
+
+    def test_now_next_in_one_lookup(self):
+        self.assertEqual(self.storage.replace_guide(guide()), 6)
+
+        news, film, other = self.storage.now_next(
+            [live("news hd"), live("FILM  Channel!"), live("Other")], now=NOW + 60
+        )
+
+        self.assertEqual((news[0].title, news[1].title), ("News 0", "News 1"))
+        self.assertEqual((film[0], film[1].title), (None, "Film"))
+        self.assertEqual(other, (None, None))
+        self.assertIsNotNone(self.storage.get_last_update())
+
+    def test_channels_are_matched_by_epg_id_before_name(self):
+        self.storage.replace_guide(guide())
+
+        provider_named, unknown_id, misnamed = self.storage.now_next(
+            [
+                live("UK: NEWS FHD", epg_id="News"),
+                live("Film Channel", epg_id="film.fr"),
+                live("News HD", epg_id="film"),
+            ],
+            now=NOW + 60,
+        )
+
+        self.assertEqual(provider_named[0].title, "News 0")
+        self.assertEqual(unknown_id[1].title, "Film")
+        self.assertEqual(misnamed[1].title, "Film")
+
+    def test_failed_replace_keeps_previous_guide(self):
+        self.storage.replace_guide(guide())
+
+        def broken():
+            yield GuideChannel(id="news", names=["News HD"])
+            raise OSError("connection reset")
+
+        with self.assertRaises(OSError):
+            self.storage.replace_guide(broken())
+        ((current, _),) = self.storage.now_next([live("News HD")], now=NOW + 60)
+        self.assertEqual(current.title, "News 0")
@@ -0,0 +1,114 @@
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+
+from pyiptv.players.vlc import VLCPlayer, VLCRemotePlayer
+
+# Stands in for VLC: serves the RC interface on --rc-unix, logging commands.
+FAKE_VLC = """\
+import os, socket, sys
+
+log = open(os.environ["FAKE_VLC_LOG"], "a", buffering=1)
+log.write("started\\n")
+path = sys.argv[sys.argv.index("--rc-unix") + 1]
+server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+server.bind(path)
+server.listen(1)
+conn, _ = server.accept()
+conn.sendall(b"VLC media player (fake)\\n> ")
+playing = "0"
+for line in conn.makefile("r"):
+    command = line.strip()
+    log.write(command + "\\n")
+    if command == "quit":
+        break
+    if command.startswith("add "):
+        playing = "1"
+    elif command == "stop":
+        playing = "0"
+    reply = playing + "\\n" if command == "is_playing" else ""
+    conn.sendall(reply.encode() + b"> ")
+"""
+
+
+class TestVLCRemotePlayer(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.vlc_path = os.path.join(directory.name, "vlc")
+        with open(self.vlc_path, "w") as f:
+            f.write(f"#!{sys.executable}\n{FAKE_VLC}")
+        os.chmod(self.vlc_path, os.stat(self.vlc_path).st_mode | stat.S_IEXEC)
+        self.log_path = os.path.join(directory.name, "commands.log")
+        os.environ["FAKE_VLC_LOG"] = self.log_path
+        self.addCleanup(os.environ.pop, "FAKE_VLC_LOG")
+
+    def commands(self):
+        with open(self.log_path) as f:
+            return f.read().splitlines()
+
+    def wait_for(self, command):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(self.log_path) and command in self.commands():
+                return
+            time.sleep(0.01)
+        self.fail(f"VLC never received {command!r}")
+
+    def test_switches_channels_in_one_process(self):
+        player = VLCRemotePlayer(vlc_path=self.vlc_path)
+        self.addCleanup(player.stop)
+        player.start()
+
+        started = time.perf_counter()
+        player.play("http://provider.test/1.ts")
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.wait_for("add http://provider.test/1.ts")
+        player.play("http://provider.test/2.ts")
+        self.wait_for("add http://provider.test/2.ts")
+        player.stop()
+
+        commands = self.commands()
+        self.assertEqual(commands.count("started"), 1)
+        self.assertEqual(commands[-1], "quit")
+        self.assertIsNone(player.process)
+
+    def test_refuses_urls_that_would_inject_commands(self):
+        player = VLCRemotePlayer(vlc_path=self.vlc_path)
+        self.addCleanup(player.stop)
+        player.start()
+
+        with self.assertLogs("pyiptv.players.vlc", "ERROR"):
+            player.play("http://provider.test/1.ts\nshutdown")
+        player.play("http://provider.test/2.ts")
+        self.wait_for("add http://provider.test/2.ts")
+        player.stop()
+
+        self.assertNotIn("shutdown", self.commands())
+        self.assertNotIn("add http://provider.test/1.ts", self.commands())
+
+    def test_stop_during_a_switch_quits_without_restarting(self):
+        player = VLCRemotePlayer(vlc_path=self.vlc_path)
+        self.addCleanup(player.stop)
+        player.start()
+        player.play("http://provider.test/1.ts")
+        self.wait_for("stop")
+
+        with self.assertNoLogs("pyiptv.players.vlc", "ERROR"):
+            player.stop()
+
+        self.assertEqual(self.commands().count("started"), 1)
+        self.assertFalse(player._worker.is_alive())
+        self.assertIsNone(player.process)
+
+    def test_falls_back_to_a_process_per_channel(self):
+        player = VLCRemotePlayer(vlc_path="/nonexistent/vlc")
+        self.addCleanup(player.stop)
+
+        with self.assertLogs("pyiptv.players.vlc", "ERROR"):
+            player.play("http://provider.test/1.ts")
+            player._worker.join(0.5)
+        self.assertIsInstance(player.fallback, VLCPlayer)
@@ -0,0 +1,105 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services.batch import BatchService
+from pyiptv.services.sync import CATALOG_TYPES, CatalogSyncService
+
+
+class FakeSource(BaseChannelRetrieval):
+    def __init__(self):
+        self.calls = 0
+
+    def retreive_channels_by_type(self, channel_type, page_size):
+        self.calls += 1
+        if channel_type == ChannelType.LIVE:
+            yield [
+                ChannelEntity(
+                    id="1",
+                    name="BBC One",
+                    playable_url="http://fake/live/1.ts",
+                    type=channel_type,
+                ),
+                ChannelEntity(
+                    id="2",
+                    name="Sky Sports",
+                    playable_url="http://fake/live/2.ts",
+                    type=channel_type,
+                ),
+            ]
+        elif channel_type == ChannelType.SERIES:
+            yield [
+                ChannelEntity(
+                    id="s1", name="The Office", playable_url="", type=channel_type
+                )
+            ]
+
+    def retreive_series_episodes(self, series_id):
+        return []
+
+
+class TestBatchService(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ChannelStorageSQLite(os.path.join(directory.name, "c.db"))
+        self.source = FakeSource()
+        self.output = io.StringIO()
+        self.batch = BatchService(
+            self.storage,
+            CatalogSyncService(self.storage, self.source, ttl=3600),
+            output=self.output,
+        )
+
+    def lines(self):
+        lines = self.output.getvalue().splitlines()
+        self.output.seek(0)
+        self.output.truncate()
+        return lines
+
+    def test_sync_then_search_get_and_export(self):
+        self.assertTrue(self.batch.sync(CATALOG_TYPES))
+        self.assertTrue(all(json.loads(line)["fresh"] for line in self.lines()))
+        self.assertTrue(self.batch.sync(CATALOG_TYPES))
+        self.assertEqual(self.source.calls, 3)
+        self.lines()
+
+        self.assertEqual(self.batch.search("sports", CATALOG_TYPES, as_json=True), 1)
+        self.assertEqual(
+            [json.loads(line) for line in self.lines()],
+            [
+                {
+                    "id": "2",
+                    "name": "Sky Sports",
+                    "type": "live",
+                    "url": "http://fake/live/2.ts",
+                    "provider": "",
+                }
+            ],
+        )
+
+        self.assertTrue(self.batch.get("1"))
+        self.assertFalse(self.batch.get("404"))
+        self.assertEqual(self.lines(), ["http://fake/live/1.ts"])
+
+        self.assertEqual(self.batch.export(CATALOG_TYPES), 3)
+        self.assertEqual(
+            [json.loads(line)["id"] for line in self.lines()], ["1", "2", "s1"]
+        )
+        self.assertEqual(self.batch.export(CATALOG_TYPES, output_format="m3u"), 2)
+        self.assertEqual(
+            self.lines(),
+            [
+                "#EXTM3U",
+                '#EXTINF:-1 tvg-id="1" group-title="live",BBC One',
+                "http://fake/live/1.ts",
+                '#EXTINF:-1 tvg-id="2" group-title="live",Sky Sports',
+                "http://fake/live/2.ts",
+            ],
+        )
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from pyiptv.services.search_scheduler import SearchScheduler
+
+
+class TestSearchScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_debounces_to_latest_query(self):
+        searched = []
+        results = []
+        scheduler = SearchScheduler(
+            search=lambda query, _: searched.append(query) or query.upper(),
+            on_result=lambda query, result: results.append((query, result)),
+            debounce=0.02,
+        )
+        for prefix in ("s", "sp", "spo", "spor"):
+            scheduler.submit(prefix)
+        await asyncio.sleep(0.1)
+        scheduler.shutdown()
+
+        self.assertEqual(searched, ["spor"])
+        self.assertEqual(results, [("spor", "SPOR")])
+
+    async def test_superseded_running_query_is_cancelled_and_discarded(self):
+        started = threading.Event()
+        cancelled = threading.Event()
+        results = []
+
+        def search(query, is_cancelled):
+            if query == "slow":
+                started.set()
+                while not is_cancelled():
+                    time.sleep(0.001)
+                cancelled.set()
+                raise RuntimeError("interrupted")
+            return query
+
+        scheduler = SearchScheduler(
+            search=search,
+            on_result=lambda query, result: results.append(result),
+            on_error=lambda query: results.append(f"error: {query}"),
+            debounce=0,
+        )
+        scheduler.submit("slow")
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        scheduler.submit("fast")
+        await asyncio.sleep(0.1)
+        scheduler.shutdown()
+
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(results, ["fast"])
+
+    async def test_search_runs_off_the_event_loop(self):
+        threads = []
+        scheduler = SearchScheduler(
+            search=lambda query, _: threads.append(threading.get_ident()),
+            on_result=lambda query, result: None,
+            debounce=0,
+        )
+        scheduler.submit("x")
+        await asyncio.sleep(0.05)
+        scheduler.shutdown()
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
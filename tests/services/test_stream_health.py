@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+import unittest
+
+from pyiptv.dao.channel_storage.memory import ChannelStorageMemory
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.dto.stream_health import StreamHealth
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services.stream_health import StreamHealthService
+
+
+class FakeProber:
+    def __init__(self):
+        self.probed = []
+
+    def probe_all(self, channels):
+        for channel in channels:
+            self.probed.append(channel.id)
+            yield StreamHealth(channel.id, channel.type, True, 10.0, time.time())
+
+
+class TestStreamHealthService(unittest.TestCase):
+    def test_only_channels_without_fresh_result_are_probed(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = ChannelStorageMemory(os.path.join(directory.name, "catalog.idx"))
+        channels = [
+            ChannelEntity(
+                id=str(i),
+                name=str(i),
+                playable_url=f"http://{i}",
+                type=ChannelType.LIVE,
+            )
+            for i in range(3)
+        ]
+        storage.save_channel_bulk(channels)
+        storage.save_stream_health(
+            [
+                StreamHealth("0", ChannelType.LIVE, False, None, time.time()),
+                StreamHealth("1", ChannelType.LIVE, True, 5.0, time.time() - 3600),
+            ]
+        )
+        prober = FakeProber()
+        service = StreamHealthService(storage, prober, ttl=60)
+
+        health = service.check(channels)
+
+        self.assertEqual(prober.probed, ["1", "2"])
+        self.assertEqual([health[ch].alive for ch in channels], [False, True, True])
+        self.assertEqual(service.cached(channels), health)
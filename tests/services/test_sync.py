@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from pyiptv.dao.channel_retreival.base import BaseChannelRetrieval
+from pyiptv.dao.channel_storage.memory import ChannelStorageMemory
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dao.channel_storage.sqlite_trigram import ChannelStorageSQLiteTrigram
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services.sync import CatalogSyncService
+
+
+class PagedSource(BaseChannelRetrieval):
+    """Two pages of sports channels, counting search hits between them."""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.hits_between_pages = []
+
+    def retreive_channels_by_type(self, channel_type, page_size):
+        for page in range(2):
+            yield [
+                ChannelEntity(
+                    id=f"{page}-{i}",
+                    name=f"Sports {page} {i}",
+                    playable_url=f"http://fake/{page}/{i}.ts",
+                    type=channel_type,
+                )
+                for i in range(3)
+            ]
+            self.hits_between_pages.append(
+                self.storage.count("sports", [ChannelType.LIVE])
+            )
+
+    def retreive_series_episodes(self, series_id):
+        return []
+
+
+class TestCatalogSyncService(unittest.TestCase):
+    def storages(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        yield ChannelStorageSQLite(os.path.join(directory.name, "ngram.db"))
+        yield ChannelStorageSQLiteTrigram(os.path.join(directory.name, "trigram.db"))
+        yield ChannelStorageMemory(os.path.join(directory.name, "catalog.idx"))
+
+    def test_first_sync_is_searchable_page_by_page(self):
+        for storage in self.storages():
+            with self.subTest(engine=storage.engine):
+                source = PagedSource(storage)
+                sync = CatalogSyncService(storage, source, ttl=3600)
+
+                self.assertTrue(sync.sync([ChannelType.LIVE]))
+
+                self.assertEqual(source.hits_between_pages, [3, 6])
+
+    def test_bulk_first_sync_is_searchable_once_complete(self):
+        for storage in self.storages():
+            with self.subTest(engine=storage.engine):
+                source = PagedSource(storage)
+                sync = CatalogSyncService(
+                    storage, source, ttl=3600, bulk_first_sync=True
+                )
+
+                self.assertTrue(sync.sync([ChannelType.LIVE]))
+
+                self.assertEqual(storage.count("sports", [ChannelType.LIVE]), 6)
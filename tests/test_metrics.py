@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pyiptv.dao.channel_storage.sqlite import ChannelStorageSQLite
+from pyiptv.dto.channel import ChannelEntity
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.metrics import Metrics, MetricsExporter, metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def test_snapshot_and_prometheus_text(self):
+        registry = Metrics()
+        registry.increment("search_rows_total", 30, engine="ngram")
+        registry.increment("search_rows_total", 12, engine="ngram")
+        for seconds in (0.002, 0.004, 0.3):
+            registry.observe("search_seconds", seconds, engine="ngram", kind="search")
+
+        snapshot = registry.snapshot()
+        self.assertEqual(
+            snapshot["counters"],
+            [{"name": "search_rows_total", "labels": {"engine": "ngram"}, "value": 42}],
+        )
+        (timer,) = snapshot["timers"]
+        self.assertEqual(timer["count"], 3)
+        self.assertEqual(timer["max_ms"], 300.0)
+        self.assertEqual(timer["p50_ms"], 5.0)
+
+        text = registry.prometheus()
+        self.assertIn('pyiptv_search_rows_total{engine="ngram"} 42\n', text)
+        self.assertIn(
+            'pyiptv_search_seconds_bucket{engine="ngram",kind="search",le="0.005"} 2\n',
+            text,
+        )
+        self.assertIn(
+            'pyiptv_search_seconds_bucket{engine="ngram",kind="search",le="+Inf"} 3\n',
+            text,
+        )
+        self.assertIn(
+            'pyiptv_search_seconds_count{engine="ngram",kind="search"} 3', text
+        )
+
+    def test_exporter_writes_json_or_prometheus_by_suffix(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        registry = Metrics()
+        registry.increment("retrieval_bytes_total", 1024, source="m3u")
+        for name in ("metrics.json", "metrics.prom"):
+            exporter = MetricsExporter(
+                os.path.join(directory.name, name), interval=60, registry=registry
+            )
+            exporter.start()
+            exporter.stop()
+
+        with open(os.path.join(directory.name, "metrics.json")) as f:
+            self.assertEqual(json.load(f)["counters"][0]["value"], 1024)
+        with open(os.path.join(directory.name, "metrics.prom")) as f:
+            self.assertIn('pyiptv_retrieval_bytes_total{source="m3u"} 1024', f.read())
+
+    def test_storage_records_ingest_and_search(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        temp_db_file = tempfile.NamedTemporaryFile(delete=False)
+        self.addCleanup(lambda: os.remove(temp_db_file.name))
+        storage = ChannelStorageSQLite(temp_db_file.name)
+        storage.save_channel_bulk(
+            [
+                ChannelEntity(
+                    id=str(i),
+                    name=f"Sports {i}",
+                    playable_url=f"http://{i}",
+                    type=ChannelType.LIVE,
+                )
+                for i in range(5)
+            ]
+        )
+        storage.search("sports", [ChannelType.LIVE], limit=3)
+        storage.search("sports", [ChannelType.LIVE], limit=3)
+
+        self.assertEqual(metrics.counter("ingest_rows_total", engine="ngram"), 5)
+        self.assertEqual(metrics.counter("search_rows_total", engine="ngram"), 6)
+        self.assertEqual(metrics.counter("search_cache_hits_total", engine="ngram"), 1)
+        timers = {t["name"]: t for t in metrics.snapshot()["timers"]}
+        self.assertEqual(timers["search_seconds"]["count"], 2)
+        self.assertEqual(timers["ngram_seconds"]["count"], 1)
+        self.assertEqual(timers["commit_seconds"]["count"], 1)
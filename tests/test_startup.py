@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import List, Set
+
+# Modules only some code paths need, which importing the entry point must
+# not load. How long the import takes is measured by benchmarks.suite.
+DEFERRED_MODULES = [
+    "requests",
+    "prompt_toolkit",
+    "sqlite3",
+    "pyiptv.dao.channel_retreival.xtreme",
+    "pyiptv.dao.channel_retreival.m3u",
+    "pyiptv.dao.channel_retreival.xmltv",
+    "pyiptv.dao.channel_retreival.aggregate",
+    "pyiptv.dao.channel_storage.sqlite",
+    "pyiptv.dao.channel_storage.sqlite_trigram",
+    "pyiptv.dao.channel_storage.memory",
+    "pyiptv.dao.programme_storage.sqlite",
+    "pyiptv.players.vlc",
+    "pyiptv.services.cli",
+    "pyiptv.services.stream_health",
+]
+
+# Starts the app with the interactive UI replaced by a catalog sync, then
+# reports whether the sync had to load the HTTP client.
+START_AND_SYNC = """
+import sys
+from pyiptv.enum.channel_type import ChannelType
+from pyiptv.services import cli
+
+def run(self):
+    self.catalog_sync.sync([ChannelType.LIVE])
+    print("requests" in sys.modules)
+
+cli.CLIService.run = run
+from pyiptv.main import main
+main()
+"""
+
+
+def loaded_modules(module: str) -> Set[str]:
+    """Every module loaded by importing ``module`` in a fresh interpreter."""
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {module}; print(*sys.modules, sep='\\n')",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(process.stdout.split())
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        playlist = os.path.join(self.directory, "playlist.m3u")
+        with open(playlist, "w") as f:
+            f.write("#EXTM3U\n#EXTINF:-1,BBC One\nhttp://example.com/bbc1.ts\n")
+        self.env = {
+            name: value
+            for name, value in os.environ.items()
+            if not name.startswith(("XTREME_", "M3U_", "EPG_", "PYIPTV_"))
+        }
+        self.env.update(
+            M3U_URL=playlist,
+            PYIPTV_CACHE_DIR=self.directory,
+            PYIPTV_PLAYER_MODE="spawn",
+            PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+
+    def python(self, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=self.directory,
+            env=self.env,
+        )
+
+    def test_entry_point_defers_heavy_modules(self):
+        modules = loaded_modules("pyiptv.main")
+
+        loaded: List[str] = [
+            module
+            for module in DEFERRED_MODULES
+            if module in modules or any(m.startswith(f"{module}.") for m in modules)
+        ]
+        self.assertIn("pyiptv.main", modules)
+        self.assertEqual(loaded, [])
+
+    def test_warm_cache_start_does_not_load_http_client(self):
+        self.assertEqual(self.python("-c", START_AND_SYNC).stdout.strip(), "True")
+        self.assertEqual(self.python("-c", START_AND_SYNC).stdout.strip(), "False")
+
+    def test_commands_do_not_load_the_ui(self):
+        self.python("-m", "pyiptv.main", "sync")
+
+        found = self.python("-m", "pyiptv.main", "search", "bbc", "--json").stdout
+        channel_id = json.loads(found)["id"]
+        process = self.python(
+            "-X", "importtime", "-m", "pyiptv.main", "get", channel_id
+        )
+
+        self.assertEqual(process.stdout, "http://example.com/bbc1.ts\n")
+        self.assertNotIn("prompt_toolkit", process.stderr)
+        self.assertNotIn("requests", process.stderr)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "pyiptv.log")))